@@ -1,6 +1,6 @@
-from sqladmin import ModelView
+from admin.integrity import IntegrityModelView
 from models.administrator import Administrator
 
 
-class AdministratorAdmin(ModelView, model=Administrator):
+class AdministratorAdmin(IntegrityModelView, model=Administrator):
     column_list = [Administrator.id]
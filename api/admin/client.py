@@ -1,6 +1,6 @@
-from sqladmin import ModelView
+from admin.integrity import IntegrityModelView
 from models.client import Client
 
 
-class ClientAdmin(ModelView, model=Client):
+class ClientAdmin(IntegrityModelView, model=Client):
     column_list = [Client.id, Client.cpf]
@@ -0,0 +1,24 @@
+from typing import Any
+from sqladmin import ModelView
+from sqlalchemy.exc import IntegrityError
+from starlette.requests import Request
+from orm.utils.integrity import integrity_error_to_http
+
+
+class IntegrityModelView(ModelView):
+    """
+    Converte as violações de unicidade na mesma mensagem exibida pela API, em vez do
+    erro do banco, ao criar ou editar registros pelo painel administrativo.
+    """
+
+    async def insert_model(self, request: Request, data: dict) -> Any:
+        try:
+            return await super().insert_model(request, data)
+        except IntegrityError as error:
+            raise integrity_error_to_http(error) from error
+
+    async def update_model(self, request: Request, pk: str, data: dict) -> Any:
+        try:
+            return await super().update_model(request, pk, data)
+        except IntegrityError as error:
+            raise integrity_error_to_http(error) from error
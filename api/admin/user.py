@@ -1,6 +1,6 @@
-from sqladmin import ModelView
+from admin.integrity import IntegrityModelView
 from models.user import User
 
 
-class UserAdmin(ModelView, model=User):
+class UserAdmin(IntegrityModelView, model=User):
     column_list = [User.id, User.name, User.email]
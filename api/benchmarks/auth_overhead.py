@@ -0,0 +1,109 @@
+"""
+Custo da autenticação por requisição em um endpoint de administrador (`GET /administrators/`).
+
+Mede o tempo de uma decodificação do token (`verify_token`), quantas decodificações cada
+requisição realiza e a latência da requisição completa. A aplicação roda no próprio
+processo (httpx + ASGITransport).
+
+Execução (a partir do diretório `api`):
+    SECRET_KEY=x DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.auth_overhead
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+import httpx
+from database.config import Base, DATABASE_ASYNC, async_engine, engine
+from dependencies import get_auth_context
+from dependencies.get_session_db import create_session
+from schemas.administrator import AdministratorCreate
+from schemas.auth import TokenType
+from schemas.user import UserCreate
+from services.administrator import AdministratorService
+from services.auth import verify_token
+from services.user import UserService
+from main import app
+
+
+async def create_schema():
+    if DATABASE_ASYNC:
+        async with async_engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+    else:
+        Base.metadata.create_all(bind=engine)
+
+
+async def create_administrator() -> str:
+    name = f"bench-{uuid4().hex[:8]}"
+    session = create_session()
+    try:
+        user = await UserService(session).create_user(
+            UserCreate(name=name, password="123", email=f"{name}@example.com")
+        )
+        await AdministratorService(session).create_administrator(
+            AdministratorCreate(user_id=user.id)
+        )
+        return name
+    finally:
+        await session.close()
+
+
+async def time_decode(token: str, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await verify_token(token, TokenType.ACCESS)
+    return (time.perf_counter() - started) / iterations
+
+
+async def time_requests(agent: httpx.AsyncClient, iterations: int) -> list:
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = await agent.get("/administrators/", params={"count": "none"})
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+    return latencies
+
+
+async def run(iterations: int):
+    await create_schema()
+    name = await create_administrator()
+
+    decodes = []
+
+    async def counting_verify_token(token, expected_token_type):
+        decodes.append(token)
+        return await verify_token(token, expected_token_type)
+
+    get_auth_context.verify_token = counting_verify_token
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as agent:
+        response = await agent.post(
+            "/auth/login/", data={"username": name, "password": "123"}
+        )
+        token = response.json()["access_token"]
+        agent.headers["Authorization"] = f"Bearer {token}"
+
+        decode_seconds = await time_decode(token, iterations)
+        latencies = await time_requests(agent, iterations)
+
+    per_request = len(decodes) / iterations
+    print(f"decodificação do token   {decode_seconds * 1e6:8.1f}µs")
+    print(f"decodificações/requisição {per_request:7.1f}")
+    print(f"autenticação/requisição  {per_request * decode_seconds * 1e6:8.1f}µs")
+    print(f"requisição (p50)         {statistics.median(latencies) * 1000:8.2f}ms")
+
+    if DATABASE_ASYNC:
+        await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.iterations))
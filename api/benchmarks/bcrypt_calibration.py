@@ -0,0 +1,81 @@
+"""
+Calibração do custo do bcrypt (`BCRYPT_ROUNDS`) para a máquina atual.
+
+Mede a verificação de uma senha para custos crescentes e escolhe o maior custo cuja
+mediana não ultrapassa a latência alvo. Com `--env-file`, grava o valor escolhido no
+arquivo informado; hashes com outro custo são refeitos no próximo login bem-sucedido.
+Rode na mesma máquina (ou tipo de instância) em que a API é executada.
+
+Execução (a partir do diretório `api`):
+    python -m benchmarks.bcrypt_calibration --target-ms 250 --env-file .env
+"""
+
+import argparse
+import re
+import statistics
+import time
+from pathlib import Path
+from passlib.context import CryptContext
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+
+
+def measure_verify(rounds: int, samples: int) -> float:
+    """Mediana (segundos) da verificação de um hash com o custo informado"""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    hashed = context.hash("calibration")
+
+    durations = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify("calibration", hashed)
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+def calibrate(target: float, samples: int, minimum: int) -> int:
+    """Maior custo com verificação dentro do alvo (nunca abaixo de `minimum`)"""
+    chosen = minimum
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        duration = measure_verify(rounds, samples)
+        print(f"rounds={rounds:<3} verify={duration * 1000:9.1f}ms")
+
+        if duration > target:
+            break
+        chosen = max(chosen, rounds)
+
+        # Cada custo dobra o tempo: evita medir um custo que certamente excede o alvo
+        if duration * 2 > target * 1.5:
+            break
+    return chosen
+
+
+def store(env_file: Path, rounds: int) -> None:
+    """Grava `BCRYPT_ROUNDS` no arquivo .env, substituindo o valor anterior"""
+    line = f"BCRYPT_ROUNDS={rounds}"
+    content = env_file.read_text() if env_file.exists() else ""
+
+    if re.search(r"^BCRYPT_ROUNDS=.*$", content, flags=re.MULTILINE):
+        content = re.sub(r"^BCRYPT_ROUNDS=.*$", line, content, flags=re.MULTILINE)
+    else:
+        if content and not content.endswith("\n"):
+            content += "\n"
+        content += line + "\n"
+    env_file.write_text(content)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--target-ms", type=float, default=250)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--minimum", type=int, default=10)
+    parser.add_argument("--env-file", type=Path)
+    args = parser.parse_args()
+
+    rounds = calibrate(args.target_ms / 1000, args.samples, args.minimum)
+    print(f"BCRYPT_ROUNDS={rounds} (alvo {args.target_ms:g}ms)")
+
+    if args.env_file is not None:
+        store(args.env_file, rounds)
+        print(f"gravado em {args.env_file}")
@@ -0,0 +1,100 @@
+"""
+Micro-benchmark do custo de montagem dos filtros por requisição.
+
+Compara a abordagem anterior (reflexão sobre `filters.__dict__` a cada requisição)
+com os planos de filtragem pré-compilados de `orm.utils.filter_plan`.
+Mede apenas a construção do `Select`, sem compilar o SQL nem acessar o banco.
+
+Execução (a partir do diretório `api`):
+    SECRET_KEY=x DATABASE_URL=sqlite:// python -m benchmarks.filter_building
+"""
+
+import timeit
+from decimal import Decimal
+from sqlalchemy import String, select
+from sqlalchemy.sql.expression import cast
+from filters.client import ClientFilter
+from filters.product import ProductFilter
+from models.client import Client
+from models.product import Product
+from orm.utils.filter_plan import FilterPlan, compile_filter_plans
+import main  # noqa: F401 (importa todos os modelos antes de inspecionar os mapeadores)
+
+ITERATIONS = 20_000
+
+
+def legacy_apply_filters(stmt, model, filters):
+    """Reprodução da montagem anterior: reflexão e expressões recriadas a cada chamada"""
+    for attr, value in filters.__dict__.items():
+        if value is None:
+            continue
+
+        parts = attr.split("__")
+        if len(parts) > 1 and parts[1] in {"lte", "gte", "lt", "gt", "eq", "ne"}:
+            if not hasattr(model, parts[0]):
+                continue
+            column = getattr(model, parts[0])
+            operators = {
+                "lte": column <= value,
+                "gte": column >= value,
+                "lt": column < value,
+                "gt": column > value,
+                "eq": column == value,
+                "ne": column != value,
+            }
+            stmt = stmt.where(operators[parts[1]])
+        elif len(parts) > 1:
+            current_model = model
+            for part in parts[:-1]:
+                stmt = stmt.join(getattr(current_model, part))
+                current_model = getattr(current_model, part).property.mapper.class_
+            column = getattr(current_model, parts[-1])
+            if not isinstance(column.type, String):
+                column = cast(column, String)
+            stmt = stmt.where(column.ilike(f"%{value}%"))
+        elif hasattr(model, attr):
+            column = getattr(model, attr)
+            if not isinstance(column.type, String):
+                column = cast(column, String)
+            stmt = stmt.where(column.ilike(f"%{value}%"))
+
+    return stmt
+
+
+def build_scenarios():
+    product_filters = ProductFilter(
+        description=None,
+        category_id=1,
+        value__lte=Decimal("100"),
+        value__gte=None,
+        stock__lte=None,
+        stock__gte=10,
+    )
+    client_filters = ClientFilter(user__name="car", user__email=None, cpf="555")
+
+    return [
+        ("ProductFilter", Product, product_filters, FilterPlan(Product, ProductFilter)),
+        ("ClientFilter", Client, client_filters, FilterPlan(Client, ClientFilter)),
+    ]
+
+
+def run():
+    scenarios = build_scenarios()
+    compile_filter_plans()
+
+    print(f"{'Filtro':<15} {'antes (µs)':>12} {'depois (µs)':>12}")
+    for name, model, filters, plan in scenarios:
+        before = timeit.timeit(
+            lambda: legacy_apply_filters(select(model), model, filters),
+            number=ITERATIONS,
+        )
+        after = timeit.timeit(
+            lambda: plan.apply(select(model), filters), number=ITERATIONS
+        )
+        print(
+            f"{name:<15} {before / ITERATIONS * 1e6:>12.1f} {after / ITERATIONS * 1e6:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,104 @@
+"""
+Vazão de criação de pedidos concorrentes sobre um único produto (SKU "quente").
+
+Cria um cliente e um produto com estoque alto e dispara `OrderService.create_order`
+a partir de várias tarefas simultâneas, cada uma com sua própria sessão, durante
+alguns segundos. Deve ser executado contra o PostgreSQL (o SQLite serializa as escritas
+do banco inteiro) e em commits diferentes para comparar antes e depois.
+
+Execução (a partir do diretório `api`):
+    SECRET_KEY=x DATABASE_URL=postgresql://... python -m benchmarks.hot_sku_orders
+"""
+
+import argparse
+import asyncio
+import time
+from decimal import Decimal
+from uuid import uuid4
+from faker import Faker
+from fastapi import HTTPException
+from core.security.principal import Principal
+from database.config import Base, DATABASE_ASYNC, async_engine, engine
+from dependencies.get_session_db import create_session
+from models.client import Client
+from models.product import Product
+from models.user import User
+from schemas.order import OrderCreate, ProductOrder
+from services.order import OrderService
+import main  # noqa: F401 (importa todos os modelos)
+
+fake = Faker("pt_BR")
+
+
+async def create_schema():
+    if DATABASE_ASYNC:
+        async with async_engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+    else:
+        Base.metadata.create_all(bind=engine)
+
+
+async def setup():
+    session = create_session()
+    try:
+        suffix = uuid4().hex[:8]
+        user = User(
+            name=f"bench-{suffix}", password="-", email=f"bench-{suffix}@example.com"
+        )
+        user.client = Client(cpf=fake.cpf().replace(".", "").replace("-", ""))
+        product = Product(
+            description=f"Produto benchmark {suffix}",
+            value=Decimal("10.00"),
+            bar_code=suffix,
+            stock=10**9,
+        )
+        session.add_all([user, product])
+        await session.commit()
+        return Principal(user.id, user.client.id, False), product.id
+    finally:
+        await session.close()
+
+
+async def worker(
+    principal: Principal, order: OrderCreate, deadline: float, stats: dict
+):
+    while time.perf_counter() < deadline:
+        session = create_session()
+        try:
+            await OrderService(session).create_order(order, principal)
+            stats["orders"] += 1
+        except HTTPException:
+            await session.rollback()
+            stats["errors"] += 1
+        finally:
+            await session.close()
+
+
+async def run(concurrency: int, duration: float, quantity: int):
+    try:
+        await create_schema()
+        principal, product_id = await setup()
+        order = OrderCreate(products=[ProductOrder(id=product_id, quantity=quantity)])
+
+        stats = {"orders": 0, "errors": 0}
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            *(worker(principal, order, deadline, stats) for _ in range(concurrency))
+        )
+
+        print(f"concorrência={concurrency} duração={duration}s")
+        print(f"pedidos/s={stats['orders'] / duration:.1f} erros={stats['errors']}")
+    finally:
+        if DATABASE_ASYNC:
+            await async_engine.dispose()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--quantity", type=int, default=1)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.concurrency, args.duration, args.quantity))
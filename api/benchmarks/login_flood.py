@@ -0,0 +1,153 @@
+"""
+Latência do checkout (`POST /orders/`) durante uma enxurrada de logins com senha errada.
+
+A aplicação roda no próprio processo (httpx + ASGITransport), no mesmo event loop,
+reproduzindo um worker do gunicorn. Para comparar sem o controle de admissão, rode também
+com `ADMISSION_IP_PER_MINUTE=0 ADMISSION_USERNAME_PER_MINUTE=0 ADMISSION_MAX_CONCURRENT=0`.
+
+Execução (a partir do diretório `api`):
+    SECRET_KEY=x DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.login_flood
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from decimal import Decimal
+from uuid import uuid4
+import httpx
+from validate_docbr import CPF
+from database.config import Base, DATABASE_ASYNC, async_engine, engine
+from dependencies.get_session_db import create_session
+from core.metrics import metrics
+from core.security.admission import admission
+from schemas.client import ClientCreate
+from schemas.product import ProductCreate
+from schemas.user import UserCreate
+from services.client import ClientService
+from services.product import ProductService
+from services.user import UserService
+from main import app
+
+
+async def create_schema():
+    if DATABASE_ASYNC:
+        async with async_engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+    else:
+        Base.metadata.create_all(bind=engine)
+
+
+async def create_fixtures() -> tuple:
+    """Cliente (nome de usuário) e produto com estoque suficiente para o teste"""
+    name = f"bench-{uuid4().hex[:8]}"
+    session = create_session()
+    try:
+        user = await UserService(session).create_user(
+            UserCreate(name=name, password="123", email=f"{name}@example.com")
+        )
+        await ClientService(session).create_client(
+            ClientCreate(user_id=user.id, cpf=CPF().generate())
+        )
+        product = await ProductService(session).create_product(
+            ProductCreate(
+                description="bench", value=Decimal(1), bar_code=name, stock=10**9
+            )
+        )
+        return name, product.id
+    finally:
+        await session.close()
+
+
+async def flood_logins(
+    agent: httpx.AsyncClient, name: str, rate: float, deadline: float
+):
+    """Logins em taxa fixa (carga aberta), como um atacante externo que não espera respostas"""
+    attempts = []
+    while time.perf_counter() < deadline:
+        attempts.append(
+            asyncio.create_task(
+                agent.post(
+                    "/auth/login/",
+                    data={"username": name, "password": uuid4().hex},
+                )
+            )
+        )
+        await asyncio.sleep(1 / rate)
+
+    # Sem controle de admissão, parte dos logins falha por falta de conexões no pool
+    results = await asyncio.gather(*attempts, return_exceptions=True)
+    return sum(isinstance(result, Exception) for result in results)
+
+
+async def checkout(agent: httpx.AsyncClient, product_id: int, deadline: float) -> list:
+    latencies = []
+    order = {"products": [{"id": product_id, "quantity": 1}]}
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await agent.post("/orders/", json=order)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 201, response.text
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+def report(label: str, latencies: list):
+    if len(latencies) < 2:  # event loop bloqueado durante quase toda a medição
+        worst = max(latencies, default=0) * 1000
+        print(f"{label:<20} n={len(latencies):<5} máx={worst:7.1f}ms")
+        return
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<20} n={len(latencies):<5} "
+        f"p50={quantiles[49] * 1000:7.1f}ms p99={quantiles[98] * 1000:7.1f}ms"
+    )
+
+
+async def run(rate: float, duration: float):
+    await create_schema()
+    name, product_id = await create_fixtures()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as agent:
+        response = await agent.post(
+            "/auth/login/", data={"username": name, "password": "123"}
+        )
+        token = response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", headers=headers
+        ) as buyer:
+            deadline = time.perf_counter() + duration
+            report("sem logins", await checkout(buyer, product_id, deadline))
+
+            metrics.clear()
+            deadline = time.perf_counter() + duration
+            latencies, failures = await asyncio.gather(
+                checkout(buyer, product_id, deadline),
+                flood_logins(agent, name, rate, deadline),
+            )
+            report(f"{rate:g} logins/s", latencies)
+
+    rejected = metrics.snapshot()["counters"].get("admission_rejected", {})
+    print(f"recusados (429): {dict(rejected)}  falhas: {failures}")
+    print(
+        f"ip={admission.ip_bucket.per_minute:g}/min "
+        f"usuário={admission.username_bucket.per_minute:g}/min "
+        f"simultâneos={admission.max_concurrent}"
+    )
+
+    if DATABASE_ASYNC:
+        await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=float, default=100)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rate, args.duration))
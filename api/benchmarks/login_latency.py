@@ -0,0 +1,100 @@
+"""
+Latência de um endpoint não relacionado (`GET /categories/`) enquanto logins são disparados.
+
+A aplicação roda no próprio processo (httpx + ASGITransport), no mesmo event loop,
+reproduzindo um worker do gunicorn. Para comparar com o bcrypt executado no event loop
+(comportamento anterior), rode também com `PASSWORD_HASH_WORKERS=0`.
+
+Execução (a partir do diretório `api`):
+    SECRET_KEY=x DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.login_latency
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+import httpx
+from database.config import Base, DATABASE_ASYNC, async_engine, engine
+from dependencies.get_session_db import create_session
+from schemas.user import UserCreate
+from services.user import UserService
+from core.security.password import PASSWORD_HASH_WORKERS
+from main import app
+
+
+async def create_schema():
+    if DATABASE_ASYNC:
+        async with async_engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+    else:
+        Base.metadata.create_all(bind=engine)
+
+
+async def create_user(password: str) -> str:
+    name = f"bench-{uuid4().hex[:8]}"
+    session = create_session()
+    try:
+        await UserService(session).create_user(
+            UserCreate(name=name, password=password, email=f"{name}@example.com")
+        )
+        return name
+    finally:
+        await session.close()
+
+
+async def hammer_logins(agent: httpx.AsyncClient, name: str, deadline: float):
+    while time.perf_counter() < deadline:
+        await agent.post("/auth/login/", data={"username": name, "password": "123"})
+
+
+async def probe(agent: httpx.AsyncClient, deadline: float) -> list:
+    latencies = []
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await agent.get("/categories/", params={"count": "none"})
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+def report(label: str, latencies: list):
+    if len(latencies) < 2:  # event loop bloqueado durante quase toda a medição
+        worst = max(latencies, default=0) * 1000
+        print(f"{label:<18} n={len(latencies):<5} máx={worst:7.1f}ms")
+        return
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<18} n={len(latencies):<5} "
+        f"p50={quantiles[49] * 1000:7.1f}ms p99={quantiles[98] * 1000:7.1f}ms"
+    )
+
+
+async def run(concurrency: int, duration: float):
+    await create_schema()
+    name = await create_user("123")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as agent:
+        report("sem logins", await probe(agent, time.perf_counter() + duration))
+
+        deadline = time.perf_counter() + duration
+        logins = [hammer_logins(agent, name, deadline) for _ in range(concurrency)]
+        latencies, *_ = await asyncio.gather(probe(agent, deadline), *logins)
+        report(f"{concurrency} logins simult.", latencies)
+
+    print(f"PASSWORD_HASH_WORKERS={PASSWORD_HASH_WORKERS}")
+
+    if DATABASE_ASYNC:
+        await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.concurrency, args.duration))
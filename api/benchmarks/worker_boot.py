@@ -0,0 +1,84 @@
+"""
+Tempo de inicialização do schema em cada worker: `create_all` (comportamento anterior)
+contra a conferência da revisão do Alembic (`DATABASE_SCHEMA_MODE=check`).
+
+Cada repetição usa uma engine nova, como um worker recém-iniciado pelo gunicorn. O banco
+recebe as tabelas e a revisão mais recente antes da medição. Além do tempo, é exibido o
+número de instruções enviadas ao banco: no SQLite local elas são quase gratuitas, mas no
+PostgreSQL cada uma é uma ida e volta pela rede.
+
+Execução (a partir do diretório `api`):
+    SECRET_KEY=x DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.worker_boot
+"""
+
+import argparse
+import statistics
+import time
+from sqlalchemy import create_engine, event, text
+from database.config import Base, DATABASE_URL
+from database.schema import check_schema_version, get_head_revision
+from models.user import User
+from models.client import Client
+from models.administrator import Administrator
+from models.category import Category
+from models.product import Product
+from models.order import Order
+from models.token_revocation import TokenRevocation
+
+
+def prepare_database(url: str):
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32))")
+        )
+        connection.execute(text("DELETE FROM alembic_version"))
+        connection.execute(
+            text("INSERT INTO alembic_version VALUES (:head)"),
+            {"head": get_head_revision()},
+        )
+    engine.dispose()
+
+
+def create_all(engine):
+    Base.metadata.create_all(bind=engine)
+
+
+def check(engine):
+    with engine.connect() as connection:
+        check_schema_version(connection, mode="check")
+
+
+def measure(label: str, boot, url: str, repeat: int):
+    durations = []
+    statements = []
+    for _ in range(repeat):
+        engine = create_engine(url)
+        executed = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda *args: executed.append(1),
+        )
+
+        started = time.perf_counter()
+        boot(engine)
+        durations.append(time.perf_counter() - started)
+        statements.append(len(executed))
+        engine.dispose()
+
+    print(
+        f"{label:<12} mediana={statistics.median(durations) * 1000:7.1f}ms "
+        f"máx={max(durations) * 1000:7.1f}ms instruções={max(statements)}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    prepare_database(DATABASE_URL)
+    measure("create_all", create_all, DATABASE_URL, args.repeat)
+    measure("check", check, DATABASE_URL, args.repeat)
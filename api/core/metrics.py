@@ -0,0 +1,67 @@
+from collections import defaultdict
+from threading import Lock
+from typing import Dict
+
+
+class Metrics:
+    """
+    Métricas em memória do processo: contadores, medidores (gauges) e resumos
+    (quantidade, soma e máximo de observações), todos com rótulos.
+    Os valores são expostos aos administradores em `GET /metrics/`.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self._gauges: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._summaries: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(dict)
+
+    @staticmethod
+    def labels_key(labels: Dict[str, object]) -> str:
+        return ",".join(f"{name}={value}" for name, value in sorted(labels.items()))
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        with self._lock:
+            self._counters[name][Metrics.labels_key(labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges[name][Metrics.labels_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = Metrics.labels_key(labels)
+        with self._lock:
+            summary = self._summaries[name].setdefault(
+                key, {"count": 0, "sum": 0.0, "max": 0.0}
+            )
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["max"] = max(summary["max"], value)
+
+    def counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters[name].get(Metrics.labels_key(labels), 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict]]:
+        with self._lock:
+            return {
+                "counters": {
+                    name: dict(values) for name, values in self._counters.items()
+                },
+                "gauges": {name: dict(values) for name, values in self._gauges.items()},
+                "summaries": {
+                    name: {key: dict(summary) for key, summary in values.items()}
+                    for name, values in self._summaries.items()
+                },
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+metrics = Metrics()
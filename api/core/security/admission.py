@@ -0,0 +1,200 @@
+import math
+import time
+from contextlib import asynccontextmanager
+from threading import Lock
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional
+from decouple import Csv, config
+from fastapi import HTTPException, status
+from core.metrics import metrics
+from utils.ttl_cache import TTLCache
+
+ADMISSION_IP_PER_MINUTE: float = config(
+    "ADMISSION_IP_PER_MINUTE", default=30, cast=float
+)
+ADMISSION_IP_BURST: int = config("ADMISSION_IP_BURST", default=10, cast=int)
+ADMISSION_USERNAME_PER_MINUTE: float = config(
+    "ADMISSION_USERNAME_PER_MINUTE", default=10, cast=float
+)
+ADMISSION_USERNAME_BURST: int = config("ADMISSION_USERNAME_BURST", default=5, cast=int)
+ADMISSION_MAX_CONCURRENT: int = config("ADMISSION_MAX_CONCURRENT", default=16, cast=int)
+ADMISSION_REDIS_URL: Optional[str] = config("ADMISSION_REDIS_URL", default=None)
+ADMISSION_TRUSTED_PROXIES: List[str] = config(
+    "ADMISSION_TRUSTED_PROXIES", default="", cast=Csv()
+)
+
+
+class TokenBucket(NamedTuple):
+    """Limite de taxa: até `burst` operações seguidas, repostas a `per_minute` por minuto"""
+
+    name: str
+    per_minute: float
+    burst: int
+
+    @property
+    def enabled(self) -> bool:
+        return self.per_minute > 0 and self.burst > 0
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.per_minute / 60
+
+    @property
+    def seconds_to_fill(self) -> float:
+        return self.burst / self.refill_per_second
+
+
+class MemoryBuckets:
+    """
+    Baldes mantidos em memória, válidos apenas para o processo atual.
+    Baldes cheios há mais tempo que o necessário para reposição total são descartados,
+    então o consumo de memória acompanha apenas as chaves ativas.
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        self.maxsize = maxsize
+        self._buckets: Dict[str, TTLCache] = {}
+        self._lock = Lock()
+
+    async def take(self, bucket: TokenBucket, key: str) -> float:
+        """Consome uma ficha; retorna 0 ou os segundos até haver ficha disponível"""
+        with self._lock:
+            cache = self._buckets.get(bucket.name)
+            if cache is None:
+                cache = TTLCache(ttl=bucket.seconds_to_fill, maxsize=self.maxsize)
+                self._buckets[bucket.name] = cache
+
+            now = time.monotonic()
+            tokens, updated_at = cache.get(key, (bucket.burst, now))
+            tokens = min(
+                bucket.burst, tokens + (now - updated_at) * bucket.refill_per_second
+            )
+
+            if tokens < 1:
+                cache.set(key, (tokens, now))
+                return (1 - tokens) / bucket.refill_per_second
+
+            cache.set(key, (tokens - 1, now))
+            return 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+REDIS_TAKE_SCRIPT = """
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - updated_at) * rate)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+else
+    tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBuckets:
+    """
+    Baldes compartilhados entre os workers (e instâncias) por meio do Redis.
+    A reposição e o consumo são feitos atomicamente por um script Lua.
+    Requer o pacote opcional `redis` (`pip install redis`).
+    """
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis
+        except ImportError as error:
+            raise RuntimeError(
+                "ADMISSION_REDIS_URL requer o pacote opcional 'redis'"
+            ) from error
+
+        self.client = redis.from_url(url)
+        self.script = self.client.register_script(REDIS_TAKE_SCRIPT)
+
+    async def take(self, bucket: TokenBucket, key: str) -> float:
+        wait = await self.script(
+            keys=[f"admission:{bucket.name}:{key}"],
+            args=[bucket.burst, bucket.refill_per_second, time.time()],
+        )
+        return float(wait)
+
+    def clear(self) -> None:
+        pass
+
+
+class AdmissionController:
+    """
+    Controle de admissão das rotas não autenticadas que executam bcrypt (login e cadastro).
+
+    Cada requisição consome uma ficha do balde do IP e, no login, do balde do nome de
+    usuário; além disso, o número de requisições simultâneas é limitado por processo.
+    Requisições recusadas recebem 429 com `Retry-After` antes de qualquer hash, e são
+    contabilizadas em `admission_rejected`.
+    """
+
+    def __init__(
+        self,
+        ip_bucket: TokenBucket,
+        username_bucket: TokenBucket,
+        max_concurrent: int,
+        redis_url: Optional[str] = None,
+    ):
+        self.ip_bucket = ip_bucket
+        self.username_bucket = username_bucket
+        self.max_concurrent = max_concurrent
+        self.buckets = RedisBuckets(redis_url) if redis_url else MemoryBuckets()
+        self._in_flight = 0
+
+    @staticmethod
+    def reject(reason: str, retry_after: float) -> HTTPException:
+        metrics.increment("admission_rejected", reason=reason)
+        return HTTPException(
+            status.HTTP_429_TOO_MANY_REQUESTS,
+            "Muitas tentativas, tente novamente em instantes",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    async def check(self, bucket: TokenBucket, key: str) -> None:
+        if not bucket.enabled:
+            return
+
+        wait = await self.buckets.take(bucket, key)
+        if wait > 0:
+            raise AdmissionController.reject(bucket.name, wait)
+
+    @asynccontextmanager
+    async def admit(
+        self, ip: str, username: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        await self.check(self.ip_bucket, ip)
+        if username is not None:
+            await self.check(self.username_bucket, username.lower())
+
+        if self.max_concurrent > 0 and self._in_flight >= self.max_concurrent:
+            raise AdmissionController.reject("concurrency", 1)
+
+        self._in_flight += 1
+        metrics.set_gauge("admission_in_flight", self._in_flight)
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            metrics.set_gauge("admission_in_flight", self._in_flight)
+
+
+admission = AdmissionController(
+    ip_bucket=TokenBucket("ip", ADMISSION_IP_PER_MINUTE, ADMISSION_IP_BURST),
+    username_bucket=TokenBucket(
+        "username", ADMISSION_USERNAME_PER_MINUTE, ADMISSION_USERNAME_BURST
+    ),
+    max_concurrent=ADMISSION_MAX_CONCURRENT,
+    redis_url=ADMISSION_REDIS_URL,
+)
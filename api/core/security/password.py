@@ -0,0 +1,86 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Optional, TypeVar
+from decouple import config
+from fastapi import HTTPException, status
+from core.metrics import metrics
+
+T = TypeVar("T")
+
+PASSWORD_HASH_WORKERS: int = config("PASSWORD_HASH_WORKERS", default=2, cast=int)
+PASSWORD_HASH_QUEUE_LIMIT: int = config(
+    "PASSWORD_HASH_QUEUE_LIMIT", default=64, cast=int
+)
+# Custo do bcrypt (log2 das iterações); calibre com `python -m benchmarks.bcrypt_calibration`
+BCRYPT_ROUNDS: int = config("BCRYPT_ROUNDS", default=12, cast=int)
+
+
+class PasswordWorkerPool:
+    """
+    Executa o hash e a verificação de senhas (bcrypt) em um pool de threads de tamanho fixo,
+    fora do event loop. O bcrypt libera o GIL, então as demais requisições seguem atendidas.
+
+    Quando a fila atinge o limite, novas operações são recusadas com 503 em vez de acumular
+    espera indefinidamente. Expõe as métricas `password_queue_depth`,
+    `password_wait_seconds`, `password_run_seconds` e `password_rejected`.
+    Com `workers=0`, a operação roda diretamente no event loop (comportamento anterior).
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.queue_limit = queue_limit
+        self.executor: Optional[ThreadPoolExecutor] = None
+        if workers > 0:
+            self.executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="password"
+            )
+
+        self._lock = Lock()
+        self._queued = 0
+
+    def _change_queue(self, delta: int) -> None:
+        with self._lock:
+            self._queued += delta
+            metrics.set_gauge("password_queue_depth", self._queued)
+
+    async def run(self, operation: str, fn: Callable[..., T], *args) -> T:
+        if self.executor is None:
+            started = perf_counter()
+            result = fn(*args)
+            metrics.observe(
+                "password_run_seconds", perf_counter() - started, operation=operation
+            )
+            return result
+
+        if self._queued >= self.queue_limit:
+            metrics.increment("password_rejected", operation=operation)
+            raise HTTPException(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "Servidor ocupado, tente novamente em instantes",
+                headers={"Retry-After": "1"},
+            )
+
+        submitted = perf_counter()
+        self._change_queue(1)
+
+        def task():
+            started = perf_counter()
+            self._change_queue(-1)
+            metrics.observe(
+                "password_wait_seconds", started - submitted, operation=operation
+            )
+            try:
+                return fn(*args)
+            finally:
+                metrics.observe(
+                    "password_run_seconds",
+                    perf_counter() - started,
+                    operation=operation,
+                )
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, task)
+
+
+password_pool = PasswordWorkerPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT)
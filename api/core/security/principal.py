@@ -0,0 +1,21 @@
+from typing import NamedTuple, Optional
+from decouple import config
+from utils.ttl_cache import TTLCache
+
+PRINCIPAL_CACHE_TTL: float = config("PRINCIPAL_CACHE_TTL", default=30, cast=float)
+
+
+class Principal(NamedTuple):
+    """Usuário autenticado: identificador e papéis, sem os demais dados do usuário"""
+
+    user_id: int
+    client_id: Optional[int]
+    is_administrator: bool
+
+
+principal_cache = TTLCache(ttl=PRINCIPAL_CACHE_TTL)
+"""Principais por `user_id`; invalidados ao alterar o usuário, o cliente ou o administrador"""
+
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.pop(user_id)
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Dict, Optional, Tuple
+from decouple import config
+
+REVOCATION_SYNC_INTERVAL: float = config(
+    "REVOCATION_SYNC_INTERVAL", default=5, cast=float
+)
+REVOCATION_SYNC_OVERLAP: float = config(
+    "REVOCATION_SYNC_OVERLAP", default=60, cast=float
+)
+
+
+class RevocationStore:
+    """
+    Cópia em memória (por processo) das revogações de tokens ainda não expiradas.
+
+    A verificação de um token é feita apenas em memória; as revogações gravadas por outros
+    processos são lidas de forma incremental, no máximo uma vez a cada `sync_interval`
+    segundos. A leitura não usa o `id`: transações concorrentes podem confirmar os `id`
+    fora de ordem, e uma revogação com `id` menor que o último lido nunca seria vista.
+    Cada sincronização relê as revogações com `revoked_at` a partir da mais recente já
+    vista menos `sync_overlap` segundos, janela que deve cobrir a duração das transações
+    e a diferença entre os relógios dos servidores.
+    """
+
+    def __init__(self, sync_interval: float, sync_overlap: float):
+        self.sync_interval = sync_interval
+        self.sync_overlap = timedelta(seconds=sync_overlap)
+        self.tokens: Dict[str, datetime] = {}
+        self.users: Dict[int, Tuple[datetime, datetime]] = {}
+        self.last_revoked_at: Optional[datetime] = None
+        self._synced_at: Optional[float] = None
+
+    def needs_sync(self) -> bool:
+        return (
+            self._synced_at is None
+            or monotonic() - self._synced_at >= self.sync_interval
+        )
+
+    def mark_synced(self, last_revoked_at: Optional[datetime]) -> None:
+        """
+        Registra a sincronização e o `revoked_at` mais recente lido do banco. As
+        revogações gravadas pelo próprio processo não avançam essa marca, para que a
+        primeira sincronização ainda leia as de outros processos.
+        """
+        self._synced_at = monotonic()
+        if last_revoked_at is not None:
+            self.last_revoked_at = max(
+                last_revoked_at, self.last_revoked_at or last_revoked_at
+            )
+
+    def sync_since(self) -> Optional[datetime]:
+        """Menor `revoked_at` a reler na próxima sincronização (`None`: todas)"""
+        if self.last_revoked_at is None:
+            return None
+        return self.last_revoked_at - self.sync_overlap
+
+    def add(
+        self,
+        jti: Optional[str],
+        user_id: int,
+        revoked_at: datetime,
+        expires_at: datetime,
+    ) -> None:
+        if jti is not None:
+            self.tokens[jti] = expires_at
+        else:
+            revoked_before, expires = self.users.get(user_id, (revoked_at, expires_at))
+            self.users[user_id] = (
+                max(revoked_at, revoked_before),
+                max(expires_at, expires),
+            )
+
+    def is_revoked(self, jti: Optional[str], user_id: int, issued_at: datetime) -> bool:
+        if jti is not None and jti in self.tokens:
+            return True
+
+        revoked_before, _ = self.users.get(user_id, (None, None))
+        return revoked_before is not None and issued_at <= revoked_before
+
+    def prune(self, now: datetime) -> None:
+        """
+        Descarta as revogações já expiradas: depois de `expires_at` nenhum token
+        abrangido pela revogação (do `jti` ou do usuário) continua válido.
+        """
+        self.tokens = {
+            jti: expires_at
+            for jti, expires_at in self.tokens.items()
+            if expires_at > now
+        }
+        self.users = {
+            user_id: revocation
+            for user_id, revocation in self.users.items()
+            if revocation[1] > now
+        }
+
+    def clear(self) -> None:
+        self.tokens.clear()
+        self.users.clear()
+        self.last_revoked_at = None
+        self._synced_at = None
+
+
+revocation_store = RevocationStore(
+    sync_interval=REVOCATION_SYNC_INTERVAL, sync_overlap=REVOCATION_SYNC_OVERLAP
+)
@@ -0,0 +1,23 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator, List, Tuple
+
+
+class ServerTiming:
+    """Duração das etapas de uma requisição, exposta no cabeçalho `Server-Timing`"""
+
+    def __init__(self):
+        self.entries: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.entries.append((name, perf_counter() - started))
+
+    def header(self) -> str:
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.entries
+        )
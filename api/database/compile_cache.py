@@ -0,0 +1,53 @@
+from typing import TypeVar
+from sqlalchemy import Engine, event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+from core.metrics import metrics
+
+CACHE_RESULTS = {
+    CacheStats.CACHE_HIT: "hit",
+    CacheStats.CACHE_MISS: "miss",
+    CacheStats.CACHING_DISABLED: "disabled",
+    CacheStats.NO_CACHE_KEY: "no_key",
+    CacheStats.NO_DIALECT_SUPPORT: "no_dialect_support",
+}
+
+COMPILE_CACHE_METRICS = "compile_cache_metrics"
+"""Opção de execução que, com `False`, exclui as instruções da métrica"""
+
+EngineT = TypeVar("EngineT", Engine, AsyncEngine)
+
+
+def count_compile_cache(connection, cursor, statement, parameters, context, many):
+    """
+    Contabiliza em `sql_compile_cache` se o SQL de cada instrução veio do cache de
+    compilação do SQLAlchemy (`result=hit`) ou precisou ser compilado (`result=miss`).
+    Consultas com formato estável devem ser quase sempre `hit` após o aquecimento;
+    `miss` recorrentes indicam instruções cujo formato muda a cada chamada ou um
+    `DATABASE_QUERY_CACHE_SIZE` pequeno demais.
+    """
+    if context is None or not context.execution_options.get(
+        COMPILE_CACHE_METRICS, True
+    ):
+        return
+
+    result = CACHE_RESULTS.get(context.cache_hit)
+    if result is not None:
+        metrics.increment("sql_compile_cache", result=result)
+
+
+def instrument_compile_cache(engine: Engine) -> None:
+    """
+    Registra a métrica em uma engine da aplicação. Engines de migração e de scripts não
+    são instrumentadas, para que suas instruções não distorçam a taxa de acertos.
+    """
+    if not event.contains(engine, "before_cursor_execute", count_compile_cache):
+        event.listen(engine, "before_cursor_execute", count_compile_cache)
+
+
+def without_compile_cache_metrics(engine: EngineT) -> EngineT:
+    """
+    A mesma engine (e o mesmo pool), sem contabilizar as instruções na métrica: usada
+    pelo painel administrativo e pela verificação do schema na inicialização
+    """
+    return engine.execution_options(**{COMPILE_CACHE_METRICS: False})
@@ -1,13 +1,85 @@
-from sqlalchemy import create_engine
+from sqlalchemy import DDL, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from decouple import config
+from database.compile_cache import instrument_compile_cache
+from database.pool import get_engine_options
+from database.replicas import (
+    DATABASE_REPLICA_URLS,
+    REPLICA_RETRY_INTERVAL,
+    ReplicaSet,
+    RoutingSession,
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+# Os índices de busca textual (GIN `gin_trgm_ops`) dependem da extensão pg_trgm
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Converte a URL do banco para o driver assíncrono equivalente (asyncpg/aiosqlite)"""
+    database_url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(
+        database_url.get_backend_name(), database_url.drivername
+    )
+    return database_url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
 DATABASE_URL: str = config("DATABASE_URL")
+DATABASE_ASYNC: bool = config("DATABASE_ASYNC", default=True, cast=bool)
+
+engine = create_engine(DATABASE_URL, **get_engine_options(DATABASE_URL))
+Session = sessionmaker(engine, class_=RoutingSession, expire_on_commit=False)
+# No modo assíncrono a engine síncrona não atende as requisições da API
+if not DATABASE_ASYNC:
+    instrument_compile_cache(engine)
+
+async_engine = None
+AsyncSessionLocal = None
+
+if DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        get_async_database_url(DATABASE_URL),
+        **get_engine_options(DATABASE_URL, asynchronous=True),
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, sync_session_class=RoutingSession, expire_on_commit=False
+    )
+    instrument_compile_cache(async_engine.sync_engine)
+
+
+def create_replica_engine(url: str):
+    """
+    Engine de uma réplica de leitura no modo configurado. No modo assíncrono retorna a
+    engine síncrona subjacente, que é o que a `RoutingSession` entrega à `AsyncSession`.
+    """
+    if DATABASE_ASYNC:
+        replica_engine = create_async_engine(
+            get_async_database_url(url), **get_engine_options(url, asynchronous=True)
+        ).sync_engine
+    else:
+        replica_engine = create_engine(url, **get_engine_options(url))
+
+    instrument_compile_cache(replica_engine)
+    return replica_engine
+
 
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(engine)
+replicas = ReplicaSet(
+    [create_replica_engine(url) for url in DATABASE_REPLICA_URLS],
+    retry_interval=REPLICA_RETRY_INTERVAL,
+)
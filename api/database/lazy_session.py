@@ -0,0 +1,61 @@
+from typing import Any, Callable, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from core.metrics import metrics
+
+CONNECTION_USED_KEY = "connection_used"
+COMMITTED_KEY = "committed"
+
+
+@event.listens_for(Session, "after_begin")
+def mark_connection_used(session: Session, transaction, connection) -> None:
+    session.info[CONNECTION_USED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def mark_committed(session: Session) -> None:
+    session.info[COMMITTED_KEY] = True
+
+
+class LazySession:
+    """
+    Adia a criação da sessão de banco até o primeiro uso (`execute`, `get`, `add`, ...).
+
+    A sessão real só obtém uma conexão do pool ao executar a primeira instrução, então
+    requisições encerradas antes disso (por exemplo, um 403 de permissão decidido apenas
+    pelo token) não criam sessão nem ocupam conexão. Ao fechar, contabiliza em
+    `db_sessions` se a conexão foi utilizada (`connection=used`) ou evitada
+    (`connection=avoided`).
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._session: Optional[Any] = None
+
+    @property
+    def session(self) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    @property
+    def committed(self) -> bool:
+        """Se a sessão já confirmou alguma transação"""
+        return self._session is not None and self._session.info.get(
+            COMMITTED_KEY, False
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        used = session is not None and session.info.get(CONNECTION_USED_KEY, False)
+        metrics.increment("db_sessions", connection="used" if used else "avoided")
+
+        if session is not None:
+            await session.close()
@@ -0,0 +1,102 @@
+from time import perf_counter
+from typing import Any, Dict
+from uuid import uuid4
+from decouple import config
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from core.metrics import metrics
+
+DATABASE_POOL_SIZE: int = config("DATABASE_POOL_SIZE", default=5, cast=int)
+DATABASE_MAX_OVERFLOW: int = config("DATABASE_MAX_OVERFLOW", default=10, cast=int)
+DATABASE_POOL_TIMEOUT: float = config("DATABASE_POOL_TIMEOUT", default=30, cast=float)
+DATABASE_POOL_RECYCLE: int = config("DATABASE_POOL_RECYCLE", default=-1, cast=int)
+DATABASE_POOL_PRE_PING: bool = config(
+    "DATABASE_POOL_PRE_PING", default=False, cast=bool
+)
+DATABASE_PGBOUNCER: bool = config("DATABASE_PGBOUNCER", default=False, cast=bool)
+DATABASE_QUERY_CACHE_SIZE: int = config(
+    "DATABASE_QUERY_CACHE_SIZE", default=500, cast=int
+)
+
+
+class InstrumentedPoolMixin:
+    """
+    Métricas do pool de conexões, rotuladas por `pool` (`sync` ou `async`):
+    espera pela conexão (`db_pool_wait_seconds`), conexões em uso (`db_pool_in_use`),
+    conexões além de `pool_size` (`db_pool_overflow`) e esperas que excederam
+    `pool_timeout` (`db_pool_timeouts`).
+    """
+
+    metrics_label = "sync"
+
+    def _update_gauges(self) -> None:
+        metrics.set_gauge("db_pool_in_use", self.checkedout(), pool=self.metrics_label)
+        metrics.set_gauge(
+            "db_pool_overflow", max(0, self.overflow()), pool=self.metrics_label
+        )
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            connection = super()._do_get()
+        except TimeoutError:
+            metrics.increment("db_pool_timeouts", pool=self.metrics_label)
+            raise
+        finally:
+            metrics.observe(
+                "db_pool_wait_seconds",
+                perf_counter() - started,
+                pool=self.metrics_label,
+            )
+
+        self._update_gauges()
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._update_gauges()
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def get_engine_options(url: str, asynchronous: bool = False) -> Dict[str, Any]:
+    """
+    Opções do `create_engine`/`create_async_engine` conforme as variáveis `DATABASE_POOL_*`
+    e o tamanho do cache de compilação de instruções (`DATABASE_QUERY_CACHE_SIZE`).
+
+    Com `DATABASE_PGBOUNCER=True` o pool fica a cargo do PgBouncer: cada sessão abre e
+    fecha sua conexão (`NullPool`) e o asyncpg não mantém instruções preparadas no
+    servidor, incompatíveis com o modo de transação do PgBouncer. O SQLite mantém o pool
+    padrão do SQLAlchemy.
+    """
+    options: Dict[str, Any] = {"query_cache_size": DATABASE_QUERY_CACHE_SIZE}
+    if make_url(url).get_backend_name() == "sqlite":
+        return options
+
+    options["pool_pre_ping"] = DATABASE_POOL_PRE_PING
+
+    if DATABASE_PGBOUNCER:
+        options["poolclass"] = NullPool
+        if asynchronous:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if asynchronous else InstrumentedQueuePool,
+        pool_size=DATABASE_POOL_SIZE,
+        max_overflow=DATABASE_MAX_OVERFLOW,
+        pool_timeout=DATABASE_POOL_TIMEOUT,
+        pool_recycle=DATABASE_POOL_RECYCLE,
+    )
+    return options
@@ -0,0 +1,105 @@
+import time
+from itertools import count
+from threading import Lock
+from typing import Dict, List, Optional
+from decouple import Csv, config
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from core.metrics import metrics
+from utils.ttl_cache import TTLCache
+
+DATABASE_REPLICA_URLS: List[str] = config(
+    "DATABASE_REPLICA_URLS", default="", cast=Csv()
+)
+REPLICA_RETRY_INTERVAL: float = config("REPLICA_RETRY_INTERVAL", default=30, cast=float)
+READ_YOUR_WRITES_WINDOW: float = config(
+    "READ_YOUR_WRITES_WINDOW", default=5, cast=float
+)
+
+REPLICA_KEY = "replica"
+
+
+class ReplicaSet:
+    """
+    Réplicas de leitura escolhidas em rodízio (round-robin).
+
+    Uma réplica que falha ao conectar (ou perde a conexão) fica fora do rodízio por
+    `retry_interval` segundos e volta a ser tentada depois disso; sem réplicas disponíveis,
+    as leituras seguem para o primário. Falhas são contabilizadas em `db_replica_failures`.
+    """
+
+    def __init__(self, engines: List[Engine], retry_interval: float):
+        self.engines = engines
+        self.retry_interval = retry_interval
+        self._next = count()
+        self._down_until: Dict[int, float] = {}
+        self._lock = Lock()
+
+        for index, engine in enumerate(engines):
+            event.listen(engine, "handle_error", self._handle_error(index))
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def _handle_error(self, index: int):
+        def handle_error(context) -> None:
+            if context.connection is None or context.is_disconnect:
+                self.mark_down(index)
+
+        return handle_error
+
+    def mark_down(self, index: int) -> None:
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_interval
+        metrics.increment("db_replica_failures", replica=index)
+
+    def choose(self) -> Optional[Engine]:
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            index = next(self._next) % len(self.engines)
+            if self._down_until.get(index, 0) <= now:
+                return self.engines[index]
+        return None
+
+
+class ReadYourWrites:
+    """
+    Usuários que gravaram algo há menos de `window` segundos leem do primário,
+    enxergando as próprias alterações mesmo com atraso de replicação.
+    O registro é mantido por processo.
+    """
+
+    def __init__(self, window: float):
+        self.recent = TTLCache(ttl=window, maxsize=65536)
+
+    def record(self, user_id: int) -> None:
+        self.recent.set(user_id, True)
+
+    def pinned(self, user_id: Optional[int]) -> bool:
+        return user_id is not None and self.recent.get(user_id, False)
+
+    def clear(self) -> None:
+        self.recent.clear()
+
+
+class RoutingSession(Session):
+    """
+    Sessão que envia consultas somente leitura (SELECT sem `FOR UPDATE`) à réplica
+    definida em `info["replica"]`; escritas, flushes e bloqueios usam o primário.
+    Sem réplica definida, comporta-se como a `Session` padrão.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        replica = self.info.get(REPLICA_KEY)
+        if replica is not None and not self._flushing and is_read_only(clause):
+            return replica
+
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def is_read_only(clause) -> bool:
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+read_your_writes = ReadYourWrites(READ_YOUR_WRITES_WINDOW)
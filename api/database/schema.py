@@ -0,0 +1,92 @@
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+from decouple import Choices, config
+from sqlalchemy import Connection, text
+from sqlalchemy.exc import DBAPIError
+from database.compile_cache import without_compile_cache_metrics
+from database.config import Base, DATABASE_ASYNC, async_engine, engine
+
+logger = logging.getLogger(__name__)
+
+# check: falha se o banco não estiver na revisão mais recente do Alembic
+# warn: apenas registra o aviso e segue a inicialização
+# create: cria as tabelas a partir dos modelos (`create_all`), somente em desenvolvimento e testes
+DATABASE_SCHEMA_MODE: str = config(
+    "DATABASE_SCHEMA_MODE", default="check", cast=Choices(["check", "warn", "create"])
+)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations" / "versions"
+REVISION_PATTERN = re.compile(r"^(revision|down_revision)\b[^=]*=(.*)$", re.MULTILINE)
+REVISION_ID_PATTERN = re.compile(r"[\"'](\w+)[\"']")
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def get_head_revision() -> str:
+    """
+    Revisão mais recente entre as migrações: a única que nenhuma outra tem como
+    `down_revision`. Lê apenas as atribuições nos arquivos, sem importar as migrações
+    (o que o `ScriptDirectory` do Alembic faria a cada inicialização de worker).
+    """
+    revisions, parents = set(), set()
+    for path in MIGRATIONS_DIR.glob("*.py"):
+        for name, value in REVISION_PATTERN.findall(path.read_text()):
+            ids = REVISION_ID_PATTERN.findall(value)
+            (revisions if name == "revision" else parents).update(ids)
+
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise SchemaVersionError(f"As migrações possuem {len(heads)} revisões finais")
+    return heads.pop()
+
+
+def get_database_revision(connection: Connection) -> Optional[str]:
+    """Revisão aplicada ao banco, ou None se as migrações nunca foram executadas"""
+    try:
+        return connection.scalar(text("SELECT version_num FROM alembic_version"))
+    except DBAPIError:
+        return None
+
+
+def check_schema_version(connection: Connection, mode: str = DATABASE_SCHEMA_MODE):
+    head = get_head_revision()
+    revision = get_database_revision(connection)
+    if revision == head:
+        return
+
+    message = (
+        f"O banco está na revisão {revision or '(nenhuma)'}, mas a mais recente é "
+        f"{head}; execute `alembic upgrade head`"
+    )
+    if mode == "warn":
+        logger.warning(message)
+        return
+    raise SchemaVersionError(message)
+
+
+async def prepare_schema() -> None:
+    """
+    Executada na inicialização de cada worker: confere a revisão do banco com uma única
+    consulta ou, no modo `create`, cria as tabelas a partir dos modelos.
+    """
+    # Instruções da inicialização, fora da métrica do cache de compilação
+    if DATABASE_ASYNC:
+        schema_engine = without_compile_cache_metrics(async_engine)
+        if DATABASE_SCHEMA_MODE == "create":
+            async with schema_engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+        else:
+            async with schema_engine.connect() as connection:
+                await connection.run_sync(check_schema_version)
+        return
+
+    schema_engine = without_compile_cache_metrics(engine)
+    if DATABASE_SCHEMA_MODE == "create":
+        Base.metadata.create_all(bind=schema_engine)
+    else:
+        with schema_engine.connect() as connection:
+            check_schema_version(connection)
@@ -0,0 +1,64 @@
+from typing import Any, Callable, Iterable, Optional
+from sqlalchemy.orm import Session
+
+
+class SyncSessionAdapter:
+    """
+    Expõe uma `Session` síncrona com a mesma interface aguardável da `AsyncSession`.
+
+    Utilizado quando `DATABASE_ASYNC=False`, permitindo que os serviços sejam escritos
+    uma única vez (com `await`) e executados sobre o driver síncrono. Nesse modo as
+    consultas bloqueiam o event loop, o que serve de base de comparação com o modo assíncrono.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Iterable[Any]) -> None:
+        self.sync_session.add_all(instances)
+
+    def expunge(self, instance: Any) -> None:
+        self.sync_session.expunge(instance)
+
+    @property
+    def info(self) -> dict:
+        return self.sync_session.info
+
+    def get_bind(self, *args, **kwargs):
+        return self.sync_session.get_bind(*args, **kwargs)
+
+    async def execute(self, statement, params=None, **kwargs):
+        return self.sync_session.execute(statement, params, **kwargs)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return self.sync_session.scalar(statement, params, **kwargs)
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return self.sync_session.scalars(statement, params, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return self.sync_session.get(entity, ident, **kwargs)
+
+    async def flush(self, objects: Optional[Iterable[Any]] = None) -> None:
+        self.sync_session.flush(objects)
+
+    async def commit(self) -> None:
+        self.sync_session.commit()
+
+    async def rollback(self) -> None:
+        self.sync_session.rollback()
+
+    async def refresh(self, instance: Any, attribute_names=None, **kwargs) -> None:
+        self.sync_session.refresh(instance, attribute_names, **kwargs)
+
+    async def delete(self, instance: Any) -> None:
+        self.sync_session.delete(instance)
+
+    async def close(self) -> None:
+        self.sync_session.close()
+
+    async def run_sync(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        return fn(self.sync_session, *args, **kwargs)
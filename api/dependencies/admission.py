@@ -0,0 +1,49 @@
+from ipaddress import ip_address, ip_network
+from typing import Annotated
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordRequestForm
+from core.security.admission import ADMISSION_TRUSTED_PROXIES, admission
+
+trusted_proxies = [
+    ip_network(proxy, strict=False) for proxy in ADMISSION_TRUSTED_PROXIES
+]
+
+
+def is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in trusted_proxies)
+
+
+def client_ip(request: Request) -> str:
+    """
+    IP de quem fez a requisição, chave do limite por IP. Quando a conexão vem de um
+    proxy confiável (`ADMISSION_TRUSTED_PROXIES`), usa o último endereço do
+    `X-Forwarded-For` que não seja de um proxy confiável; o cliente pode forjar apenas
+    os endereços à esquerda dos acrescentados pelos proxies.
+    """
+    host = request.client.host if request.client else "desconhecido"
+    if not is_trusted_proxy(host):
+        return host
+
+    forwarded_for = ",".join(request.headers.getlist("x-forwarded-for"))
+    for address in reversed([item.strip() for item in forwarded_for.split(",")]):
+        if address and not is_trusted_proxy(address):
+            return address
+    return host
+
+
+async def admit_login(
+    request: Request, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
+):
+    """Limita as tentativas de login por IP e por nome de usuário"""
+    async with admission.admit(client_ip(request), form_data.username):
+        yield
+
+
+async def admit_registration(request: Request):
+    """Limita os cadastros por IP"""
+    async with admission.admit(client_ip(request)):
+        yield
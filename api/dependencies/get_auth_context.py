@@ -0,0 +1,24 @@
+from typing import Annotated
+from fastapi import Depends
+from dependencies.get_session_db import SessionDep
+from schemas.auth import TokenStorage, TokenType
+from services.auth import verify_token
+from services.revocation import RevocationService
+from core.security.auth import oauth2_scheme
+
+
+async def get_auth_context(
+    token: Annotated[str, Depends(oauth2_scheme)], session: SessionDep
+) -> TokenStorage:
+    """
+    Decodifica e valida o token de acesso da requisição.
+    O FastAPI guarda o resultado de cada dependência durante a requisição, então o token
+    é decodificado uma única vez, mesmo que várias permissões dependam dele.
+    A revogação é verificada em memória (ver `RevocationStore`).
+    """
+    auth = await verify_token(token, TokenType.ACCESS)
+    await RevocationService(session).ensure_not_revoked(auth)
+    return auth
+
+
+AuthContextDep = Annotated[TokenStorage, Depends(get_auth_context)]
@@ -1,17 +1,62 @@
-from database.config import Session
-from typing import Annotated
-from fastapi import Depends
+import jwt
+from functools import partial
+from database.config import DATABASE_ASYNC, AsyncSessionLocal, Session, replicas
+from database.lazy_session import LazySession
+from database.replicas import REPLICA_KEY, read_your_writes
+from database.sync_session import SyncSessionAdapter
+from typing import Annotated, Optional
+from fastapi import Depends, Request
+from fastapi.security.utils import get_authorization_scheme_param
+from sqlalchemy.ext.asyncio import AsyncSession
 
+READ_ONLY_METHODS = ("GET", "HEAD")
 
-def get_session_db():
-    db = Session()
+
+def create_session(read_only: bool = False):
+    """
+    Cria a sessão de banco conforme o modo configurado (assíncrono ou síncrono).
+    Sessões somente leitura consultam uma réplica, quando houver alguma disponível.
+    """
+    session = AsyncSessionLocal() if DATABASE_ASYNC else SyncSessionAdapter(Session())
+
+    replica = replicas.choose() if read_only and replicas else None
+    if replica is not None:
+        session.info[REPLICA_KEY] = replica
+    return session
+
+
+def get_request_user_id(request: Request) -> Optional[int]:
+    """
+    Usuário do token, sem validar a assinatura: serve apenas para escolher entre réplica
+    e primário. A autenticação continua a cargo de `get_auth_context`.
+    """
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    try:
+        payload = jwt.decode(token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return None
+    return payload.get("user_id")
+
+
+async def get_session_db(request: Request):
+    user_id = get_request_user_id(request) if replicas else None
+    read_only = request.method in READ_ONLY_METHODS and not read_your_writes.pinned(
+        user_id
+    )
+
+    db = LazySession(partial(create_session, read_only))
     try:
         yield db
     except Exception:
-        db.rollback()
+        await db.rollback()
         raise
     finally:
-        db.close()
+        if db.committed and user_id is not None:
+            read_your_writes.record(user_id)
+        await db.close()
 
 
-SessionDep = Annotated[Session, Depends(get_session_db)]
+SessionDep = Annotated[AsyncSession, Depends(get_session_db)]
@@ -1,26 +1,45 @@
+from typing import Optional
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from dependencies.get_session_db import SessionDep
+from models.administrator import Administrator
+from models.client import Client
 from models.user import User
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
-from schemas.auth import TokenType
-from services.auth import verify_token
-from core.security.auth import oauth2_scheme
+from fastapi import HTTPException, status
+from dependencies.get_auth_context import AuthContextDep
+from core.security.principal import Principal, principal_cache
+
+
+async def load_principal(session: AsyncSession, user_id: int) -> Optional[Principal]:
+    """Carrega o usuário e seus papéis em uma única consulta"""
+    stmt = (
+        select(User.id, Client.id, Administrator.id)
+        .outerjoin(Client, Client.user_id == User.id)
+        .outerjoin(Administrator, Administrator.user_id == User.id)
+        .where(User.id == user_id)
+    )
+    row = (await session.execute(stmt)).first()
+    if row is None:
+        return None
+
+    user_id, client_id, administrator_id = row
+    return Principal(user_id, client_id, administrator_id is not None)
 
 
 async def get_user_authenticated(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    session: SessionDep,
-) -> User:
-    payload = await verify_token(token, TokenType.ACCESS)
-    sub = payload.sub
+    auth: AuthContextDep, session: SessionDep
+) -> Principal:
+    principal = principal_cache.get(auth.user_id)
+    if principal is not None:
+        return principal
 
-    user = session.execute(select(User).where(User.name == sub)).scalar_one_or_none()
-    if user is None:
+    principal = await load_principal(session, auth.user_id)
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuário não encontrado",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user
+    principal_cache.set(auth.user_id, principal)
+    return principal
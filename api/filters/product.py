@@ -5,6 +5,18 @@ from fastapi import Query
 class ProductFilter:
     def __init__(
         self,
+        description: str = Query(
+            default=None,
+            max_length=255,
+            description="""
+    Busca produtos pelas palavras da descrição.
+    ### Características:
+        - Busca textual por palavras (não distingue minúsculas e maiúsculas)
+        - Aceita a sintaxe de busca web: `"frase exata"`, `or` e `-palavra`
+        - Máximo de 255 caracteres
+        - Exemplo: `?description=camisa azul` encontra "Camisa de algodão azul"
+    """,
+        ),
         category_id: int = Query(
             default=None,
             description="""
@@ -28,14 +40,14 @@ class ProductFilter:
     - Exemplo: `?value__gte=100` encontra todos os produtos que possuem o valor igual ou maior a 100.
     """,
         ),
-        stock__lte: str = Query(
+        stock__lte: int = Query(
             default=None,
             description="""
     Filtra por produtos que possuem o estoque menor ou igual ao estoque informado.
     - Exemplo: `?stock__lte=10` encontra todos os produtos que possuem o estoque igual ou menor que 100.
     """,
         ),
-        stock__gte: str = Query(
+        stock__gte: int = Query(
             default=None,
             description="""
     Filtra por produtos que possuem o estoque maior ou igual ao estoque informado.
@@ -43,6 +55,7 @@ class ProductFilter:
     """,
         ),
     ):
+        self.description = description
         self.category_id = category_id
         self.value__lte = value__lte
         self.value__gte = value__gte
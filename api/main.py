@@ -3,9 +3,12 @@ from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from sqladmin import Admin
 from routers import all_routers
-from database.config import Base, engine
+from database.compile_cache import without_compile_cache_metrics
+from database.config import DATABASE_ASYNC, async_engine, engine
+from database.schema import prepare_schema
 from decouple import config
 from admin import all_admins
+from orm.utils.filter_plan import compile_filter_plans
 
 SENTRY_DSN = config("SENTRY_DSN", default=None)
 
@@ -21,8 +24,12 @@ if SENTRY_DSN is not None:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    await prepare_schema()
+
     yield
+
+    if DATABASE_ASYNC:
+        await async_engine.dispose()
     engine.dispose()
 
 
@@ -42,9 +49,11 @@ app = FastAPI(
     """,
 )
 
-admin = Admin(app, engine)
+admin = Admin(app, without_compile_cache_metrics(engine))
 for adm in all_admins:
     admin.add_view(adm)
 
 for router in all_routers:
     app.include_router(router)
+
+compile_filter_plans()
@@ -13,6 +13,7 @@ from models.administrator import Administrator
 from models.category import Category
 from models.product import Product
 from models.order import Order
+from models.token_revocation import TokenRevocation
 
 
 # this is the Alembic Config object, which provides
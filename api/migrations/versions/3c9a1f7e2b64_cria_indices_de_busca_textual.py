@@ -0,0 +1,80 @@
+"""cria indices de busca textual
+
+Revision ID: 3c9a1f7e2b64
+Revises: 537e4f683433
+Create Date: 2026-10-18 13:20:41.512903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9a1f7e2b64'
+down_revision: Union[str, None] = '537e4f683433'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRGM_INDEXES = [
+    ('ix_user_name_trgm', 'user', 'name'),
+    ('ix_user_email_trgm', 'user', 'email'),
+    ('ix_client_cpf_trgm', 'client', 'cpf'),
+    ('ix_category_name_trgm', 'category', 'name'),
+    ('ix_category_description_trgm', 'category', 'description'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Índices criados com CONCURRENTLY para não bloquear escritas em tabelas grandes
+    with op.get_context().autocommit_block():
+        for index_name, table_name, column_name in TRGM_INDEXES:
+            op.create_index(
+                index_name,
+                table_name,
+                [column_name],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column_name: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        op.create_index(
+            'ix_product_description_fts',
+            'product',
+            [sa.text("to_tsvector('portuguese', description)")],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_product_description_fts',
+            table_name='product',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+        for index_name, table_name, _ in reversed(TRGM_INDEXES):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
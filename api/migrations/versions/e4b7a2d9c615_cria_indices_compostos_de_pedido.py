@@ -0,0 +1,74 @@
+"""cria indices compostos de pedido
+
+Revision ID: e4b7a2d9c615
+Revises: 8d41c0b7a9e3
+Create Date: 2026-10-18 18:05:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7a2d9c615'
+down_revision: Union[str, None] = '8d41c0b7a9e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COMPOSITE_INDEXES = [
+    ('ix_order_client_id_date', ['client_id', 'date']),
+    ('ix_order_status_date', ['status', 'date']),
+]
+
+# Substituídos pelos índices compostos, que possuem a mesma coluna como prefixo
+REPLACED_INDEXES = [
+    ('ix_order_client_id', ['client_id']),
+    ('ix_order_status', ['status']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Índices criados com CONCURRENTLY para não bloquear escritas em tabelas grandes
+    with op.get_context().autocommit_block():
+        for index_name, columns in COMPOSITE_INDEXES:
+            op.create_index(
+                index_name,
+                'order',
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        for index_name, _ in REPLACED_INDEXES:
+            op.drop_index(
+                index_name,
+                table_name='order',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, columns in REPLACED_INDEXES:
+            op.create_index(
+                index_name,
+                'order',
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        for index_name, _ in reversed(COMPOSITE_INDEXES):
+            op.drop_index(
+                index_name,
+                table_name='order',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -1,8 +1,7 @@
 from database.config import Base
-from fastapi import HTTPException, status
-from sqlalchemy import ForeignKey, event
-from sqlalchemy.orm import Mapped, mapped_column, relationship, Session
-from orm.utils.exists import exists
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from orm.utils.integrity import UNIQUE_MESSAGE_KEY
 
 
 class Administrator(Base):
@@ -12,6 +11,9 @@ class Administrator(Base):
     user_id: Mapped[int] = mapped_column(
         ForeignKey("user.id", ondelete="CASCADE"),
         unique=True,
+        info={
+            UNIQUE_MESSAGE_KEY: "Já existe um administrador associado a esse usuário"
+        },
     )
     user: Mapped["User"] = relationship(
         back_populates="administrator", single_parent=True
@@ -19,19 +21,3 @@ class Administrator(Base):
 
     def __repr__(self) -> str:
         return self.user.name
-
-
-def check_user_administrator_exists(session: Session, user_id: int) -> None:
-    """Verifica se já existe um administrador vinculado ao usuário fornecido"""
-    if exists(session, Administrator, user_id=user_id):
-        raise HTTPException(
-            status.HTTP_400_BAD_REQUEST,
-            "Já existe um administrador associado a esse usuário",
-        )
-
-
-@event.listens_for(Administrator, "before_insert")
-def validate_user_administrator(mapper, connection, target):
-    session = Session.object_session(target) or Session(bind=connection)
-
-    check_user_administrator_exists(session, target.user_id)
@@ -1,6 +1,6 @@
 from typing import List, Optional
 from database.config import Base
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -14,3 +14,18 @@ class Category(Base):
 
     def __repr__(self) -> str:
         return f"{self.name} - {self.description}"
+
+    __table_args__ = (
+        Index(
+            "ix_category_name_trgm",
+            name,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_category_description_trgm",
+            description,
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
@@ -4,7 +4,7 @@ from uuid import uuid4
 from typing import List, Optional
 from models.client import Client
 from database.config import Base
-from sqlalchemy import DECIMAL, ForeignKey, UUID
+from sqlalchemy import DECIMAL, ForeignKey, Index, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -13,9 +13,9 @@ class Order(Base):
 
     id: Mapped[str] = mapped_column(UUID(as_uuid=True), default=uuid4, primary_key=True)
     date: Mapped[datetime] = mapped_column(default=datetime.now, index=True)
-    status: Mapped[str] = mapped_column(index=True)
+    status: Mapped[str] = mapped_column()
     client_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("client.id", ondelete="SET NULL"), index=True
+        ForeignKey("client.id", ondelete="SET NULL")
     )
     client: Mapped[Optional[Client]] = relationship(back_populates="orders")
     products: Mapped[List["OrderProduct"]] = relationship(
@@ -23,6 +23,13 @@ class Order(Base):
     )
     price_total: Mapped[Decimal] = mapped_column(DECIMAL(10, 2))
 
+    # Listagens filtradas por cliente ou por status, ordenadas e limitadas pela data.
+    # Também atendem as buscas apenas por `client_id` ou `status` (prefixo do índice).
+    __table_args__ = (
+        Index("ix_order_client_id_date", client_id, date),
+        Index("ix_order_status_date", status, date),
+    )
+
     def __repr__(self) -> str:
         if self.client is not None:
             return f"{self.client} - {self.date}"
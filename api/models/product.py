@@ -1,7 +1,8 @@
 from typing import Optional, List
 from models.order_product import OrderProduct
 from database.config import Base
-from sqlalchemy import ForeignKey, String, CheckConstraint
+from orm.utils.search import FULL_TEXT_CONFIG
+from sqlalchemy import ForeignKey, Index, String, CheckConstraint, func, literal_column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import DECIMAL
 from decimal import Decimal
@@ -12,7 +13,9 @@ class Product(Base):
     __tablename__ = "product"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    description: Mapped[str] = mapped_column(String(length=500))
+    description: Mapped[str] = mapped_column(
+        String(length=500), info={"search": "full_text"}
+    )
     value: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), index=True)
     bar_code: Mapped[str]
     stock: Mapped[int] = mapped_column(index=True)
@@ -26,5 +29,12 @@ class Product(Base):
     def __repr__(self) -> str:
         return self.description
 
-    __table_args__ = (CheckConstraint("stock >= 0", name="stock_gte"),)
-    __table_args__ = (CheckConstraint("value >= 0", name="value_gte"),)
+    __table_args__ = (
+        CheckConstraint("stock >= 0", name="stock_gte"),
+        CheckConstraint("value >= 0", name="value_gte"),
+        Index(
+            "ix_product_description_fts",
+            func.to_tsvector(literal_column(f"'{FULL_TEXT_CONFIG}'"), description),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
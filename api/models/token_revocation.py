@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+from database.config import Base
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class TokenRevocation(Base):
+    """
+    Revogação de tokens: de um token específico (`jti`) ou, quando `jti` é nulo,
+    de todos os tokens do usuário emitidos até `revoked_at`.
+    """
+
+    __tablename__ = "token_revocation"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    jti: Mapped[Optional[str]] = mapped_column(String(length=32), unique=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), index=True
+    )
+    revoked_at: Mapped[datetime] = mapped_column(default=datetime.now, index=True)
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+
+    def __repr__(self) -> str:
+        return f"{self.user_id} - {self.jti or 'todos os tokens'}"
@@ -1,9 +1,158 @@
-from typing import Type
-from pydantic import BaseModel
-from sqlalchemy import select
-from sqlalchemy import func
+import json
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, Optional
+from decouple import config
+from sqlalchemy import Select, Table, event, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import ORMExecuteState, Session, object_mapper
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql.util import find_tables
+from schemas.utils.pagination import CountMode
+from utils.ttl_cache import TTLCache
 
+COUNT_CACHE_TTL: float = config("COUNT_CACHE_TTL", default=10, cast=float)
 
-def count_collection(session, model: Type[BaseModel]):
-    count_stmt = select(func.count()).select_from(model)
-    return session.execute(count_stmt).scalar_one()
+count_cache = TTLCache(ttl=COUNT_CACHE_TTL)
+"""
+Contagens por consulta. As escritas confirmadas por este processo invalidam as contagens
+das tabelas alteradas; as de outros processos aparecem em até `COUNT_CACHE_TTL` segundos.
+"""
+
+WRITTEN_TABLES_KEY = "count_cache_written_tables"
+"""Chave do `info` da sessão com as tabelas alteradas na transação em andamento"""
+
+table_versions: Dict[Table, int] = defaultdict(int)
+"""Versão de cada tabela, incrementada a cada escrita confirmada (faz parte da chave)"""
+
+
+def invalidate_counts(tables: Iterable[Table]) -> None:
+    for table in tables:
+        table_versions[table] += 1
+
+
+@event.listens_for(Session, "after_flush")
+def track_flushed_tables(session: Session, flush_context) -> None:
+    tables = session.info.setdefault(WRITTEN_TABLES_KEY, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        tables.update(object_mapper(instance).tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def track_executed_tables(orm_execute_state: ORMExecuteState) -> None:
+    """Escritas em lote (`insert`, `update` e `delete`), que não passam pelo flush"""
+    if orm_execute_state.is_select:
+        return
+
+    table = getattr(orm_execute_state.statement, "table", None)
+    if isinstance(table, Table):
+        orm_execute_state.session.info.setdefault(WRITTEN_TABLES_KEY, set()).add(table)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_written_tables(session: Session) -> None:
+    invalidate_counts(session.info.pop(WRITTEN_TABLES_KEY, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_written_tables(session: Session) -> None:
+    session.info.pop(WRITTEN_TABLES_KEY, None)
+
+
+class Explain(Executable, ClauseElement):
+    """Instrução `EXPLAIN (FORMAT JSON)` de uma consulta, usada para estimar contagens"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element: Explain, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def count_collection(
+    session: AsyncSession, stmt: Select, mode: CountMode = CountMode.EXACT
+) -> Optional[int]:
+    """
+    Conta os registros da consulta filtrada, reaproveitando resultados recentes do cache.
+    Consultas sem chave de cache no SQLAlchemy são sempre contadas no banco.
+    """
+    if mode == CountMode.NONE:
+        return None
+
+    dialect = session.get_bind().dialect
+    if mode == CountMode.ESTIMATED and dialect.name != "postgresql":
+        mode = CountMode.EXACT
+
+    count_stmt = stmt.with_only_columns(
+        func.count(), maintain_column_froms=True
+    ).order_by(None)
+
+    key = build_cache_key(count_stmt, mode)
+    total_count = count_cache.get(key) if key is not None else None
+    if total_count is not None:
+        return total_count
+
+    if mode == CountMode.ESTIMATED:
+        total_count = await estimate_count(session, stmt)
+
+    if total_count is None:
+        total_count = (await session.execute(count_stmt)).scalar_one()
+
+    if key is not None:
+        count_cache.set(key, total_count)
+    return total_count
+
+
+def build_cache_key(count_stmt: Select, mode: CountMode) -> Optional[Hashable]:
+    """
+    Chave do cache: a estrutura da consulta (a mesma chave usada pelo cache de compilação
+    do SQLAlchemy), os valores dos parâmetros e a versão das tabelas consultadas, sem
+    compilar o SQL a cada requisição. Retorna None quando a consulta não tem chave de
+    cache (elementos que não suportam o cache de compilação).
+    """
+    cache_key = count_stmt._generate_cache_key()
+    if cache_key is None:
+        return None
+
+    params = tuple(repr(bind.effective_value) for bind in cache_key.bindparams)
+    tables = {
+        table
+        for table in find_tables(count_stmt, include_crud=False)
+        if isinstance(table, Table)
+    }
+    versions = tuple(
+        sorted((table.fullname, table_versions[table]) for table in tables)
+    )
+    return (mode, cache_key.key, params, versions)
+
+
+async def estimate_count(session: AsyncSession, stmt: Select) -> Optional[int]:
+    """
+    Estima a quantidade de registros no PostgreSQL.
+    Sem filtros, usa `pg_class.reltuples`; com filtros, a estimativa de linhas do EXPLAIN.
+    Retorna None quando não há estimativa disponível (tabela nunca analisada).
+    """
+    froms = stmt.get_final_froms()
+
+    if stmt.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+        preparer = session.get_bind().dialect.identifier_preparer
+        reltuples = (
+            await session.execute(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:name AS regclass)"
+                ),
+                {"name": preparer.format_table(froms[0])},
+            )
+        ).scalar_one_or_none()
+
+        return reltuples if reltuples is not None and reltuples >= 0 else None
+
+    plan = (await session.execute(Explain(stmt.order_by(None)))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
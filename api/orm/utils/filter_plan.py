@@ -0,0 +1,221 @@
+import inspect as pyinspect
+import operator
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type, TypeVar
+from fastapi import HTTPException, status
+from sqlalchemy import Enum, String, inspect, true
+from sqlalchemy.orm import DeclarativeBase, InstrumentedAttribute
+from orm.utils.search import Contains, FullTextMatch
+
+BaseModel = TypeVar("BaseModel", bound=DeclarativeBase)
+T = TypeVar("T")
+
+PredicateBuilder = Callable[[Any], Any]
+
+COMPARISON_OPERATORS = {
+    "lte": operator.le,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "gt": operator.gt,
+    "eq": operator.eq,
+    "ne": operator.ne,
+}
+
+FILTER_PLANS: List["FilterPlan"] = []
+
+
+class FilterPredicate(NamedTuple):
+    """Predicado de um atributo do filtro, com os relacionamentos que precisa unir"""
+
+    attr: str
+    joins: Tuple[Tuple[str, InstrumentedAttribute], ...]
+    build: PredicateBuilder
+
+
+class FilterPlan:
+    """
+    Plano de filtragem de um modelo, analisado uma única vez a partir da classe de filtro.
+
+    Cada parâmetro do filtro vira um construtor de predicado já vinculado à coluna
+    (e aos relacionamentos necessários), de modo que a requisição apenas informa os valores.
+    Predicados que não seguem a convenção de nomes podem ser informados em `overrides`.
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        filter_class: type,
+        overrides: Optional[Dict[str, PredicateBuilder]] = None,
+    ):
+        self.model = model
+        self.filter_class = filter_class
+        self.overrides = overrides or {}
+        self._predicates: Optional[Tuple[FilterPredicate, ...]] = None
+        FILTER_PLANS.append(self)
+
+    @property
+    def predicates(self) -> Tuple[FilterPredicate, ...]:
+        # Compilado sob demanda: os mapeadores só podem ser inspecionados após todos
+        # os modelos serem importados (ver `compile_filter_plans`)
+        if self._predicates is None:
+            self._predicates = compile_filter_plan(
+                self.model, self.filter_class, self.overrides
+            )
+        return self._predicates
+
+    def apply(self, stmt, filters: Optional[T] = None):
+        """Apply filter conditions to the query"""
+        if filters is None:
+            return stmt
+
+        joined = set()
+        for predicate in self.predicates:
+            value = getattr(filters, predicate.attr)
+            if value is None:
+                continue
+
+            for path, relationship in predicate.joins:
+                if path not in joined:
+                    stmt = stmt.join(relationship)
+                    joined.add(path)
+
+            stmt = stmt.where(predicate.build(value))
+
+        return stmt
+
+
+def compile_filter_plans() -> None:
+    """Compila todos os planos declarados, rejeitando caminhos inválidos na inicialização"""
+    for plan in FILTER_PLANS:
+        plan.predicates
+
+
+def filter_fields(filter_class: type) -> List[str]:
+    """Atributos da classe de filtro (parâmetros do seu construtor)"""
+    parameters = pyinspect.signature(filter_class.__init__).parameters
+    return [name for name in parameters if name != "self"]
+
+
+def compile_filter_plan(
+    model: Type[BaseModel],
+    filter_class: type,
+    overrides: Dict[str, PredicateBuilder],
+) -> Tuple[FilterPredicate, ...]:
+    predicates = []
+
+    for attr in filter_fields(filter_class):
+        if attr in overrides:
+            predicates.append(FilterPredicate(attr, (), overrides[attr]))
+            continue
+
+        parts = attr.split("__")
+        if len(parts) == 2 and parts[1] in COMPARISON_OPERATORS:  # Comparação
+            field, operator_name = parts
+            check_column(model, field, filter_class, attr)
+            build = comparison_builder(
+                model, field, COMPARISON_OPERATORS[operator_name]
+            )
+            predicates.append(FilterPredicate(attr, (), build))
+            continue
+
+        joins = []
+        current_model = model
+        for part in parts[:-1]:  # Relacionamentos aninhados (ex.: user__name)
+            relationships = inspect(current_model).relationships
+            if part not in relationships:
+                raise ValueError(
+                    f"Filtro '{attr}' de {filter_class.__name__}: relacionamento "
+                    f"'{part}' não encontrado em {current_model.__name__}"
+                )
+
+            path = "__".join(parts[: len(joins) + 1])
+            joins.append((path, getattr(current_model, part)))
+            current_model = relationships[part].mapper.class_
+
+        check_column(current_model, parts[-1], filter_class, attr)
+        build = match_builder(current_model, parts[-1])
+        predicates.append(FilterPredicate(attr, tuple(joins), build))
+
+    return tuple(predicates)
+
+
+def check_column(model: Type[BaseModel], field: str, filter_class: type, attr: str):
+    if field not in inspect(model).column_attrs:
+        raise ValueError(
+            f"Filtro '{attr}' de {filter_class.__name__}: campo '{field}' "
+            f"não encontrado em {model.__name__}"
+        )
+
+
+def is_text_column(model: Type[BaseModel], field: str) -> bool:
+    """Colunas textuais (exceto enums) são filtradas por busca; as demais, por igualdade"""
+    column_type = inspect(model).column_attrs[field].columns[0].type
+    return isinstance(column_type, String) and not isinstance(column_type, Enum)
+
+
+def value_coercer(model: Type[BaseModel], field: str) -> Callable[[Any], Any]:
+    """Conversor do valor do filtro para o tipo Python da coluna"""
+    python_type = inspect(model).column_attrs[field].columns[0].type.python_type
+
+    def parse(value):
+        if python_type in (date, datetime):
+            return python_type.fromisoformat(str(value))
+        return python_type(value)
+
+    def coerce(value):
+        if isinstance(value, python_type):
+            return value
+
+        try:
+            return parse(value)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                f"Valor inválido para o campo '{field}' em {model.__name__}",
+            )
+
+    return coerce
+
+
+def comparison_builder(
+    model: Type[BaseModel], field: str, compare: Callable[[Any, Any], Any]
+) -> PredicateBuilder:
+    """Aplica filtros de comparação (lte, gte, lt, gt, eq, ne)"""
+    column = getattr(model, field)
+    coerce = value_coercer(model, field)
+    return lambda value: compare(column, coerce(value))
+
+
+def match_builder(model: Type[BaseModel], field: str) -> PredicateBuilder:
+    """Busca textual em colunas de texto; igualdade (que aproveita índices) nas demais"""
+    column = getattr(model, field)
+
+    if is_text_column(model, field):
+        if column.info.get("search") == "full_text":
+            return lambda value: FullTextMatch(column, value)
+        return lambda value: Contains(column, value)
+
+    coerce = value_coercer(model, field)
+    return lambda value: column == coerce(value)
+
+
+def on_or_after_day(column) -> PredicateBuilder:
+    """
+    Registros a partir do início do dia informado, comparando a coluna de data e hora
+    diretamente (sem `CAST`), o que permite o uso do seu índice
+    """
+    return lambda value: column >= datetime.combine(value, time.min)
+
+
+def on_or_before_day(column) -> PredicateBuilder:
+    """
+    Registros até o fim do dia informado: intervalo semiaberto `< dia seguinte`.
+    Não há dia seguinte a `date.max`, então esse limite não restringe a consulta.
+    """
+
+    def build(value: date):
+        if value == date.max:
+            return true()
+        return column < datetime.combine(value + timedelta(days=1), time.min)
+
+    return build
@@ -1,18 +1,20 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
 from sqlalchemy import select
-from typing import Type, TypeVar, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Sequence, Type, TypeVar, Any
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm.interfaces import LoaderOption
 
 BaseModel = TypeVar("BaseModel", bound=DeclarativeBase)
 
 
-def get_object_or_404(
-    session: Session,
+async def get_object_or_404(
+    session: AsyncSession,
     model: Type[BaseModel],
     value: Any,
     column_name: str = "id",
     detail: str = "Object not found",
+    options: Sequence[LoaderOption] = (),
 ) -> BaseModel:
     column = getattr(model, column_name, None)
 
@@ -22,7 +24,8 @@ def get_object_or_404(
             detail=f"Column '{column_name}' not found in model {model.__name__}",
         )
 
-    obj = session.execute(select(model).where(column == value)).scalar_one_or_none()
+    stmt = select(model).where(column == value).options(*options)
+    obj = (await session.execute(stmt)).unique().scalar_one_or_none()
 
     if obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
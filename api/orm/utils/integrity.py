@@ -0,0 +1,83 @@
+import re
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Index, MetaData, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+from database.config import Base
+
+UNIQUE_MESSAGE_KEY = "unique_message"
+"""Chave do `info` da coluna com a mensagem exibida quando o valor já está cadastrado"""
+
+SQLITE_UNIQUE_ERROR = re.compile(r"UNIQUE constraint failed: (?P<columns>[\w., ]+)")
+
+
+class UniqueMessages:
+    """
+    Mensagens das restrições de unicidade declaradas nos modelos, indexadas pelo nome da
+    restrição (informado pelo PostgreSQL) e pelas colunas `tabela.coluna` (informadas pelo SQLite).
+    """
+
+    def __init__(self, metadata: MetaData):
+        self.metadata = metadata
+        self._by_name: Optional[Dict[str, str]] = None
+        self._by_columns: Dict[Tuple[str, ...], str] = {}
+
+    def compile(self) -> None:
+        self._by_name = {}
+        for table in self.metadata.tables.values():
+            unique_constraints = [
+                constraint
+                for constraint in (*table.constraints, *table.indexes)
+                if isinstance(constraint, UniqueConstraint)
+                or (isinstance(constraint, Index) and constraint.unique)
+            ]
+            for constraint in unique_constraints:
+                columns = list(constraint.columns)
+                message = columns[0].info.get(UNIQUE_MESSAGE_KEY)
+                if message is None:
+                    continue
+
+                # Restrições sem nome recebem o nome padrão do PostgreSQL
+                name = constraint.name or "_".join(
+                    [table.name, *(column.name for column in columns), "key"]
+                )
+                self._by_name[str(name)] = message
+                key = tuple(f"{table.name}.{column.name}" for column in columns)
+                self._by_columns[key] = message
+
+    def find(self, error: IntegrityError) -> Optional[str]:
+        if self._by_name is None:
+            self.compile()
+
+        name = get_constraint_name(error)
+        if name is not None:
+            return self._by_name.get(name)
+
+        match = SQLITE_UNIQUE_ERROR.search(str(error.orig))
+        if match is None:
+            return None
+
+        columns = tuple(column.strip() for column in match["columns"].split(","))
+        return self._by_columns.get(columns)
+
+
+def get_constraint_name(error: IntegrityError) -> Optional[str]:
+    """Restrição violada (`diag` no psycopg2, exceção de origem no asyncpg)"""
+    original = error.orig
+    diag = getattr(original, "diag", None)
+    if diag is not None:
+        return diag.constraint_name
+
+    return getattr(original.__cause__, "constraint_name", None)
+
+
+unique_messages = UniqueMessages(Base.metadata)
+
+
+def integrity_error_to_http(error: IntegrityError) -> HTTPException:
+    """Converte a violação de unicidade na resposta 400 correspondente"""
+    message = unique_messages.find(error)
+    if message is None:
+        return HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    return HTTPException(status.HTTP_400_BAD_REQUEST, message)
@@ -0,0 +1,49 @@
+"""
+Perfis de carregamento por schema de resposta.
+
+Cada perfil carrega, junto da consulta principal, todos os relacionamentos que o schema
+serializa. Relacionamentos "para um" usam `joinedload` (mesma consulta) e coleções usam
+`selectinload` (uma consulta extra por página), de forma que a quantidade de consultas
+não dependa do tamanho da página.
+"""
+
+from functools import lru_cache
+from typing import Dict, Tuple, Type
+from pydantic import BaseModel
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+from models.administrator import Administrator
+from models.client import Client
+from models.order import Order
+from models.order_product import OrderProduct
+from models.product import Product
+from schemas.administrator import AdministratorRead
+from schemas.client import ClientRead
+from schemas.order import OrderRead
+from schemas.order_product import OrderProductRead
+from schemas.product import ProductRead
+
+
+@lru_cache
+def get_loader_profiles() -> Dict[Type[BaseModel], Tuple[LoaderOption, ...]]:
+    """
+    Monta os perfis no primeiro uso: as opções de carregamento exigem os mapeamentos
+    configurados, o que só é possível após todos os modelos terem sido importados
+    """
+    return {
+        AdministratorRead: (joinedload(Administrator.user),),
+        ClientRead: (joinedload(Client.user),),
+        ProductRead: (joinedload(Product.category),),
+        OrderRead: (joinedload(Order.client).joinedload(Client.user),),
+        OrderProductRead: (
+            joinedload(Order.client).joinedload(Client.user),
+            selectinload(Order.products)
+            .joinedload(OrderProduct.product)
+            .joinedload(Product.category),
+        ),
+    }
+
+
+def loader_options(schema: Type[BaseModel]) -> Tuple[LoaderOption, ...]:
+    """Retorna as opções de carregamento necessárias para serializar o schema informado"""
+    return get_loader_profiles().get(schema, ())
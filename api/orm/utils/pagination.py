@@ -0,0 +1,138 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple, Type, TypeVar
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy import and_, inspect, tuple_
+from sqlalchemy.orm import DeclarativeBase, InstrumentedAttribute
+from schemas.utils.pagination import PaginationSchema
+
+BaseModel = TypeVar("BaseModel", bound=DeclarativeBase)
+
+
+class SortKey(NamedTuple):
+    """Coluna de ordenação da paginação e sua direção"""
+
+    column: InstrumentedAttribute
+    descending: bool = False
+
+
+def primary_key_sort(model: Type[BaseModel]) -> Tuple[SortKey, ...]:
+    """Ordenação padrão das listagens: chave primária crescente"""
+    return tuple(
+        SortKey(getattr(model, column.key)) for column in inspect(model).primary_key
+    )
+
+
+STRING_ENCODED_TYPES = (date, datetime, UUID, Decimal)
+"""Tipos gravados no cursor como texto (os demais mantêm o tipo JSON nativo)"""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Gera o cursor opaco a partir dos valores das colunas de ordenação"""
+
+    def serialize(value):
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        if isinstance(value, (UUID, Decimal)):
+            return str(value)
+        return value
+
+    payload = json.dumps([serialize(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_keys: Sequence[SortKey]) -> List[Any]:
+    """Recupera os valores das colunas de ordenação contidos no cursor"""
+    invalid_cursor = HTTPException(status.HTTP_400_BAD_REQUEST, "Cursor inválido")
+
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, ValueError):
+        raise invalid_cursor
+
+    if not isinstance(values, list) or len(values) != len(sort_keys):
+        raise invalid_cursor
+
+    decoded = []
+    for value, sort_key in zip(values, sort_keys):
+        python_type = sort_key.column.type.python_type
+        # O cursor vem do cliente: o tipo JSON precisa ser o gerado por `encode_cursor`
+        json_type = (
+            str if issubclass(python_type, STRING_ENCODED_TYPES) else python_type
+        )
+        # `bool` é subclasse de `int`, mas nunca é gerado para as colunas de ordenação
+        if isinstance(value, bool) or not isinstance(value, json_type):
+            raise invalid_cursor
+
+        try:
+            if hasattr(python_type, "fromisoformat"):
+                decoded.append(python_type.fromisoformat(value))
+            else:
+                decoded.append(python_type(value))
+        except (TypeError, ValueError):
+            raise invalid_cursor
+
+    return decoded
+
+
+def apply_keyset(stmt, sort_keys: Sequence[SortKey], cursor: str):
+    """
+    Restringe a consulta aos registros posteriores ao cursor.
+    A primeira coluna também é comparada isoladamente para que seu índice possa ser usado,
+    enquanto a comparação de tuplas desempata os registros com o mesmo valor.
+    """
+    values = decode_cursor(cursor, sort_keys)
+    first = sort_keys[0]
+    columns = [sort_key.column for sort_key in sort_keys]
+
+    if first.descending:
+        return stmt.where(
+            and_(first.column <= values[0], tuple_(*columns) < tuple_(*values))
+        )
+
+    return stmt.where(
+        and_(first.column >= values[0], tuple_(*columns) > tuple_(*values))
+    )
+
+
+def apply_pagination(stmt, pagination: PaginationSchema, sort_keys: Sequence[SortKey]):
+    """
+    Apply pagination to the query.
+    With a cursor, keyset pagination is used and the offset is ignored.
+    One extra row is fetched to tell whether there is a next page.
+    """
+    stmt = stmt.order_by(
+        *(
+            sort_key.column.desc() if sort_key.descending else sort_key.column.asc()
+            for sort_key in sort_keys
+        )
+    )
+
+    if pagination.cursor is not None:
+        stmt = apply_keyset(stmt, sort_keys, pagination.cursor)
+    else:
+        stmt = stmt.offset(pagination.offset)
+
+    return stmt.limit(pagination.limit + 1)
+
+
+def build_page(
+    rows: Sequence[BaseModel],
+    pagination: PaginationSchema,
+    sort_keys: Sequence[SortKey],
+) -> Tuple[List[BaseModel], Optional[str]]:
+    """Separa os registros da página e gera o cursor da próxima página, se houver"""
+    page = list(rows[: pagination.limit])
+    if len(rows) <= pagination.limit:
+        return page, None
+
+    last = page[-1]
+    next_cursor = encode_cursor(
+        [getattr(last, sort_key.column.key) for sort_key in sort_keys]
+    )
+    return page, next_cursor
@@ -0,0 +1,94 @@
+from sqlalchemy import Boolean, String, false, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+LIKE_ESCAPE = "\\"
+
+FULL_TEXT_CONFIG = "portuguese"
+"""Configuração de idioma do `to_tsvector` (deve ser a mesma dos índices de texto completo)"""
+
+
+def escape_like(value: str) -> str:
+    """Escapa os curingas do LIKE para que o valor seja buscado literalmente"""
+    return (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+class Contains(ColumnElement):
+    """
+    Busca por correspondência parcial, sem distinguir minúsculas e maiúsculas.
+    No PostgreSQL é compilada para `ILIKE`, atendida pelos índices GIN `gin_trgm_ops`;
+    nos demais bancos (SQLite) para `LIKE`, que já não distingue maiúsculas.
+    """
+
+    inherit_cache = True
+    type = Boolean()
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("pattern", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, column, value: str):
+        self.column = column
+        self.pattern = literal(f"%{escape_like(value)}%", String)
+
+
+class FullTextMatch(ColumnElement):
+    """
+    Busca textual por palavras: o texto precisa conter todas as palavras da consulta,
+    em qualquer ordem.
+    No PostgreSQL usa `to_tsvector`/`websearch_to_tsquery`, atendida pelo índice GIN
+    de texto completo. Nos demais bancos (SQLite) cada palavra vira uma busca por
+    correspondência parcial (`Contains`), combinadas com AND. Diferenças em relação ao
+    PostgreSQL: não há radicalização ("camisas" não encontra "camisa"), os acentos são
+    comparados literalmente e a sintaxe do `websearch_to_tsquery` (aspas, `or`, `-`)
+    não é interpretada.
+    """
+
+    inherit_cache = True
+    type = Boolean()
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("query", InternalTraversal.dp_clauseelement),
+        ("terms", InternalTraversal.dp_clauseelement_tuple),
+    ]
+
+    def __init__(self, column, query: str):
+        self.column = column
+        self.query = literal(query, String)
+        self.terms = tuple(Contains(column, term) for term in query.split())
+
+
+@compiles(Contains)
+def compile_contains(element: Contains, compiler, **kw):
+    return compiler.process(element.column.like(element.pattern, LIKE_ESCAPE), **kw)
+
+
+@compiles(Contains, "postgresql")
+def compile_contains_postgresql(element: Contains, compiler, **kw):
+    return compiler.process(element.column.ilike(element.pattern, LIKE_ESCAPE), **kw)
+
+
+@compiles(FullTextMatch)
+def compile_full_text_match(element: FullTextMatch, compiler, **kw):
+    if not element.terms:
+        return compiler.process(false(), **kw)
+
+    terms = " AND ".join(compiler.process(term, **kw) for term in element.terms)
+    return f"({terms})"
+
+
+@compiles(FullTextMatch, "postgresql")
+def compile_full_text_match_postgresql(element: FullTextMatch, compiler, **kw):
+    # A configuração é escrita como literal (e não como parâmetro) para que a expressão
+    # seja idêntica à do índice e o planejador possa utilizá-lo
+    return "to_tsvector('%s', %s) @@ websearch_to_tsquery('%s', %s)" % (
+        FULL_TEXT_CONFIG,
+        compiler.process(element.column, **kw),
+        FULL_TEXT_CONFIG,
+        compiler.process(element.query, **kw),
+    )
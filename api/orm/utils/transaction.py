@@ -0,0 +1,53 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, Optional, TypeVar
+from decouple import config
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.metrics import metrics
+
+T = TypeVar("T")
+
+TRANSACTION_MAX_ATTEMPTS: int = config("TRANSACTION_MAX_ATTEMPTS", default=3, cast=int)
+TRANSACTION_RETRY_BACKOFF: float = config(
+    "TRANSACTION_RETRY_BACKOFF", default=0.05, cast=float
+)
+
+SERIALIZATION_FAILURE = "40001"
+DEADLOCK_DETECTED = "40P01"
+RETRYABLE_SQLSTATES = {SERIALIZATION_FAILURE, DEADLOCK_DETECTED}
+
+
+def get_sqlstate(error: DBAPIError) -> Optional[str]:
+    """SQLSTATE do erro do driver (`pgcode` no psycopg2, `sqlstate` no asyncpg)"""
+    original = error.orig
+    return getattr(original, "pgcode", None) or getattr(original, "sqlstate", None)
+
+
+async def run_in_transaction(
+    session: AsyncSession,
+    operation: Callable[[], Awaitable[T]],
+    name: str,
+    max_attempts: int = TRANSACTION_MAX_ATTEMPTS,
+) -> T:
+    """
+    Executa a operação (que deve abrir e concluir sua própria transação) e a repete
+    quando interrompida por deadlock ou falha de serialização, com espera exponencial
+    aleatória entre as tentativas. Cada nova tentativa é contabilizada em `transaction_retries`.
+    """
+    attempt = 1
+    while True:
+        try:
+            return await operation()
+
+        except DBAPIError as error:
+            sqlstate = get_sqlstate(error)
+            if sqlstate not in RETRYABLE_SQLSTATES or attempt >= max_attempts:
+                raise
+
+            await session.rollback()
+            metrics.increment("transaction_retries", operation=name, sqlstate=sqlstate)
+
+            backoff = TRANSACTION_RETRY_BACKOFF * 2 ** (attempt - 1)
+            await asyncio.sleep(random.uniform(0, backoff))
+            attempt += 1
@@ -1,26 +1,32 @@
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
-from models.client import Client
+from sqlalchemy import select
+from core.security.principal import Principal
 from dependencies.get_session_db import SessionDep
 from models.order import Order
-from orm.utils.get_object_or_404 import get_object_or_404
 from dependencies.get_user_authenticated import get_user_authenticated
-from models.user import User
 
 
 async def check_owner_order_permission(
     id: UUID,
     session: SessionDep,
-    current_user: User = Depends(get_user_authenticated),
-) -> Client:
+    current_user: Principal = Depends(get_user_authenticated),
+) -> int:
+    """Compara apenas o cliente do pedido; o pedido em si é carregado pelo serviço"""
     error = HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
     )
-    if current_user.client:
-        order = get_object_or_404(session, Order, id)
-        if order.client_id != current_user.client.id:
-            raise error
+    if current_user.client_id is None:
+        raise error
 
-        return current_user.client
+    # `first()` distingue o pedido inexistente do pedido sem cliente (cliente excluído)
+    order = (
+        await session.execute(select(Order.client_id).where(Order.id == id))
+    ).first()
+    if order is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Pedido não encontrado")
 
-    raise error
+    if order.client_id != current_user.client_id:
+        raise error
+
+    return current_user.client_id
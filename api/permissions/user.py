@@ -1,12 +1,12 @@
 from fastapi import Depends, HTTPException, status
+from core.security.principal import Principal
 from dependencies.get_user_authenticated import get_user_authenticated
-from models.user import User
 
 
 async def check_ower_user_permission(
-    id: int, current_user: User = Depends(get_user_authenticated)
+    id: int, current_user: Principal = Depends(get_user_authenticated)
 ):
-    if current_user.id != id:
+    if current_user.user_id != id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
         )
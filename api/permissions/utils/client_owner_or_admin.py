@@ -1,18 +1,18 @@
-from typing import Annotated, Any, Awaitable, Callable
-from fastapi import Depends, HTTPException, status
-from permissions.administrator import is_administrator
-from permissions.client import is_client
-from core.security.auth import oauth2_scheme
+from typing import Any, Awaitable, Callable
+from fastapi import HTTPException, status
+from dependencies.get_auth_context import AuthContextDep
+from schemas.auth import TokenStorage
+from schemas.role import Role
 
 
 async def client_owner_or_admin(
-    token: str, owner_check_func: Callable[..., Awaitable[Any]]
+    auth: TokenStorage, owner_check_func: Callable[..., Awaitable[Any]]
 ) -> bool:
-    if await is_administrator(token):
+    if Role.ADMINISTRATOR in auth.roles:
         return True
 
-    if await is_client(token):
-        return await owner_check_func(token)
+    if Role.CLIENT in auth.roles:
+        return await owner_check_func(auth)
 
     raise HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
@@ -20,9 +20,7 @@ async def client_owner_or_admin(
 
 
 def owner_permission_or_admin(owner_check_func: Callable[..., Awaitable[Any]]):
-    async def dependency_wrapper(token: Annotated[str, Depends(oauth2_scheme)]):
-        return await client_owner_or_admin(
-            token=token, owner_check_func=owner_check_func
-        )
+    async def dependency_wrapper(auth: AuthContextDep):
+        return await client_owner_or_admin(auth=auth, owner_check_func=owner_check_func)
 
     return dependency_wrapper
@@ -5,6 +5,7 @@ from routers.product import router as product_router
 from routers.category import router as category_router
 from routers.order import router as order_router
 from routers.openapi import router as openapi_router
+from routers.metrics import router as metrics_router
 
 all_routers = [
     administrator_router,
@@ -13,5 +14,6 @@ all_routers = [
     client_router,
     product_router,
     order_router,
+    metrics_router,
     openapi_router,
 ]
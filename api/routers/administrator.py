@@ -2,7 +2,7 @@ from fastapi import APIRouter, Body, Depends
 from services.administrator import AdministratorService
 from dependencies.get_session_db import SessionDep
 from filters.administrator import AdministratorFilter
-from models.user import User
+from core.security.principal import Principal
 from permissions.administrator import is_administrator
 from permissions.user import check_ower_user_permission
 from schemas.administrator import AdministratorCreate, AdministratorRead
@@ -32,6 +32,8 @@ router = APIRouter(
     ### 🔎 Parâmetros de Filtro Disponíveis
     - limit      (int): Indica a quantidade de administradores que deseja visualizar
     - offset     (int): Indica a partir de qual administrador da lista deseja visualizar
+    - count      (str): Modo de contagem do total de registros: exact (padrão), estimated ou none
+    - cursor     (str): Cursor da próxima página (next_cursor); quando informado, o offset é ignorado
     - user__name (str): Filtra administradores por correspondência parcial do nome
     """,
     responses={
@@ -54,7 +56,9 @@ async def list(
 ) -> ResponsePagination[AdministratorRead]:
 
     service = AdministratorService(session)
-    data, metadata = service.list_administrators(pagination=pagination, filters=filters)
+    data, metadata = await service.list_administrators(
+        pagination=pagination, filters=filters
+    )
     return ResponsePagination(data=data, metadata=metadata)
 
 
@@ -99,10 +103,10 @@ async def list(
 )
 async def create(
     session: SessionDep,
-    current_user: User = Depends(get_user_authenticated),
+    current_user: Principal = Depends(get_user_authenticated),
     administrator: AdministratorCreate = Body(),
 ):
     await check_ower_user_permission(administrator.user_id, current_user)
 
     service = AdministratorService(session)
-    return service.create_administrator(administrator)
+    return await service.create_administrator(administrator)
@@ -1,7 +1,12 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
 from services.user import UserService
 from dependencies.get_session_db import SessionDep
+from core.server_timing import ServerTiming
+from core.security.principal import Principal
+from dependencies.admission import admit_login, admit_registration
+from dependencies.get_auth_context import AuthContextDep
+from dependencies.get_user_authenticated import get_user_authenticated
 from schemas.auth import (
     LoginOut,
     TokenDataToSubmitToStorage,
@@ -18,6 +23,7 @@ from services.auth import (
     create_refresh_token,
     verify_token,
 )
+from services.revocation import RevocationService
 
 router = APIRouter(
     prefix="/auth",
@@ -28,6 +34,7 @@ router = APIRouter(
 @router.post(
     "/register/",
     status_code=201,
+    dependencies=[Depends(admit_registration)],
     summary="Cadastra um novo usuário no sistema",
     description="""
     ## 📝 Registro de usuários
@@ -38,6 +45,7 @@ router = APIRouter(
     
     ### 📑 Regras de negócio
     - Os campos de "name" e "email" devem ser únicos. Um erro será disparado se existir alguma conta com alguma dessas informações.
+    - O número de cadastros por IP é limitado; ao exceder o limite é retornado o erro 429, com o cabeçalho 'Retry-After' indicando quantos segundos aguardar.
     
     ### ⬇️ Campos do formulário
     - 'name'     (OBRIGATÓRIO): Nome do usuário com no máximo de 255 caracteres
@@ -65,15 +73,26 @@ router = APIRouter(
                 }
             },
         },
+        429: {
+            "description": "Muitas tentativas em pouco tempo (ver cabeçalho Retry-After)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Muitas tentativas, tente novamente em instantes"
+                    }
+                },
+            },
+        },
     },
 )
 async def create(session: SessionDep, user: UserCreate) -> UserRead:
     service = UserService(session)
-    return service.create_user(user)
+    return await service.create_user(user)
 
 
 @router.post(
     "/login/",
+    dependencies=[Depends(admit_login)],
     summary="Realiza a autenticação de um usuário no sistema",
     description="""
     ## 📝 Login de usuários
@@ -84,6 +103,7 @@ async def create(session: SessionDep, user: UserCreate) -> UserRead:
     
     ### 📑 Regras de negócio
     - Caso você tenha sido vinculado a um perfil de cliente ou administrador na sessão atual, é necessário realizar um novo login para que as permissões de "cliente" e/ou "administrador" entrem em vigor.    
+    - O número de tentativas por IP e por nome de usuário é limitado; ao exceder o limite é retornado o erro 429, com o cabeçalho 'Retry-After' indicando quantos segundos aguardar.
     
     ### ⬇️ Campos do formulário
     - grant_type     (OBRIGATÓRIO): Deve ter um valor igual a 'password' 
@@ -99,6 +119,7 @@ async def create(session: SessionDep, user: UserCreate) -> UserRead:
     - São retornados dois tokens:
        - 'access_token':  Token utilizado nas requisições para ter acesso a aplicação, com expiração de **5 minutos**.
        - 'refresh_token': Token de atualização com expiração de **1 dia**, a ser utilizado para obter novos tokens de acesso durante esse período.
+    - O cabeçalho 'Server-Timing' informa a duração (ms) da consulta ao banco (db), da verificação da senha (hash) e da geração dos tokens (jwt).
     """,
     responses={
         401: {
@@ -107,22 +128,38 @@ async def create(session: SessionDep, user: UserCreate) -> UserRead:
                 "application/json": {"example": {"detail": "Credenciais inválidas"}},
             },
         },
+        429: {
+            "description": "Muitas tentativas em pouco tempo (ver cabeçalho Retry-After)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Muitas tentativas, tente novamente em instantes"
+                    }
+                },
+            },
+        },
     },
 )
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     session: SessionDep,
+    response: Response,
 ) -> LoginOut:
-    user = authenticate_user(session, form_data.username, form_data.password)
+    timing = ServerTiming()
+    user = await authenticate_user(
+        session, form_data.username, form_data.password, timing
+    )
     data_token = TokenDataToSubmitToStorage(
         sub=user.name,
         user_id=user.id,
-        roles=get_roles_from_user(user),
+        roles=get_roles_from_user(user.is_client, user.is_administrator),
     )
 
-    access_token = await create_access_token(data_token)
-    refresh_token = await create_refresh_token(data_token)
+    with timing.measure("jwt"):
+        access_token = await create_access_token(data_token)
+        refresh_token = await create_refresh_token(data_token)
 
+    response.headers["Server-Timing"] = timing.header()
     return LoginOut(access_token=access_token, refresh_token=refresh_token)
 
 
@@ -143,7 +180,8 @@ async def login(
     - refresh (OBRIGATÓRIO): Token de atualização válido
     
     ### 🔙 Retorno
-    - É retornado um novo token de acesso, denominado 'access_token':
+    - É retornado um novo token de acesso ('access') e um novo token de atualização ('refresh').
+    - O token de atualização informado é revogado e não pode ser utilizado novamente.
     """,
     responses={
         401: {
@@ -159,6 +197,10 @@ async def login(
                             "summary": "O token de atualização está inválido",
                             "value": {"detail": "Token inválido"},
                         },
+                        "token_revogado": {
+                            "summary": "O token de atualização foi revogado ou já utilizado",
+                            "value": {"detail": "Token revogado"},
+                        },
                     }
                 }
             },
@@ -167,9 +209,14 @@ async def login(
 )
 async def refresh_access_token(
     refresh: TokenRefreshIn,
+    session: SessionDep,
 ) -> TokenRefreshOut:
     user_data = await verify_token(refresh.refresh, TokenType.REFRESH)
 
+    service = RevocationService(session)
+    await service.ensure_not_revoked(user_data)
+    await service.revoke_tokens(user_data)
+
     data_token = TokenDataToSubmitToStorage(
         sub=user_data.sub,
         user_id=user_data.user_id,
@@ -177,5 +224,83 @@ async def refresh_access_token(
     )
 
     new_access_token = await create_access_token(data_token)
+    new_refresh_token = await create_refresh_token(data_token)
+
+    return TokenRefreshOut(access=new_access_token, refresh=new_refresh_token)
+
+
+@router.post(
+    "/logout/",
+    status_code=204,
+    summary="Encerra a sessão do usuário",
+    description="""
+    ## 📝 Logout
+    Endpoint para encerrar a sessão atual, revogando o token de acesso utilizado na requisição e o token de atualização informado.
+    
+    ### 🔐 Permissões
+    - Qualquer usuário **autenticado**, informando um token de atualização emitido para ele mesmo.
+    
+    ### ⬇️ Campos do formulário
+    - refresh (OBRIGATÓRIO): Token de atualização da sessão
+    """,
+    responses={
+        401: {
+            "description": "Token inválido, expirado ou revogado",
+            "content": {
+                "application/json": {"example": {"detail": "Token revogado"}},
+            },
+        },
+        403: {
+            "description": "Token de atualização de outro usuário",
+            "content": {"application/json": {"example": {"detail": "Forbidden"}}},
+        },
+    },
+)
+async def logout(
+    refresh: TokenRefreshIn,
+    auth: AuthContextDep,
+    session: SessionDep,
+):
+    refresh_data = await verify_token(refresh.refresh, TokenType.REFRESH)
+    if refresh_data.user_id != auth.user_id:
+        raise HTTPException(status.HTTP_403_FORBIDDEN)
+
+    await RevocationService(session).revoke_tokens(auth, refresh_data)
+
+
+@router.post(
+    "/revoke-all/{user_id}/",
+    status_code=204,
+    summary="Revoga todas as sessões de um usuário",
+    description="""
+    ## 📝 Revogação de todas as sessões
+    Endpoint para revogar todos os tokens (de acesso e de atualização) emitidos até o momento para um usuário, encerrando todas as suas sessões.
+    
+    ### 🔐 Permissões
+    - O próprio usuário **autenticado** ou um administrador.
+    
+    ### 💬 Observações:
+    - Após a revogação é necessário realizar um novo login (via POST /auth/login/).
+    """,
+    responses={
+        401: {
+            "description": "Não autenticado",
+            "content": {
+                "application/json": {"example": {"detail": "Not authenticated"}},
+            },
+        },
+        403: {
+            "description": "Acesso negado ao revogar as sessões de outro usuário",
+            "content": {"application/json": {"example": {"detail": "Forbidden"}}},
+        },
+    },
+)
+async def revoke_all(
+    session: SessionDep,
+    user_id: int = Path(description="Identificador do usuário"),
+    current_user: Principal = Depends(get_user_authenticated),
+):
+    if current_user.user_id != user_id and not current_user.is_administrator:
+        raise HTTPException(status.HTTP_403_FORBIDDEN)
 
-    return TokenRefreshOut(access=new_access_token)
+    await RevocationService(session).revoke_user_tokens(user_id)
@@ -28,6 +28,8 @@ router = APIRouter(
     ### 🔎 Parâmetros de Filtro Disponíveis
     - limit       (int): Indica a quantidade de categorias que deseja visualizar
     - offset      (int): Indica a partir de qual categoria da lista deseja visualizar
+    - count       (str): Modo de contagem do total de registros: exact (padrão), estimated ou none
+    - cursor      (str): Cursor da próxima página (next_cursor); quando informado, o offset é ignorado
     - name        (str): Filtra categorias por correspondência parcial do nome
     - description (str): Filtra categorias por correspondência parcial da descrição
     """,
@@ -39,7 +41,9 @@ async def list(
 ) -> ResponsePagination[CategoryRead]:
 
     service = CategoryService(session)
-    data, metadata = service.list_categories(pagination=pagination, filters=filters)
+    data, metadata = await service.list_categories(
+        pagination=pagination, filters=filters
+    )
     return ResponsePagination(data=data, metadata=metadata)
 
 
@@ -74,4 +78,4 @@ async def create(
     session: SessionDep,
 ) -> CategoryRead:
     service = CategoryService(session)
-    return service.create_category(category=category)
+    return await service.create_category(category=category)
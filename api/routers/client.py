@@ -1,3 +1,4 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Path, Response, status
 from permissions.user import check_ower_user_permission
 from permissions.client import check_owner_client_permission
@@ -5,8 +6,7 @@ from services.client import ClientService
 from dependencies.get_user_authenticated import get_user_authenticated
 from dependencies.get_session_db import SessionDep
 from filters.client import ClientFilter
-from models.client import Client
-from models.user import User
+from core.security.principal import Principal
 from permissions.administrator import is_administrator
 from schemas.client import ClientCreate, ClientRead, ClientUpdate
 from schemas.utils.pagination import PaginationSchema
@@ -34,6 +34,8 @@ router = APIRouter(
     ### 🔎 Parâmetros de Filtro Disponíveis
     - limit       (int): Indica a quantidade de clientes que deseja visualizar
     - offset      (int): Indica a partir de qual cliente da lista deseja visualizar
+    - count       (str): Modo de contagem do total de registros: exact (padrão), estimated ou none
+    - cursor      (str): Cursor da próxima página (next_cursor); quando informado, o offset é ignorado
     - user__name  (str): Filtra clientes por correspondência parcial do nome de usuário
     - user__email (str): Filtra clientes por correspondência parcial do e-mail
     - cpf         (str): Filtra clientes por correspondência parcial do CPF
@@ -52,7 +54,9 @@ async def list(
 ) -> ResponsePagination[ClientRead]:
 
     service = ClientService(session)
-    data, metadata = service.list_clients(pagination=pagination, filters=filters)
+    data, metadata = await service.list_clients(
+        pagination=pagination, filters=filters
+    )
     return ResponsePagination(data=data, metadata=metadata)
 
 
@@ -85,7 +89,7 @@ async def list(
 async def read(
     session: SessionDep,
     id: int = Path(description="Identificador do cliente"),
-    _: Client = Depends(check_owner_client_permission),
+    _: Optional[int] = Depends(check_owner_client_permission),
 ) -> ResponseUnit[ClientRead]:
 
     service = ClientService(session)
@@ -154,11 +158,11 @@ async def read(
 async def create(
     client: ClientCreate,
     session: SessionDep,
-    current_user: User = Depends(get_user_authenticated),
+    current_user: Principal = Depends(get_user_authenticated),
 ) -> ClientRead:
     await check_ower_user_permission(client.user_id, current_user)
     service = ClientService(session)
-    return service.create_client(client)
+    return await service.create_client(client)
 
 
 @router.put(
@@ -211,10 +215,10 @@ async def update(
     client: ClientUpdate,
     session: SessionDep,
     id: int = Path(description="Identificador do cliente"),
-    _: Client = Depends(check_owner_client_permission),
+    _: Optional[int] = Depends(check_owner_client_permission),
 ) -> ClientRead:
     service = ClientService(session)
-    data = service.update_client(client, id)
+    data = await service.update_client(client, id)
     return data
 
 
@@ -236,7 +240,7 @@ async def update(
 async def delete(
     session: SessionDep,
     id: int = Path(description="Identificador do cliente"),
-    _: Client = Depends(check_owner_client_permission),
+    _: Optional[int] = Depends(check_owner_client_permission),
 ):
     service = ClientService(session)
     await service.delete_client(id)
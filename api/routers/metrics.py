@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends
+from core.metrics import metrics
+from dependencies.get_user_authenticated import get_user_authenticated
+from permissions.administrator import is_administrator
+from schemas.metrics import MetricsRead
+from schemas.utils.responses import ResponseUnit
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(get_user_authenticated), Depends(is_administrator)],
+)
+
+
+@router.get(
+    "/",
+    summary="Visualiza as métricas internas da API",
+    description="""
+    ## 📈 Métricas da API
+    Endpoint para consulta das métricas internas do processo da API, como as novas tentativas
+    automáticas de transações interrompidas por deadlock ou falha de serialização e a fila
+    de processamento de senhas.
+    
+    ### 🔐 Permissões Necessárias
+    - Exclusivo para usuários com perfil de administrador **autenticados**
+
+    ### 🔙 Retorno
+    - As métricas são agrupadas por nome e pelos seus rótulos, e reiniciam junto com o processo.
+    """,
+    responses={
+        401: {
+            "description": "Não autenticado",
+            "content": {
+                "application/json": {"example": {"detail": "Not authenticated"}}
+            },
+        },
+        403: {
+            "description": "Acesso negado por ser cliente",
+            "content": {"application/json": {"example": {"detail": "Forbidden"}}},
+        },
+    },
+)
+async def read() -> ResponseUnit[MetricsRead]:
+    return ResponseUnit(data=MetricsRead(**metrics.snapshot()))
@@ -1,18 +1,17 @@
 from fastapi import APIRouter, Depends, Path
 from uuid import UUID
-from models.client import Client
 from permissions.order import check_owner_order_permission
 from filters.order import OrderFilter
 from permissions.administrator import is_administrator
-from schemas.order_product import OrderProductRead
+from schemas.order_product import OrderBulkRead, OrderProductRead
 from permissions.client import is_client
 from schemas.utils.pagination import PaginationSchema
 from schemas.utils.responses import ResponsePagination, ResponseUnit
 from services.order import OrderService
-from schemas.order import OrderCreate, OrderRead, OrderUpdate
+from schemas.order import OrderBulkCreate, OrderCreate, OrderRead, OrderUpdate
 from dependencies.get_user_authenticated import get_user_authenticated
 from dependencies.get_session_db import SessionDep
-from models.user import User
+from core.security.principal import Principal
 
 
 router = APIRouter(
@@ -36,6 +35,8 @@ router = APIRouter(
     ### 🔎 Parâmetros de Filtro Disponíveis
     - limit       (int): Indica a quantidade de pedidos que deseja visualizar
     - offset      (int): Indica a partir de qual pedido da lista deseja visualizar
+    - count       (str): Modo de contagem do total de registros: exact (padrão), estimated ou none
+    - cursor      (str): Cursor da próxima página (next_cursor); quando informado, o offset é ignorado
     - date__lte   (date): Pedidos iguais ou anteriores a uma data
     - date__gte   (date): Pedidos iguais ou posteriores a uma data
     - category_id (int):  Pedidos que possuem produtos da categoria informada
@@ -72,7 +73,7 @@ async def list(
 async def read(
     session: SessionDep,
     id: UUID = Path(description="Identificador do pedido"),
-    _: Client = Depends(check_owner_order_permission),
+    _: int = Depends(check_owner_order_permission),
 ) -> ResponseUnit[OrderProductRead]:
     service = OrderService(session)
     order = await service.read_order(id)
@@ -129,13 +130,77 @@ async def read(
 async def create(
     order: OrderCreate,
     session: SessionDep,
-    current_user: User = Depends(get_user_authenticated),
+    current_user: Principal = Depends(get_user_authenticated),
 ) -> OrderProductRead:
 
     service = OrderService(session)
     return await service.create_order(order=order, user=current_user)
 
 
+@router.post(
+    "/bulk/",
+    status_code=201,
+    summary="Cadastra vários pedidos de uma só vez",
+    description="""
+    ## 📝 Cadastra pedidos em lote
+    Endpoint para integrações que precisam cadastrar muitos pedidos, em uma única requisição e transação.
+    
+    ### 🔐 Permissões Necessárias
+    - **Clientes** podem cadastrar pedidos para si próprios.
+    - **Administradores** podem cadastrar pedidos em nome de qualquer cliente, informando o `client_id`.
+
+    ### ⬇️ Campos do formulário
+    - orders           (OBRIGATÓRIO): Lista de pedidos (máximo de 500)
+        - client_id    (OPCIONAL): Cliente do pedido (obrigatório para administradores)
+        - products     (OBRIGATÓRIO): Lista de produtos
+            - id       (OBRIGATÓRIO): Identificador do produto
+            - quantity (OBRIGATÓRIO): Quantidade desejada do produto
+    - atomic           (OPCIONAL): Padrão verdadeiro. Se algum pedido falhar, nenhum é cadastrado
+    
+    ### 📑 Regras de negócio
+        - O estoque é validado considerando todos os pedidos do lote, na ordem enviada.
+        - No modo não atômico, os pedidos válidos são cadastrados e as falhas são retornadas em `errors`.
+    
+    ### 🔙 Retorno
+    - São retornados os pedidos cadastrados, com seus produtos, e os pedidos que falharam com o motivo.
+    """,
+    responses={
+        404: {
+            "description": "Produto(s) ou cliente não encontrado(s) (modo atômico)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Pedido 0: Alguns produtos não foram encontrados: x, y, z"
+                    }
+                }
+            },
+        },
+        400: {
+            "description": "Estoque insuficiente de produto (modo atômico)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Pedido 3: O produto {X} possui {Y} unidades em estoque"
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Cliente tentando cadastrar pedido para outro cliente",
+            "content": {"application/json": {"example": {"detail": "Forbidden"}}},
+        },
+    },
+)
+async def create_bulk(
+    bulk: OrderBulkCreate,
+    session: SessionDep,
+    current_user: Principal = Depends(get_user_authenticated),
+) -> OrderBulkRead:
+
+    service = OrderService(session)
+    return await service.create_orders_bulk(bulk=bulk, user=current_user)
+
+
 @router.put(
     "/{id}/",
     dependencies=[Depends(is_administrator)],
@@ -28,11 +28,14 @@ router = APIRouter(
     ### 🔎 Parâmetros de Filtro Disponíveis
     - limit       (int): Indica a quantidade de produtos que deseja visualizar
     - offset      (int): Indica a partir de qual produto da lista deseja visualizar
+    - count       (str): Modo de contagem do total de registros: exact (padrão), estimated ou none
+    - cursor      (str): Cursor da próxima página (next_cursor); quando informado, o offset é ignorado
+    - description (str): Busca produtos pelas palavras da descrição
     - category_id (int): Filtra produtos de uma categoria específica
     - value__lte  (str): Valor do produto é menor ou igual ao valor informado
     - value__gte  (str): Valor do produto é maior ou igual ao valor informado
-    - stock__lte  (str): Estoque é menor ou igual ao estoque informado
-    - stock__gte  (str): Estoque é maior ou igual ao estoque informado
+    - stock__lte  (int): Estoque é menor ou igual ao estoque informado
+    - stock__gte  (int): Estoque é maior ou igual ao estoque informado
     """,
 )
 async def list(
@@ -42,7 +45,9 @@ async def list(
 ) -> ResponsePagination[ProductRead]:
 
     service = ProductService(session)
-    data, metadata = service.list_products(pagination=pagination, filters=filters)
+    data, metadata = await service.list_products(
+        pagination=pagination, filters=filters
+    )
     return ResponsePagination(data=data, metadata=metadata)
 
 
@@ -118,7 +123,7 @@ async def create(
     session: SessionDep,
 ) -> ProductRead:
     service = ProductService(session)
-    return service.create_product(product=product)
+    return await service.create_product(product=product)
 
 
 @router.put(
@@ -162,7 +167,7 @@ async def update(
     id: int = Path(description="Identificador do produto"),
 ) -> ProductRead:
     service = ProductService(session)
-    data = service.update_product(id, product)
+    data = await service.update_product(id, product)
     return data
 
 
@@ -0,0 +1,34 @@
+from typing import Dict
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class MetricsRead(BaseModel):
+    counters: Dict[str, Dict[str, float]] = Field(
+        description="Contadores por nome, agrupados pelos rótulos (ex.: `operation=create_order`)"
+    )
+    gauges: Dict[str, Dict[str, float]] = Field(
+        description="Valores instantâneos por nome (ex.: tamanho atual de uma fila)",
+        default={},
+    )
+    summaries: Dict[str, Dict[str, Dict[str, float]]] = Field(
+        description="Resumo das observações por nome: quantidade (`count`), soma (`sum`) e máximo (`max`)",
+        default={},
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "counters": {
+                    "transaction_retries": {
+                        "operation=create_order,sqlstate=40P01": 3,
+                    }
+                },
+                "gauges": {"password_queue_depth": {"": 0}},
+                "summaries": {
+                    "password_wait_seconds": {
+                        "operation=verify": {"count": 120, "sum": 0.84, "max": 0.05}
+                    }
+                },
+            }
+        },
+    )
@@ -47,5 +47,22 @@ class OrderCreate(BaseModel):
     )
 
 
+class OrderBulkItem(OrderCreate):
+    client_id: Optional[int] = Field(
+        description="Cliente do pedido (obrigatório para administradores; clientes só podem informar o próprio)",
+        default=None,
+    )
+
+
+class OrderBulkCreate(BaseModel):
+    orders: List[OrderBulkItem] = Field(
+        description="Lista de pedidos a cadastrar", min_length=1, max_length=500
+    )
+    atomic: bool = Field(
+        description="Quando verdadeiro, nenhum pedido é cadastrado se algum falhar; caso contrário, os pedidos válidos são cadastrados e as falhas informadas",
+        default=True,
+    )
+
+
 class OrderUpdate(BaseModel):
     status: OrderStatus = Field(description="Status do pedido")
@@ -65,3 +65,16 @@ class OrderProductRead(BaseModel):
             }
         },
     )
+
+
+class OrderBulkError(BaseModel):
+    index: int = Field(description="Posição do pedido na lista enviada")
+    status_code: int = Field(description="Código HTTP equivalente da falha")
+    detail: str = Field(description="Motivo da falha")
+
+
+class OrderBulkRead(BaseModel):
+    created: List[OrderProductRead] = Field(description="Pedidos cadastrados")
+    errors: List[OrderBulkError] = Field(
+        description="Pedidos não cadastrados (somente no modo não atômico)"
+    )
@@ -1,14 +1,13 @@
 from typing import List
-from models.user import User
 from schemas.role import Role
 
 
-def get_roles_from_user(user: User):
+def get_roles_from_user(is_client: bool, is_administrator: bool) -> List[Role]:
     roles: List[Role] = []
-    if user.client:
+    if is_client:
         roles.append(Role.CLIENT)
 
-    if user.administrator:
+    if is_administrator:
         roles.append(Role.ADMINISTRATOR)
 
     return roles
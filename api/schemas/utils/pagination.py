@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Optional
 from fastapi import Query
 from pydantic import BaseModel, Field
 
@@ -13,6 +14,12 @@ class LimitPagination(int, Enum):
     CEM = 100
 
 
+class CountMode(str, Enum):
+    NONE = "none"
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+
+
 class PaginationSchema:
     def __init__(
         self,
@@ -20,12 +27,33 @@ class PaginationSchema:
             default=10, description="Quantidade de registros desejados"
         ),
         offset: int = Query(default=0, description="Intervalo inicial da paginação"),
+        count: CountMode = Query(
+            default=CountMode.EXACT,
+            description="""
+    Define como a quantidade total de registros é calculada.
+    ### Características:
+        - `exact`: contagem exata dos registros que atendem aos filtros
+        - `estimated`: estimativa do planejador do PostgreSQL (exata em outros bancos)
+        - `none`: não realiza a contagem (`count` retorna nulo)
+    """,
+        ),
+        cursor: Optional[str] = Query(
+            default=None,
+            description="Cursor opaco (`next_cursor` da página anterior). Quando informado, `offset` é ignorado",
+        ),
     ):
         self.limit = limit
         self.offset = offset
+        self.count = count
+        self.cursor = cursor
 
 
 class MetadataPagination(BaseModel):
-    count: int = Field(
-        description="Quantidade de registros da tabela em questão existentes no banco"
+    count: Optional[int] = Field(
+        description="Quantidade de registros existentes no banco que atendem aos filtros informados",
+        default=None,
+    )
+    next_cursor: Optional[str] = Field(
+        description="Cursor para obter a próxima página (nulo quando não há mais registros)",
+        default=None,
     )
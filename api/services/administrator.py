@@ -1,40 +1,54 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from filters.administrator import AdministratorFilter
 from models.administrator import Administrator
 from models.user import User
-from schemas.administrator import AdministratorCreate
+from core.security.principal import invalidate_principal
+from schemas.administrator import AdministratorCreate, AdministratorRead
 from orm.utils.filter_collection import filter_collection
+from orm.utils.filter_plan import FilterPlan
 from orm.utils.get_object_or_404 import get_object_or_404
+from orm.utils.loader_options import loader_options
 from schemas.utils.pagination import PaginationSchema
-from sqlalchemy.exc import SQLAlchemyError
+from orm.utils.integrity import integrity_error_to_http
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 
 class AdministratorService:
-    def __init__(self, session: Session):
+    FILTER_PLAN = FilterPlan(Administrator, AdministratorFilter)
+
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def list_administrators(
+    async def list_administrators(
         self, pagination: PaginationSchema, filters: AdministratorFilter
     ):
-        data, metadata = filter_collection(
+        data, metadata = await filter_collection(
             self.session,
-            model=Administrator,
+            plan=AdministratorService.FILTER_PLAN,
             pagination=pagination,
             filters=filters,
+            options=loader_options(AdministratorRead),
         )
         return data, metadata
 
-    def create_administrator(self, administrator: AdministratorCreate) -> Administrator:
-        get_object_or_404(
+    async def create_administrator(
+        self, administrator: AdministratorCreate
+    ) -> Administrator:
+        await get_object_or_404(
             self.session, User, administrator.user_id, detail="Usuário não encontrado"
         )
         db_administrator = Administrator(**administrator.model_dump())
 
         try:
             self.session.add(db_administrator)
-            self.session.commit()
+            await self.session.commit()
+            invalidate_principal(db_administrator.user_id)
+            await self.session.refresh(db_administrator, ["user"])
             return db_administrator
 
+        except IntegrityError as error:
+            raise integrity_error_to_http(error)
+
         except SQLAlchemyError:
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,42 +1,119 @@
 import jwt
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.administrator import Administrator
+from models.client import Client
 from models.user import User
 from decouple import config
 from jwt.exceptions import InvalidTokenError, ExpiredSignatureError
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from uuid import uuid4
 from schemas.auth import TokenDataToSubmitToStorage, TokenStorage, TokenType
 from core.security.auth import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     ALGORITHM,
     REFRESH_TOKEN_EXPIRE_DAYS,
 )
+from core.metrics import metrics
+from core.security.password import BCRYPT_ROUNDS, password_pool
+from core.server_timing import ServerTiming
 
 SECRET_KEY = config("SECRET_KEY")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes com custo diferente do configurado são refeitos no próximo login bem-sucedido
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
+
+
+class UserCredentials(NamedTuple):
+    """Dados do usuário necessários ao login, incluindo os papéis que possui"""
+
+    id: int
+    name: str
+    password: str
+    is_client: bool
+    is_administrator: bool
+
+
+async def get_user_credentials(
+    session: AsyncSession, credential: str
+) -> Optional[UserCredentials]:
+    """Carrega o usuário, o hash da senha e seus papéis em uma única consulta"""
+    stmt = (
+        select(
+            User.id,
+            User.name,
+            User.password,
+            Client.id.is_not(None),
+            Administrator.id.is_not(None),
+        )
+        .outerjoin(Client, Client.user_id == User.id)
+        .outerjoin(Administrator, Administrator.user_id == User.id)
+        .where(User.name == credential)
+    )
+    row = (await session.execute(stmt)).first()
+    if row is None:
+        return None
+
+    user_id, name, password, is_client, is_administrator = row
+    return UserCredentials(
+        user_id, name, password, bool(is_client), bool(is_administrator)
+    )
 
 
-def authenticate_user(session: Session, credential: str, password: str):
+async def authenticate_user(
+    session: AsyncSession,
+    credential: str,
+    password: str,
+    timing: Optional[ServerTiming] = None,
+) -> UserCredentials:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Credenciais inválidas",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    timing = timing or ServerTiming()
 
-    user = session.execute(
-        select(User).where(User.name == credential)
-    ).scalar_one_or_none()
+    with timing.measure("db"):
+        user = await get_user_credentials(session, credential)
     if not user:
         raise credentials_exception
-    if not verify_password(password, user.password):
+
+    with timing.measure("hash"):
+        is_valid, new_hash = await check_password_and_update(password, user.password)
+    if not is_valid:
         raise credentials_exception
+
+    if new_hash is not None:
+        with timing.measure("rehash"):
+            await update_password_hash(session, user.id, new_hash)
     return user
 
 
+async def update_password_hash(
+    session: AsyncSession, user_id: int, new_hash: str
+) -> None:
+    """
+    Grava o hash refeito com o custo atual. Uma falha aqui não impede o login:
+    o hash antigo continua válido e a atualização é tentada no próximo login.
+    """
+    try:
+        await session.execute(
+            update(User).where(User.id == user_id).values(password=new_hash)
+        )
+        await session.commit()
+    except SQLAlchemyError:
+        await session.rollback()
+        return
+
+    metrics.increment("password_rehashed")
+
+
 async def verify_token(token: str, expected_token_type: TokenType) -> TokenStorage:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -65,10 +142,12 @@ def build_token_payload(
     expires_delta: timedelta,
     token_type: TokenType,
 ) -> Dict[str, Any]:
-    expire = datetime.now(timezone.utc) + expires_delta
+    now = datetime.now(timezone.utc)
     payload = {
         **data.model_dump(),
-        "exp": expire,
+        "exp": now + expires_delta,
+        "iat": now.timestamp(),
+        "jti": uuid4().hex,
         "token_type": token_type,
     }
     return payload
@@ -98,3 +177,27 @@ def get_password_hash(password):
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
+
+
+async def hash_password(password: str) -> str:
+    """Gera o hash da senha no pool de senhas, sem bloquear o event loop"""
+    return await password_pool.run("hash", get_password_hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifica a senha no pool de senhas, sem bloquear o event loop"""
+    return await password_pool.run(
+        "verify", verify_password, plain_password, hashed_password
+    )
+
+
+async def check_password_and_update(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha no pool de senhas e, se o hash usa um custo diferente de
+    `BCRYPT_ROUNDS`, retorna também o novo hash
+    """
+    return await password_pool.run(
+        "verify", pwd_context.verify_and_update, plain_password, hashed_password
+    )
@@ -1,35 +1,40 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from filters.category import CategoryFilter
 from models.category import Category
 from orm.utils.filter_collection import filter_collection
+from orm.utils.filter_plan import FilterPlan
 from orm.utils.get_object_or_404 import get_object_or_404
 from schemas.category import CategoryCreate
 from schemas.utils.pagination import PaginationSchema
 
 
 class CategoryService:
-    def __init__(self, session: Session):
+    FILTER_PLAN = FilterPlan(Category, CategoryFilter)
+
+    def __init__(self, session: AsyncSession):
         self.session = session
 
     @staticmethod
-    def validate_category_exists(session: Session, category_id: int) -> None:
-        get_object_or_404(
+    async def validate_category_exists(session: AsyncSession, category_id: int) -> None:
+        await get_object_or_404(
             session, Category, category_id, detail="Categoria não encontrada"
         )
 
-    def list_categories(self, pagination: PaginationSchema, filters: CategoryFilter):
-        data, metadata = filter_collection(
+    async def list_categories(
+        self, pagination: PaginationSchema, filters: CategoryFilter
+    ):
+        data, metadata = await filter_collection(
             self.session,
-            model=Category,
+            plan=CategoryService.FILTER_PLAN,
             pagination=pagination,
             filters=filters,
         )
         return data, metadata
 
-    def create_category(self, category: CategoryCreate):
+    async def create_category(self, category: CategoryCreate):
         new_category = Category(**category.model_dump())
         self.session.add(new_category)
-        self.session.commit()
-        self.session.refresh(new_category)
+        await self.session.commit()
+        await self.session.refresh(new_category)
 
         return new_category
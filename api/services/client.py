@@ -1,52 +1,71 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from filters.client import ClientFilter
-from models.client import Client, check_user_client_exists
+from models.client import Client
 from models.user import User
-from schemas.client import ClientCreate, ClientUpdate
+from core.security.principal import invalidate_principal
+from schemas.client import ClientCreate, ClientRead, ClientUpdate
 from orm.utils.filter_collection import filter_collection
+from orm.utils.filter_plan import FilterPlan
 from orm.utils.get_object_or_404 import get_object_or_404
+from orm.utils.loader_options import loader_options
 from schemas.utils.pagination import PaginationSchema
-from sqlalchemy.exc import SQLAlchemyError
+from orm.utils.integrity import integrity_error_to_http
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 
 class ClientService:
-    def __init__(self, session: Session):
+    FILTER_PLAN = FilterPlan(Client, ClientFilter)
+
+    def __init__(self, session: AsyncSession):
         self.session = session
 
     async def read_client(self, client_id: int):
-        client = get_object_or_404(
-            self.session, Client, client_id, detail="Cliente não encontrado"
+        client = await get_object_or_404(
+            self.session,
+            Client,
+            client_id,
+            detail="Cliente não encontrado",
+            options=loader_options(ClientRead),
         )
         return client
 
-    def list_clients(self, pagination: PaginationSchema, filters: ClientFilter):
-        data, metadata = filter_collection(
+    async def list_clients(self, pagination: PaginationSchema, filters: ClientFilter):
+        data, metadata = await filter_collection(
             self.session,
-            model=Client,
+            plan=ClientService.FILTER_PLAN,
             pagination=pagination,
             filters=filters,
+            options=loader_options(ClientRead),
         )
         return data, metadata
 
-    def create_client(self, client: ClientCreate) -> Client:
-        get_object_or_404(
+    async def create_client(self, client: ClientCreate) -> Client:
+        await get_object_or_404(
             self.session, User, client.user_id, detail="Usuário não encontrado"
         )
         db_client = Client(**client.model_dump())
-        check_user_client_exists(self.session, client.user_id)
 
         try:
             self.session.add(db_client)
-            self.session.commit()
+            await self.session.commit()
+            invalidate_principal(db_client.user_id)
+            await self.session.refresh(db_client, ["user"])
             return db_client
 
+        except IntegrityError as error:
+            raise integrity_error_to_http(error)
+
         except SQLAlchemyError:
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    def update_client(self, client: ClientUpdate, id: int) -> Client:
-        db_client = get_object_or_404(
-            self.session, Client, id, detail="Cliente não encontrado"
+    async def update_client(self, client: ClientUpdate, id: int) -> Client:
+        db_client = await get_object_or_404(
+            self.session,
+            Client,
+            id,
+            detail="Cliente não encontrado",
+            options=loader_options(ClientRead),
         )
 
         for key, value in client:
@@ -54,22 +73,26 @@ class ClientService:
                 setattr(db_client, key, value)
 
         try:
-            self.session.commit()
-            self.session.refresh(db_client)
+            await self.session.commit()
+            invalidate_principal(db_client.user_id)
 
             return db_client
 
+        except IntegrityError as error:
+            raise integrity_error_to_http(error)
+
         except SQLAlchemyError:
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     async def delete_client(self, client_id: int):
-        client = get_object_or_404(
+        client = await get_object_or_404(
             self.session, Client, client_id, detail="Cliente não encontrado"
         )
 
         try:
-            self.session.delete(client)
-            self.session.commit()
+            await self.session.delete(client)
+            await self.session.commit()
+            invalidate_principal(client.user_id)
 
         except SQLAlchemyError:
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,54 +1,68 @@
-from decimal import Decimal
-from typing import List, Tuple
-from uuid import UUID
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 from fastapi import HTTPException, status
-from sqlalchemy import Date, cast, desc, select
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.product import Product
 from filters.order import OrderFilter
 from schemas.utils.pagination import MetadataPagination, PaginationSchema
 from orm.utils.count_collection import count_collection
+from orm.utils.filter_plan import FilterPlan, on_or_after_day, on_or_before_day
 from orm.utils.get_object_or_404 import get_object_or_404
+from orm.utils.pagination import SortKey, apply_pagination, build_page
+from orm.utils.transaction import run_in_transaction
+from orm.utils.loader_options import loader_options
 from schemas.product import ProductRead
-from schemas.order_product import OrderProductRead, ProductOfOrder
+from schemas.order_product import (
+    OrderBulkError,
+    OrderBulkRead,
+    OrderProductRead,
+    ProductOfOrder,
+)
 from models.order_product import OrderProduct
 from models.order import Order
+from models.client import Client
+from schemas.client import ClientRead
 from services.product import ProductService
-from models.user import User
-from schemas.order import OrderCreate, OrderRead, OrderStatus, OrderUpdate
+from core.security.principal import Principal
+from schemas.order import (
+    OrderBulkCreate,
+    OrderBulkItem,
+    OrderCreate,
+    OrderRead,
+    OrderStatus,
+    OrderUpdate,
+    ProductOrder,
+)
 from sqlalchemy.exc import SQLAlchemyError
 
 
 class OrderService:
-    def __init__(self, session: Session):
+    FILTER_PLAN = FilterPlan(
+        Order,
+        OrderFilter,
+        overrides={
+            "date__lte": on_or_before_day(Order.date),
+            "date__gte": on_or_after_day(Order.date),
+            "status": lambda value: Order.status == value,
+            "category_id": lambda value: Order.products.any(
+                OrderProduct.product.has(Product.category_id == value)
+            ),
+        },
+    )
+    SORT_KEYS = (
+        SortKey(Order.date, descending=True),
+        SortKey(Order.id, descending=True),
+    )
+
+    def __init__(self, session: AsyncSession):
         self.session = session
 
     @staticmethod
-    def apply_filters_orders(stmt, filters: OrderFilter):
-        if filters.date__lte is not None:
-            stmt = stmt.where(cast(Order.date, Date) <= filters.date__lte)
-
-        if filters.date__gte is not None:
-            stmt = stmt.where(cast(Order.date, Date) >= filters.date__gte)
-
-        if filters.status is not None:
-            stmt = stmt.where(Order.status == filters.status)
-
-        if filters.client_id is not None:
-            stmt = stmt.where(Order.client_id == filters.client_id)
-
-        if filters.category_id is not None:
-            stmt = (
-                stmt.join(Order.products)
-                .join(OrderProduct.product)
-                .where(Product.category_id == filters.category_id)
-            )
-
-        return stmt
-
-    async def get_products_of_order(
-        self, orders: List[Order]
-    ) -> Tuple[list[OrderProductRead], MetadataPagination]:
+    def get_products_of_order(orders: List[Order]) -> List[OrderProductRead]:
         response: List[OrderProductRead] = []
         for order in orders:
             products_list = [
@@ -66,110 +80,325 @@ class OrderService:
             )
             response.append(order_response)
 
-        total_count = count_collection(self.session, Order)
-        metadata = MetadataPagination(count=total_count)
-
-        return response, metadata
+        return response
 
     async def read_order(self, order_id: UUID) -> OrderProductRead:
-        order = get_object_or_404(
-            self.session, Order, order_id, detail="Pedido não encontrado"
+        order = await get_object_or_404(
+            self.session,
+            Order,
+            order_id,
+            detail="Pedido não encontrado",
+            options=loader_options(OrderProductRead),
         )
-        result, _ = await self.get_products_of_order([order])
-        return result[0]
+        return OrderService.get_products_of_order([order])[0]
 
     async def list_orders(
         self, pagination: PaginationSchema, filters: OrderFilter
     ) -> Tuple[list[OrderProductRead], MetadataPagination]:
-        stmt = select(Order).order_by(desc(Order.date))
+        stmt = OrderService.FILTER_PLAN.apply(select(Order), filters)
+        total_count = await count_collection(self.session, stmt, pagination.count)
 
-        stmt = OrderService.apply_filters_orders(stmt, filters)
-        stmt = stmt.offset(pagination.offset).limit(pagination.limit)
+        stmt = apply_pagination(
+            stmt.options(*loader_options(OrderProductRead)),
+            pagination,
+            OrderService.SORT_KEYS,
+        )
+        rows = (await self.session.execute(stmt)).unique().scalars().all()
+        orders, next_cursor = build_page(rows, pagination, OrderService.SORT_KEYS)
 
-        orders = self.session.execute(stmt).scalars().all()
+        result = OrderService.get_products_of_order(orders)
+        return result, MetadataPagination(count=total_count, next_cursor=next_cursor)
 
-        result, metadata = await self.get_products_of_order(orders)
-        return result, metadata
+    @staticmethod
+    def group_quantities(products: List[ProductOrder]) -> Dict[int, int]:
+        """Soma as quantidades de linhas repetidas do mesmo produto"""
+        quantities: Dict[int, int] = defaultdict(int)
+        for product_order in products:
+            quantities[product_order.id] += product_order.quantity
 
-    async def create_order(self, order: OrderCreate, user: User):
-        product_ids = [p.id for p in order.products]
-        product_service = ProductService(self.session)
-        products = await product_service.list_products_by_ids(product_ids)
+        return dict(quantities)
 
-        products_dict = {p.id: p for p in products}
+    async def create_order(self, order: OrderCreate, user: Principal):
+        if user.client_id is None:
+            raise HTTPException(status.HTTP_403_FORBIDDEN)
 
-        for product_order in order.products:
-            product = products_dict[product_order.id]
-            product_service.validate_and_return_product_new_stock(
-                product, product_order.quantity
-            )
+        quantities = OrderService.group_quantities(order.products)
+        client_id = user.client_id
 
         try:
-            new_order = Order(
-                status=OrderStatus.RECEIVED,
-                client_id=user.client.id,
-                price_total=Decimal(0),
+            return await run_in_transaction(
+                self.session,
+                lambda: self.place_order(quantities, client_id),
+                name="create_order",
             )
-            self.session.add(new_order)
-            self.session.flush()
-
-            order_products: List[OrderProduct] = []
-            for product_order in order.products:
-                product = products_dict[product_order.id]
-
-                order_product = OrderProduct(
-                    order_id=new_order.id,
-                    product_id=product.id,
-                    quantity=product_order.quantity,
-                    unit_price=product.value,
-                )
-                order_products.append(order_product)
 
-            order_price_total = Decimal(0)
-            for product_order in order.products:
-                product = products_dict[product_order.id]
+        except SQLAlchemyError:
+            await self.session.rollback()
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-                product.stock = product_service.return_product_new_stock(
-                    product, product_order.quantity
-                )
-                order_price_total += product.value * (product_order.quantity)
+    async def place_order(
+        self, quantities: Dict[int, int], client_id: int
+    ) -> OrderProductRead:
+        """
+        Reserva o estoque e grava o pedido em uma única transação.
+        Pode ser executado novamente após um rollback (deadlock ou falha de serialização),
+        por isso recarrega o cliente em vez de reaproveitar objetos expirados.
+        """
+        client = await self.session.get(
+            Client, client_id, options=loader_options(ClientRead)
+        )
+        # O principal vem de um cache e pode ser anterior à exclusão do cliente
+        if client is None:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Cliente não encontrado")
+
+        product_service = ProductService(self.session)
+        products = await product_service.reserve_stock(quantities)
+
+        order_price_total = sum(
+            products[product_id].value * quantity
+            for product_id, quantity in quantities.items()
+        )
+        new_order = Order(
+            status=OrderStatus.RECEIVED,
+            client=client,
+            price_total=order_price_total,
+        )
+        self.session.add(new_order)
+        await self.session.flush()
+
+        order_products: List[OrderProduct] = [
+            OrderProduct(
+                order_id=new_order.id,
+                product_id=product_id,
+                quantity=quantity,
+                unit_price=products[product_id].value,
+            )
+            for product_id, quantity in quantities.items()
+        ]
 
-            new_order.price_total = order_price_total
+        self.session.add_all(order_products)
+        await self.session.commit()
 
-            self.session.add_all(order_products)
-            self.session.commit()
-            self.session.refresh(new_order)
+        products_of_order: List[ProductOfOrder] = [
+            ProductOfOrder(
+                product=ProductRead.model_validate(products[op.product_id]),
+                unit_price=op.unit_price,
+                quantity=op.quantity,
+            )
+            for op in order_products
+        ]
 
-            products_of_order: List[ProductOfOrder] = [
-                ProductOfOrder(
-                    product=op.product,
-                    unit_price=op.unit_price,
-                    quantity=op.quantity,
+        return OrderProductRead(
+            order=OrderRead.model_validate(new_order),
+            products=products_of_order,
+        )
+
+    @staticmethod
+    def resolve_bulk_client_id(index: int, item: OrderBulkItem, user: Principal) -> int:
+        """Cliente de um pedido em lote: o próprio cliente ou o informado pelo administrador"""
+        if item.client_id is None:
+            if user.client_id is None:
+                raise HTTPException(
+                    status.HTTP_400_BAD_REQUEST,
+                    f"Pedido {index}: informe o cliente do pedido",
                 )
-                for op in order_products
-            ]
+            return user.client_id
 
-            order_response = OrderProductRead(
-                order=OrderRead.model_validate(new_order),
-                products=products_of_order,
+        if user.client_id != item.client_id and not user.is_administrator:
+            raise HTTPException(status.HTTP_403_FORBIDDEN)
+
+        return item.client_id
+
+    async def create_orders_bulk(
+        self, bulk: OrderBulkCreate, user: Principal
+    ) -> OrderBulkRead:
+        items = [
+            (
+                index,
+                OrderService.group_quantities(item.products),
+                OrderService.resolve_bulk_client_id(index, item, user),
             )
+            for index, item in enumerate(bulk.orders)
+        ]
 
-            return order_response
+        try:
+            return await run_in_transaction(
+                self.session,
+                lambda: self.place_orders_bulk(items, bulk.atomic),
+                name="create_orders_bulk",
+            )
 
         except SQLAlchemyError:
-            self.session.rollback()
+            await self.session.rollback()
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    async def place_orders_bulk(
+        self, items: List[Tuple[int, Dict[int, int], int]], atomic: bool
+    ) -> OrderBulkRead:
+        """
+        Cadastra vários pedidos em uma única transação.
+        Os produtos de todos os pedidos são bloqueados com uma só consulta (em ordem de id) e
+        o estoque é distribuído em memória; pedidos, itens e baixas de estoque são gravados
+        em lote, independentemente da quantidade de pedidos.
+        """
+        product_ids = sorted({pid for _, quantities, _ in items for pid in quantities})
+        product_service = ProductService(self.session)
+        products = {
+            product.id: product
+            for product in await product_service.list_products_by_ids(
+                product_ids, ensure_all=False
+            )
+        }
+
+        client_ids = {client_id for _, _, client_id in items}
+        clients = {
+            client.id: client
+            for client in (
+                await self.session.execute(
+                    select(Client)
+                    .where(Client.id.in_(client_ids))
+                    .options(*loader_options(ClientRead))
+                )
+            )
+            .unique()
+            .scalars()
+            .all()
+        }
+
+        remaining = {
+            product_id: product.stock for product_id, product in products.items()
+        }
+        accepted: List[Tuple[Dict[int, int], Client]] = []
+        errors: List[OrderBulkError] = []
+
+        for index, quantities, client_id in items:
+            error = OrderService.check_bulk_order(
+                index, quantities, products, remaining, clients.get(client_id)
+            )
+            if error is not None:
+                if atomic:
+                    raise HTTPException(
+                        error.status_code, f"Pedido {error.index}: {error.detail}"
+                    )
+                errors.append(error)
+                continue
+
+            for product_id, quantity in quantities.items():
+                remaining[product_id] -= quantity
+            accepted.append((quantities, clients[client_id]))
+
+        order_rows = []
+        order_product_rows = []
+        for quantities, client in accepted:
+            order_id = uuid4()
+            order_rows.append(
+                {
+                    "id": order_id,
+                    "date": datetime.now(),
+                    "status": OrderStatus.RECEIVED,
+                    "client_id": client.id,
+                    "price_total": sum(
+                        products[product_id].value * quantity
+                        for product_id, quantity in quantities.items()
+                    ),
+                }
+            )
+            order_product_rows += [
+                {
+                    "order_id": order_id,
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "unit_price": products[product_id].value,
+                }
+                for product_id, quantity in quantities.items()
+            ]
+
+        if order_rows:
+            await product_service.decrement_stock(
+                {
+                    product_id: product.stock - remaining[product_id]
+                    for product_id, product in products.items()
+                    if product.stock != remaining[product_id]
+                }
+            )
+            await self.session.execute(insert(Order), order_rows)
+            await self.session.execute(insert(OrderProduct), order_product_rows)
+
+        await self.session.commit()
+
+        for product_id, product in products.items():
+            set_committed_value(product, "stock", remaining[product_id])
+
+        created = [
+            OrderProductRead(
+                order=OrderRead(
+                    id=order_row["id"],
+                    date=order_row["date"],
+                    status=order_row["status"],
+                    client=ClientRead.model_validate(client),
+                    price_total=order_row["price_total"],
+                ),
+                products=[
+                    ProductOfOrder(
+                        product=ProductRead.model_validate(products[product_id]),
+                        unit_price=products[product_id].value,
+                        quantity=quantity,
+                    )
+                    for product_id, quantity in quantities.items()
+                ],
+            )
+            for order_row, (quantities, client) in zip(order_rows, accepted)
+        ]
+
+        return OrderBulkRead(created=created, errors=errors)
+
+    @staticmethod
+    def check_bulk_order(
+        index: int,
+        quantities: Dict[int, int],
+        products: Dict[int, Product],
+        remaining: Dict[int, int],
+        client: Optional[Client],
+    ) -> Optional[OrderBulkError]:
+        """Valida um pedido do lote contra o estoque ainda disponível no lote"""
+        if client is None:
+            return OrderBulkError(
+                index=index,
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cliente não encontrado",
+            )
+
+        missing_ids = [pid for pid in quantities if pid not in products]
+        if missing_ids:
+            return OrderBulkError(
+                index=index,
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Alguns produtos não foram encontrados: {', '.join(map(str, missing_ids))}",
+            )
+
+        for product_id, quantity in quantities.items():
+            if remaining[product_id] < quantity:
+                return OrderBulkError(
+                    index=index,
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"O produto {products[product_id].description} possui {remaining[product_id]} unidades em estoque",
+                )
+
+        return None
+
     async def update_order(self, id, data: OrderUpdate) -> Order:
-        db_order = get_object_or_404(
-            self.session, Order, id, detail="Pedido não encontrado"
+        db_order = await get_object_or_404(
+            self.session,
+            Order,
+            id,
+            detail="Pedido não encontrado",
+            options=loader_options(OrderRead),
         )
 
         db_order.status = data.status
 
         try:
-            self.session.commit()
-            self.session.refresh(db_order)
+            await self.session.commit()
 
             return db_order
 
@@ -177,12 +406,12 @@ class OrderService:
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     async def delete_order(self, id):
-        order = get_object_or_404(self.session, Order, id)
+        order = await get_object_or_404(self.session, Order, id)
 
         try:
-            self.session.delete(order)
-            self.session.commit()
+            await self.session.delete(order)
+            await self.session.commit()
 
         except SQLAlchemyError:
-            self.session.rollback()
+            await self.session.rollback()
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
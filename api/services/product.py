@@ -1,19 +1,25 @@
+from typing import Dict
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from models.order_product import OrderProduct
 from filters.product import ProductFilter
 from models.product import Product
 from orm.utils.get_object_or_404 import get_object_or_404
+from orm.utils.loader_options import loader_options
 from orm.utils.filter_collection import filter_collection
-from schemas.product import ProductCreate
+from orm.utils.filter_plan import FilterPlan
+from schemas.product import ProductCreate, ProductRead
 from schemas.utils.pagination import PaginationSchema
 from services.category import CategoryService
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 
 
 class ProductService:
-    def __init__(self, session: Session):
+    FILTER_PLAN = FilterPlan(Product, ProductFilter)
+
+    def __init__(self, session: AsyncSession):
         self.session = session
 
     @staticmethod
@@ -37,33 +43,48 @@ class ProductService:
         return new_stock
 
     async def read_product(self, id):
-        product = get_object_or_404(
-            self.session, Product, id, detail="Produto não encontrado"
+        product = await get_object_or_404(
+            self.session,
+            Product,
+            id,
+            detail="Produto não encontrado",
+            options=loader_options(ProductRead),
         )
         return product
 
-    def list_products(self, pagination: PaginationSchema, filters: ProductFilter):
-        data, metadata = filter_collection(
+    async def list_products(self, pagination: PaginationSchema, filters: ProductFilter):
+        data, metadata = await filter_collection(
             self.session,
-            model=Product,
+            plan=ProductService.FILTER_PLAN,
             pagination=pagination,
             filters=filters,
+            options=loader_options(ProductRead),
         )
         return data, metadata
 
-    async def list_products_by_ids(self, product_ids: list[int]) -> list[Product]:
+    async def list_products_by_ids(
+        self, product_ids: list[int], ensure_all: bool = True
+    ) -> list[Product]:
         if not product_ids:
             return []
 
-        stmt = select(Product).where(Product.id.in_(product_ids)).with_for_update()
+        # selectinload: FOR UPDATE não pode ser aplicado ao lado anulável de um OUTER JOIN
+        # order_by: bloqueia as linhas sempre na mesma ordem, evitando deadlocks entre pedidos
+        stmt = (
+            select(Product)
+            .where(Product.id.in_(product_ids))
+            .order_by(Product.id)
+            .options(selectinload(Product.category))
+            .with_for_update()
+        )
 
-        result = self.session.execute(stmt)
+        result = await self.session.execute(stmt)
         products = result.scalars().all()
 
         found_ids = {p.id for p in products}
         missing_ids = set(product_ids) - found_ids
 
-        if missing_ids:
+        if missing_ids and ensure_all:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Alguns produtos não foram encontrados: {', '.join(map(str, missing_ids))}",
@@ -71,24 +92,91 @@ class ProductService:
 
         return products
 
-    def create_product(self, product: ProductCreate):
+    async def reserve_stock(self, quantities: Dict[int, int]) -> Dict[int, Product]:
+        """
+        Reserva o estoque com um UPDATE condicional por produto
+        (`stock = stock - :q WHERE id = :id AND stock >= :q`), sem leitura prévia com bloqueio:
+        o bloqueio da linha dura apenas do UPDATE até o commit da transação.
+        Os produtos são atualizados em ordem crescente de id, para que pedidos concorrentes
+        bloqueiem as linhas na mesma ordem.
+        """
+        for product_id, quantity in sorted(quantities.items()):
+            stmt = (
+                update(Product)
+                .where(Product.id == product_id, Product.stock >= quantity)
+                .values(stock=Product.stock - quantity)
+                .returning(Product.id)
+                .execution_options(synchronize_session=False)
+            )
+            reserved = (await self.session.execute(stmt)).scalar_one_or_none()
+
+            if reserved is None:
+                await self.raise_unavailable_product(product_id, quantity)
+
+        stmt = (
+            select(Product)
+            .where(Product.id.in_(quantities))
+            .options(selectinload(Product.category))
+            .execution_options(populate_existing=True)
+        )
+        products = (await self.session.execute(stmt)).scalars().all()
+
+        return {product.id: product for product in products}
+
+    async def decrement_stock(self, quantities: Dict[int, int]) -> None:
+        """
+        Baixa o estoque de vários produtos com um único UPDATE executado em lote (executemany).
+        Deve ser usado com as linhas já bloqueadas e o estoque validado (ver `list_products_by_ids`).
+        """
+        if not quantities:
+            return
+
+        table = Product.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("product_id"))
+            .values(stock=table.c.stock - bindparam("quantity"))
+        )
+        await self.session.execute(
+            stmt,
+            [
+                {"product_id": product_id, "quantity": quantity}
+                for product_id, quantity in sorted(quantities.items())
+            ],
+        )
+
+    async def raise_unavailable_product(self, product_id: int, quantity: int):
+        """Informa por que a reserva do produto falhou: inexistente ou sem estoque"""
+        product = await self.session.get(Product, product_id, populate_existing=True)
+
+        if product is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Alguns produtos não foram encontrados: {product_id}",
+            )
+
+        ProductService.validate_and_return_product_new_stock(product, quantity)
+
+    async def create_product(self, product: ProductCreate):
         if product.category_id is not None:
-            CategoryService.validate_category_exists(self.session, product.category_id)
+            await CategoryService.validate_category_exists(
+                self.session, product.category_id
+            )
 
         new_product = Product(**product.model_dump())
 
         try:
             self.session.add(new_product)
-            self.session.commit()
-            self.session.refresh(new_product)
+            await self.session.commit()
+            await self.session.refresh(new_product, ["category"])
 
         except SQLAlchemyError:
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         return new_product
 
-    def update_product(self, id, data):
-        db_product = get_object_or_404(
+    async def update_product(self, id, data):
+        db_product = await get_object_or_404(
             self.session, Product, id, detail="Produto não encontrado"
         )
 
@@ -97,8 +185,8 @@ class ProductService:
                 setattr(db_product, key, value)
 
         try:
-            self.session.commit()
-            self.session.refresh(db_product)
+            await self.session.commit()
+            await self.session.refresh(db_product, ["category"])
 
             return db_product
 
@@ -106,11 +194,11 @@ class ProductService:
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     async def delete_product(self, id):
-        product = get_object_or_404(self.session, Product, id)
+        product = await get_object_or_404(self.session, Product, id)
 
         try:
             stmt = select(OrderProduct).where(OrderProduct.product_id == id)
-            result = self.session.execute(stmt)
+            result = await self.session.execute(stmt)
             has_orders = result.scalars().first() is not None
 
             if has_orders:
@@ -119,8 +207,8 @@ class ProductService:
                     detail="Não é possível excluir o produto pois ele está vinculado a pedidos",
                 )
 
-            self.session.delete(product)
-            self.session.commit()
+            await self.session.delete(product)
+            await self.session.commit()
 
         except SQLAlchemyError:
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
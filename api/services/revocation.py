@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.security.auth import REFRESH_TOKEN_EXPIRE_DAYS
+from core.security.revocation import revocation_store
+from models.token_revocation import TokenRevocation
+from schemas.auth import TokenStorage
+
+
+class RevocationService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def revoked_exception() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revogado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    async def sync(self) -> None:
+        """
+        Lê as revogações gravadas desde a última sincronização, mais a janela de
+        `REVOCATION_SYNC_OVERLAP` segundos (revogações já conhecidas são relidas)
+        """
+        if not revocation_store.needs_sync():
+            return
+
+        now = datetime.now()
+        stmt = select(
+            TokenRevocation.jti,
+            TokenRevocation.user_id,
+            TokenRevocation.revoked_at,
+            TokenRevocation.expires_at,
+        ).where(TokenRevocation.expires_at > now)
+
+        since = revocation_store.sync_since()
+        if since is not None:
+            stmt = stmt.where(TokenRevocation.revoked_at >= since)
+
+        rows = (await self.session.execute(stmt)).all()
+        for row in rows:
+            revocation_store.add(*row)
+
+        revocation_store.prune(now)
+        revocation_store.mark_synced(
+            max((row.revoked_at for row in rows), default=None)
+        )
+
+    async def ensure_not_revoked(self, token: TokenStorage) -> None:
+        await self.sync()
+
+        issued_at = datetime.fromtimestamp(token.iat) if token.iat else datetime.min
+        if revocation_store.is_revoked(token.jti, token.user_id, issued_at):
+            raise RevocationService.revoked_exception()
+
+    async def save(self, *revocations: TokenRevocation) -> None:
+        try:
+            self.session.add_all(revocations)
+            await self.session.commit()
+
+        except IntegrityError:
+            # Token já revogado (por exemplo, refresh token reutilizado em paralelo)
+            raise RevocationService.revoked_exception()
+
+        except SQLAlchemyError:
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        for revocation in revocations:
+            revocation_store.add(
+                revocation.jti,
+                revocation.user_id,
+                revocation.revoked_at,
+                revocation.expires_at,
+            )
+
+    async def revoke_tokens(self, *tokens: TokenStorage) -> None:
+        """Revoga os tokens informados (tokens emitidos sem `jti` apenas expiram)"""
+        await self.save(
+            *(
+                TokenRevocation(
+                    jti=token.jti,
+                    user_id=token.user_id,
+                    revoked_at=datetime.now(),
+                    expires_at=RevocationService.expires_at(),
+                )
+                for token in tokens
+                if token.jti is not None
+            )
+        )
+
+    async def revoke_user_tokens(self, user_id: int) -> None:
+        """Revoga todos os tokens do usuário emitidos até o momento"""
+        await self.save(
+            TokenRevocation(
+                user_id=user_id,
+                revoked_at=datetime.now(),
+                expires_at=RevocationService.expires_at(),
+            )
+        )
+
+    @staticmethod
+    def expires_at() -> datetime:
+        """Após a validade máxima de um token, a revogação deixa de ser necessária"""
+        return datetime.now() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
@@ -1,23 +1,29 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import User
 from schemas.user import UserCreate
-from services.auth import get_password_hash
-from sqlalchemy.exc import SQLAlchemyError
+from services.auth import hash_password
+from core.security.principal import invalidate_principal
+from orm.utils.integrity import integrity_error_to_http
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 
 class UserService:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def create_user(self, user: UserCreate) -> User:
-        user.password = get_password_hash(user.password)
+    async def create_user(self, user: UserCreate) -> User:
+        user.password = await hash_password(user.password)
         db_user = User(**user.model_dump(exclude=set(["passwordConfirmation"])))
 
         try:
             self.session.add(db_user)
-            self.session.commit()
+            await self.session.commit()
+            invalidate_principal(db_user.id)
             return db_user
 
+        except IntegrityError as error:
+            raise integrity_error_to_http(error)
+
         except SQLAlchemyError:
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR)
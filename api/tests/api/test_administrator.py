@@ -2,12 +2,17 @@ import pytest
 from fastapi.testclient import TestClient
 from faker import Faker
 from tests.utils.login import login
+from tests.utils.run_async import run_async
 from schemas.administrator import (
     AdministratorRead,
 )
 from services.user import UserService
 from schemas.user import UserCreate
 from fastapi import status
+from main import app
+from core.metrics import metrics
+from database.lazy_session import LazySession
+from dependencies.get_session_db import get_session_db
 
 fake = Faker("pt_BR")
 
@@ -29,12 +34,34 @@ def test_list_administrator(request, user_type, expected_status):
     perform_list_administrator(user_fixture["agent"], expected_status)
 
 
+def test_forbidden_request_does_not_check_out_connection(client, db_session):
+    async def override_get_db():
+        db = LazySession(lambda: db_session)
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    app.dependency_overrides[get_session_db] = override_get_db
+
+    # A primeira requisição carrega o usuário autenticado e sincroniza as revogações
+    perform_list_administrator(client["agent"], status.HTTP_403_FORBIDDEN)
+    metrics.clear()
+    perform_list_administrator(client["agent"], status.HTTP_403_FORBIDDEN)
+    assert metrics.counter("db_sessions", connection="avoided") == 1
+    assert metrics.counter("db_sessions", connection="used") == 0
+
+    response = client["agent"].get("/products/")
+    assert response.status_code == status.HTTP_200_OK
+    assert metrics.counter("db_sessions", connection="used") == 1
+
+
 def test_create_administrator(agent, db_session):
     user_service = UserService(db_session)
     user = UserCreate(
         name="administrator", password="123", email="administrator@example.cm"
     )
-    new_user = user_service.create_user(user)
+    new_user = run_async(user_service.create_user(user))
 
     access_token, _ = login(new_user)
 
@@ -1,3 +1,26 @@
+from datetime import datetime, timedelta
+from ipaddress import ip_network
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import select, update
+from fastapi import HTTPException, Request, status
+from core.metrics import metrics
+from core.security.password import PasswordWorkerPool
+from core.security.admission import AdmissionController, TokenBucket, admission
+from core.security.revocation import RevocationStore, revocation_store
+from dependencies import admission as admission_dependency
+from dependencies import get_auth_context
+from models.token_revocation import TokenRevocation
+from models.user import User
+from schemas.auth import TokenRefreshOut, TokenType
+from schemas.role import Role
+from services.auth import get_password_hash, verify_password, verify_token
+from services.revocation import RevocationService
+from tests.utils.count_queries import count_queries
+from tests.utils.login import login
+from tests.utils.run_async import run_async
+
+
 def test_refresh_token(client):
     refresh_token = client["refresh_token"]
 
@@ -8,3 +31,299 @@ def test_refresh_token(client):
 
     response_data = response.json()
     assert response_data["access"] is not None
+
+
+def test_refresh_token_example_matches_response():
+    example = TokenRefreshOut.model_json_schema()["example"]
+    assert example.keys() == TokenRefreshOut.model_fields.keys()
+
+
+def test_refresh_token_is_rotated(client):
+    response = client["agent"].post(
+        "/auth/refresh-token/", json={"refresh": client["refresh_token"]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    new_refresh_token = response.json()["refresh"]
+    assert new_refresh_token != client["refresh_token"]
+
+    response = client["agent"].post(
+        "/auth/refresh-token/", json={"refresh": client["refresh_token"]}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["detail"] == "Token revogado"
+
+    response = client["agent"].post(
+        "/auth/refresh-token/", json={"refresh": new_refresh_token}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_logout_revokes_access_and_refresh_tokens(client):
+    response = client["agent"].post(
+        "/auth/logout/", json={"refresh": client["refresh_token"]}
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = client["agent"].get(f"/clients/{client['role'].id}/")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["detail"] == "Token revogado"
+
+    response = client["agent"].post(
+        "/auth/refresh-token/", json={"refresh": client["refresh_token"]}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_logout_with_refresh_token_of_other_user(client, administrator):
+    response = client["agent"].post(
+        "/auth/logout/", json={"refresh": administrator["refresh_token"]}
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_revoke_all_sessions(client, administrator, engine):
+    user_id = client["user"].id
+
+    response = client["agent"].post(f"/auth/revoke-all/{administrator['user'].id}/")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = administrator["agent"].post(f"/auth/revoke-all/{user_id}/")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = client["agent"].get(f"/clients/{client['role'].id}/")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    # Novos logins não são afetados e a verificação não consulta o banco
+    access_token, _ = login(client["user"])
+    with count_queries(engine) as statements:
+        response = client["agent"].get(
+            f"/clients/{client['role'].id}/",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert not any("token_revocation" in sql for sql in statements)
+
+
+def test_revocations_from_other_processes_are_synced(client, db_session, monkeypatch):
+    monkeypatch.setattr(revocation_store, "sync_interval", 0)
+    service = RevocationService(db_session)
+    token = run_async(verify_token(client["access_token"], TokenType.ACCESS))
+
+    run_async(service.ensure_not_revoked(token))
+
+    # Revogação gravada diretamente no banco, como faria outro processo
+    db_session.add(
+        TokenRevocation(
+            jti=token.jti,
+            user_id=token.user_id,
+            expires_at=RevocationService.expires_at(),
+        )
+    )
+    run_async(db_session.commit())
+
+    with pytest.raises(HTTPException) as error:
+        run_async(service.ensure_not_revoked(token))
+    assert error.value.detail == "Token revogado"
+
+
+def test_revocations_committed_out_of_id_order_are_synced(
+    client, db_session, monkeypatch
+):
+    monkeypatch.setattr(revocation_store, "sync_interval", 0)
+    service = RevocationService(db_session)
+    token = run_async(verify_token(client["access_token"], TokenType.ACCESS))
+    now = datetime.now()
+
+    # Transação que obteve o `id` 20 e confirmou primeiro
+    db_session.add(
+        TokenRevocation(
+            id=20,
+            jti="confirmada-primeiro",
+            user_id=token.user_id,
+            revoked_at=now,
+            expires_at=RevocationService.expires_at(),
+        )
+    )
+    run_async(db_session.commit())
+    run_async(service.ensure_not_revoked(token))
+
+    # Transação concorrente, com `id` menor, confirmada após a sincronização
+    db_session.add(
+        TokenRevocation(
+            id=10,
+            jti=token.jti,
+            user_id=token.user_id,
+            revoked_at=now - timedelta(seconds=1),
+            expires_at=RevocationService.expires_at(),
+        )
+    )
+    run_async(db_session.commit())
+
+    with pytest.raises(HTTPException) as error:
+        run_async(service.ensure_not_revoked(token))
+    assert error.value.detail == "Token revogado"
+
+
+def test_expired_user_revocations_are_pruned():
+    store = RevocationStore(sync_interval=5, sync_overlap=60)
+    now = datetime.now()
+    store.add(None, 1, now - timedelta(days=2), now - timedelta(days=1))
+    store.add(None, 2, now, now + timedelta(days=1))
+
+    store.prune(now)
+    assert list(store.users) == [2]
+    assert store.is_revoked(None, 2, now - timedelta(minutes=1))
+
+
+def test_login_attempts_are_limited_per_username(user, monkeypatch):
+    monkeypatch.setattr(admission, "username_bucket", TokenBucket("username", 1, 2))
+    metrics.clear()
+
+    for _ in range(2):
+        response = user["agent"].post(
+            "/auth/login/", data={"username": "USER", "password": "errada"}
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = user["agent"].post(
+        "/auth/login/", data={"username": "user", "password": "123"}
+    )
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) >= 1
+    assert metrics.counter("admission_rejected", reason="username") == 1
+
+    # O limite é por nome de usuário: outros usuários continuam entrando
+    response = user["agent"].post(
+        "/auth/login/", data={"username": "other", "password": "123"}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_admission_limits_concurrent_requests():
+    controller = AdmissionController(
+        ip_bucket=TokenBucket("ip", 0, 0),
+        username_bucket=TokenBucket("username", 0, 0),
+        max_concurrent=1,
+    )
+
+    async def admit_twice():
+        async with controller.admit("127.0.0.1"):
+            async with controller.admit("127.0.0.2"):
+                pass
+
+    with pytest.raises(HTTPException) as error:
+        run_async(admit_twice())
+
+    assert error.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert controller._in_flight == 0
+
+
+@pytest.mark.parametrize(
+    "peer,forwarded_for,expected",
+    [
+        ("10.0.0.5", "203.0.113.7", "203.0.113.7"),
+        ("10.0.0.5", "198.51.100.1, 203.0.113.7, 10.0.0.9", "203.0.113.7"),
+        ("10.0.0.5", None, "10.0.0.5"),
+        ("203.0.113.7", "198.51.100.1", "203.0.113.7"),
+    ],
+)
+def test_client_ip_behind_trusted_proxy(monkeypatch, peer, forwarded_for, expected):
+    monkeypatch.setattr(
+        admission_dependency, "trusted_proxies", [ip_network("10.0.0.0/8")]
+    )
+    headers = (
+        [] if forwarded_for is None else [(b"x-forwarded-for", forwarded_for.encode())]
+    )
+    request = Request({"type": "http", "headers": headers, "client": (peer, 1234)})
+
+    assert admission_dependency.client_ip(request) == expected
+
+
+def test_login_resolves_user_and_roles_in_one_query(administrator, engine):
+    with count_queries(engine) as statements:
+        response = administrator["agent"].post(
+            "/auth/login/", data={"username": "admin", "password": "123"}
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(statements) == 1
+
+    timings = [
+        entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")
+    ]
+    assert timings == ["db", "hash", "jwt"]
+
+    payload = run_async(verify_token(response.json()["access_token"], TokenType.ACCESS))
+    assert payload.roles == [Role.ADMINISTRATOR]
+
+
+def test_token_is_decoded_once_per_request(administrator, monkeypatch):
+    calls = []
+
+    async def counting_verify_token(token, expected_token_type):
+        calls.append(token)
+        return await verify_token(token, expected_token_type)
+
+    monkeypatch.setattr(get_auth_context, "verify_token", counting_verify_token)
+
+    # Permissão de administrador e usuário autenticado, ambos na mesma requisição
+    response = administrator["agent"].delete("/products/0/")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert len(calls) == 1
+
+
+def test_login_verifies_password_in_pool(user):
+    metrics.clear()
+
+    response = user["agent"].post(
+        "/auth/login/", data={"username": user["user"].name, "password": "123"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    summaries = metrics.snapshot()["summaries"]
+    assert summaries["password_wait_seconds"]["operation=verify"]["count"] == 1
+    assert summaries["password_run_seconds"]["operation=verify"]["count"] == 1
+
+
+def test_login_rehashes_password_with_stale_cost(user):
+    session = user["session"]
+    user_id = user["user"].id
+    stale_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash("123")
+    run_async(
+        session.execute(
+            update(User).where(User.id == user_id).values(password=stale_hash)
+        )
+    )
+
+    metrics.clear()
+    timings = []
+    for _ in range(2):
+        response = user["agent"].post(
+            "/auth/login/", data={"username": user["user"].name, "password": "123"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        timings.append(response.headers["Server-Timing"])
+
+    new_hash = run_async(
+        session.scalar(select(User.password).where(User.id == user_id))
+    )
+    assert new_hash.startswith("$2b$04$")
+    assert verify_password("123", new_hash)
+    assert metrics.counter("password_rehashed") == 1
+    assert "rehash;dur=" in timings[0]
+    assert "rehash;dur=" not in timings[1]
+
+
+def test_password_pool_rejects_when_queue_is_full():
+    pool = PasswordWorkerPool(workers=1, queue_limit=0)
+
+    with pytest.raises(HTTPException) as error:
+        run_async(pool.run("hash", get_password_hash, "123"))
+
+    assert error.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+def test_password_pool_inline_mode():
+    pool = PasswordWorkerPool(workers=0, queue_limit=0)
+
+    hashed = run_async(pool.run("hash", get_password_hash, "123"))
+    assert run_async(pool.run("verify", verify_password, "123", hashed))
@@ -1,12 +1,17 @@
 import pytest
 from fastapi.testclient import TestClient
 from faker import Faker
+from models.client import Client
+from orm.utils.filter_plan import compile_filter_plan
 from services.client import ClientService
 from schemas.client import ClientCreate, ClientRead
 from services.user import UserService
 from schemas.user import UserCreate
 from fastapi.encoders import jsonable_encoder
 from fastapi import status
+from core.security.principal import Principal, principal_cache
+from tests.utils.count_queries import count_queries
+from tests.utils.run_async import run_async
 
 fake = Faker("pt_BR")
 
@@ -65,11 +70,11 @@ def test_read_other_client(client, db_session):
     new_user_data = UserCreate(
         name="new_user", password="123", email="new_user@email.com"
     )
-    new_user_obj = user_service.create_user(new_user_data)
+    new_user_obj = run_async(user_service.create_user(new_user_data))
 
     cpf = fake.cpf().replace(".", "").replace("-", "")
     new_client_data = ClientCreate(user_id=new_user_obj.id, cpf=cpf)
-    new_client_obj = client_service.create_client(client=new_client_data)
+    new_client_obj = run_async(client_service.create_client(client=new_client_data))
 
     perform_read_other_client(client["agent"], new_client_obj.id)
 
@@ -93,6 +98,30 @@ def test_create_client(user):
     perform_create_client(user["agent"], client_data, status.HTTP_201_CREATED)
 
 
+def test_principal_is_cached_and_invalidated_on_client_creation(user, engine):
+    user_id = user["user"].id
+
+    response = user["agent"].get("/clients/0/")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert principal_cache.get(user_id) == Principal(user_id, None, False)
+
+    # Com o principal em cache, apenas a consulta do cliente é executada
+    with count_queries(engine) as statements:
+        response = user["agent"].get("/clients/0/")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert len(statements) == 1
+
+    cpf = fake.cpf().replace(".", "").replace("-", "")
+    response = user["agent"].post("/clients/", json={"user_id": user_id, "cpf": cpf})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert principal_cache.get(user_id) is None
+
+    client_id = response.json()["id"]
+    response = user["agent"].get(f"/clients/{client_id}/")
+    assert response.status_code == status.HTTP_200_OK
+    assert principal_cache.get(user_id) == Principal(user_id, client_id, False)
+
+
 def test_delete_my_client(client):
     client_id = client["role"].id
     response = client["agent"].delete(f"/clients/{client_id}/")
@@ -106,11 +135,12 @@ def test_delete_other_client(client, db_session):
     new_user_data = UserCreate(
         name="new_user", password="123", email="new_user@email.com"
     )
-    new_user_obj = user_service.create_user(new_user_data)
+    new_user_obj = run_async(user_service.create_user(new_user_data))
 
     cpf = fake.cpf().replace(".", "").replace("-", "")
     new_client_data = ClientCreate(user_id=new_user_obj.id, cpf=cpf)
-    new_client_obj_id = client_service.create_client(client=new_client_data).id
+    new_client_obj = run_async(client_service.create_client(client=new_client_data))
+    new_client_obj_id = new_client_obj.id
 
     response = client["agent"].delete(f"/clients/{new_client_obj_id}/")
     assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -141,11 +171,12 @@ def test_update_other_client(client, db_session):
     new_user_data = UserCreate(
         name="new_user", password="123", email="new_user@email.com"
     )
-    new_user_obj = user_service.create_user(new_user_data)
+    new_user_obj = run_async(user_service.create_user(new_user_data))
 
     cpf = fake.cpf().replace(".", "").replace("-", "")
     new_client_data = ClientCreate(user_id=new_user_obj.id, cpf=cpf)
-    new_client_obj_id = client_service.create_client(client=new_client_data).id
+    new_client_obj = run_async(client_service.create_client(client=new_client_data))
+    new_client_obj_id = new_client_obj.id
 
     new_cpf = fake.cpf().replace(".", "").replace("-", "")
     new_data = {"cpf": new_cpf}
@@ -155,3 +186,57 @@ def test_update_other_client(client, db_session):
         json=new_data,
     )
     assert response.status_code == 403
+
+
+def test_list_client_filter_by_name_and_email(client, administrator):
+    response = administrator["agent"].get(
+        "/clients/", params={"user__name": "cli", "user__email": "example.cm"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()["data"]
+    assert [item["id"] for item in data] == [client["role"].id]
+
+
+def test_filter_plan_rejects_unknown_field():
+    class UnknownFilter:
+        def __init__(self, user__nickname: str = None):
+            self.user__nickname = user__nickname
+
+    with pytest.raises(ValueError):
+        compile_filter_plan(Client, UnknownFilter, overrides={})
+
+
+def test_update_my_client_with_existing_cpf(client, db_session):
+    user_service = UserService(session=db_session)
+    client_service = ClientService(session=db_session)
+
+    new_user_data = UserCreate(
+        name="new_user", password="123", email="new_user@email.com"
+    )
+    new_user_obj = run_async(user_service.create_user(new_user_data))
+
+    cpf = fake.cpf().replace(".", "").replace("-", "")
+    new_client_data = ClientCreate(user_id=new_user_obj.id, cpf=cpf)
+    run_async(client_service.create_client(client=new_client_data))
+
+    response = client["agent"].put(f"/clients/{client['role'].id}/", json={"cpf": cpf})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Já existe um cliente com esse CPF"
+
+
+def test_create_client_for_user_with_client(client):
+    cpf = fake.cpf().replace(".", "").replace("-", "")
+    response = client["agent"].post(
+        "/clients/", json={"user_id": client["user"].id, "cpf": cpf}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Já existe um cliente associado a esse usuário"
+
+
+def test_update_my_client_with_invalid_cpf(client):
+    response = client["agent"].put(
+        f"/clients/{client['role'].id}/", json={"cpf": "11111111111"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "CPF inválido"
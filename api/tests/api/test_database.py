@@ -0,0 +1,171 @@
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from fastapi import Request
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.exc import OperationalError, TimeoutError
+from sqlalchemy.pool import NullPool
+from core.metrics import metrics
+from database import pool
+from database.compile_cache import (
+    instrument_compile_cache,
+    without_compile_cache_metrics,
+)
+from database.config import Base
+from database.pool import InstrumentedAsyncQueuePool, get_engine_options
+from database.replicas import REPLICA_KEY, ReplicaSet, RoutingSession
+from database.schema import SchemaVersionError, check_schema_version, get_head_revision
+from dependencies import get_session_db as session_db
+from models.category import Category
+from tests.utils.run_async import run_async
+
+
+def test_pool_metrics_record_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=pool.InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    metrics.clear()
+
+    connection = engine.connect()
+    assert metrics.snapshot()["gauges"]["db_pool_in_use"]["pool=sync"] == 1
+
+    with pytest.raises(TimeoutError):
+        engine.connect()
+
+    connection.close()
+    snapshot = metrics.snapshot()
+    assert snapshot["gauges"]["db_pool_in_use"]["pool=sync"] == 0
+    assert snapshot["gauges"]["db_pool_overflow"]["pool=sync"] == 0
+    assert snapshot["counters"]["db_pool_timeouts"]["pool=sync"] == 1
+    assert snapshot["summaries"]["db_pool_wait_seconds"]["pool=sync"]["count"] == 2
+    engine.dispose()
+
+
+def test_engine_options(monkeypatch):
+    url = "postgresql://lu:123@db:5432/lu-db"
+    assert get_engine_options("sqlite://") == {
+        "query_cache_size": pool.DATABASE_QUERY_CACHE_SIZE
+    }
+
+    options = get_engine_options(url, asynchronous=True)
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["pool_size"] == pool.DATABASE_POOL_SIZE
+
+    monkeypatch.setattr(pool, "DATABASE_PGBOUNCER", True)
+    assert get_engine_options(url)["poolclass"] is NullPool
+
+    options = get_engine_options(url, asynchronous=True)
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert options["connect_args"]["prepared_statement_cache_size"] == 0
+
+
+def create_database(path):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def test_routing_session_reads_from_replica(tmp_path):
+    primary = create_database(tmp_path / "primary.db")
+    replica = create_database(tmp_path / "replica.db")
+    with replica.begin() as connection:
+        connection.execute(insert(Category).values(name="réplica", description="-"))
+
+    session = RoutingSession(bind=primary)
+    session.info[REPLICA_KEY] = replica
+    assert session.scalar(select(Category.name)) == "réplica"
+    assert session.scalar(select(Category.name).with_for_update()) is None
+
+    session.add(Category(name="primário", description="-"))
+    session.commit()
+    session.close()
+    with primary.connect() as connection:
+        assert connection.scalar(select(Category.name)) == "primário"
+
+    primary.dispose()
+    replica.dispose()
+
+
+def test_replica_set_skips_failed_replica(tmp_path):
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    healthy = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    replicas = ReplicaSet([broken, healthy], retry_interval=60)
+    metrics.clear()
+
+    assert replicas.choose() is broken
+    with pytest.raises(OperationalError):
+        broken.connect()
+
+    assert metrics.counter("db_replica_failures", replica=0) == 1
+    assert [replicas.choose(), replicas.choose()] == [healthy, healthy]
+
+
+def test_reads_after_own_write_use_primary(client, monkeypatch, tmp_path):
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(session_db, "replicas", ReplicaSet([replica], 60))
+    token = client["access_token"].encode()
+
+    def request(method: str, authorization: bool = True) -> Request:
+        headers = [(b"authorization", b"Bearer " + token)] if authorization else []
+        return Request({"type": "http", "method": method, "headers": headers})
+
+    async def open_session(method: str, authorization: bool = True, commit=False):
+        dependency = session_db.get_session_db(request(method, authorization))
+        db = await anext(dependency)
+        replica_bind = db.info.get(REPLICA_KEY)
+        if commit:
+            await db.commit()
+
+        with pytest.raises(StopAsyncIteration):
+            await anext(dependency)
+        return replica_bind
+
+    assert run_async(open_session("GET")) is replica
+    assert run_async(open_session("POST", commit=True)) is None
+    assert run_async(open_session("GET")) is None
+    assert run_async(open_session("GET", authorization=False)) is replica
+
+
+def test_head_revision_matches_alembic():
+    script = ScriptDirectory.from_config(Config("alembic.ini"))
+    assert get_head_revision() == script.get_current_head()
+
+
+def test_schema_version_check(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+
+    with engine.begin() as connection:
+        with pytest.raises(SchemaVersionError):
+            check_schema_version(connection, mode="check")
+        check_schema_version(connection, mode="warn")
+
+        connection.execute(text("CREATE TABLE alembic_version (version_num TEXT)"))
+        connection.execute(
+            text("INSERT INTO alembic_version VALUES (:head)"),
+            {"head": get_head_revision()},
+        )
+
+    with engine.connect() as connection:
+        check_schema_version(connection, mode="check")
+    engine.dispose()
+
+
+def test_compile_cache_metrics_only_count_instrumented_engines(tmp_path):
+    instrumented = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    other = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    instrument_compile_cache(instrumented)
+    instrument_compile_cache(instrumented)
+    metrics.clear()
+
+    for bind in (instrumented, other, without_compile_cache_metrics(instrumented)):
+        with bind.connect() as connection:
+            connection.execute(select(1))
+
+    assert metrics.snapshot()["counters"]["sql_compile_cache"] == {"result=miss": 1}
+    instrumented.dispose()
+    other.dispose()
@@ -1,10 +1,34 @@
 import pytest
+from datetime import date, datetime
+from uuid import UUID, uuid4
 from fastapi.encoders import jsonable_encoder
 from fastapi.testclient import TestClient
+from tests.factories.category import CategoryFactory
 from tests.factories.product import ProductFactory
+from tests.utils.count_queries import count_queries
+from orm.utils.count_collection import count_cache
+from orm.utils.pagination import encode_cursor
+from core.security.principal import principal_cache
 from schemas.order_product import OrderProductRead
-from schemas.order import OrderCreate, OrderStatus, ProductOrder
+from schemas.order import (
+    OrderBulkCreate,
+    OrderBulkItem,
+    OrderCreate,
+    OrderStatus,
+    ProductOrder,
+)
 from fastapi import status
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import OperationalError
+from core.metrics import metrics
+from orm.utils.transaction import run_in_transaction
+from tests.utils.run_async import run_async
+from tests.utils.explain import explain_query_plan
+from filters.order import OrderFilter
+from models.client import Client
+from models.order import Order
+from models.product import Product
+from services.order import OrderService
 
 
 def perform_list_order(agent: TestClient, expected_status):
@@ -99,6 +123,48 @@ def test_read_my_order(
         perform_read_order(user_fixture["agent"], expected_status_read, order_id)
 
 
+def test_read_my_order_loads_order_once(client, engine, db_session):
+    product = ProductFactory(session=db_session)
+    order_data = OrderCreate(products=[ProductOrder(id=product.id, quantity=1)])
+    response = perform_create_order(
+        client, "client", order_data, status.HTTP_201_CREATED
+    )
+    order_id = response.json()["order"]["id"]
+
+    with count_queries(engine) as statements:
+        perform_read_order(client["agent"], status.HTTP_200_OK, order_id)
+
+    # A permissão consulta apenas o cliente do pedido; o pedido é carregado uma única vez
+    order_loads = [sql for sql in statements if '"order".price_total' in sql]
+    assert len(order_loads) == 1
+
+
+def test_read_other_order_not_found(client):
+    response = client["agent"].get(f"/orders/{uuid4()}/")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == "Pedido não encontrado"
+
+
+def test_read_order_without_client_forbidden(client, db_session):
+    product = ProductFactory(session=db_session)
+    order_data = OrderCreate(products=[ProductOrder(id=product.id, quantity=1)])
+    response = perform_create_order(
+        client, "client", order_data, status.HTTP_201_CREATED
+    )
+    order_id = UUID(response.json()["order"]["id"])
+
+    # Cliente excluído: a chave estrangeira do pedido passa a ser nula
+    run_async(
+        db_session.execute(
+            update(Order).where(Order.id == order_id).values(client_id=None)
+        )
+    )
+    run_async(db_session.commit())
+
+    response = client["agent"].get(f"/orders/{order_id}/")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 @pytest.mark.parametrize(
     "user_type,expected_status",
     [
@@ -120,3 +186,327 @@ def test_create_order(request, user_type, expected_status, db_session):
     order_data = OrderCreate(products=products)
 
     perform_create_order(user_fixture, user_type, order_data, expected_status)
+
+
+def test_list_order_query_count_does_not_grow_with_page_size(
+    client, administrator, engine, db_session
+):
+    category = CategoryFactory(session=db_session)
+    product_1 = ProductFactory(session=db_session, category=category, stock=100)
+    product_2 = ProductFactory(session=db_session, stock=100)
+
+    products = [
+        ProductOrder(id=product_1.id, quantity=1),
+        ProductOrder(id=product_2.id, quantity=1),
+    ]
+    for _ in range(10):
+        perform_create_order(
+            client, "client", OrderCreate(products=products), status.HTTP_201_CREATED
+        )
+
+    def list_orders_queries(limit: int) -> int:
+        count_cache.clear()
+        principal_cache.clear()
+        with count_queries(engine) as statements:
+            response = administrator["agent"].get("/orders/", params={"limit": limit})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["data"]) == limit
+        for order in response.json()["data"]:
+            assert len(order["products"]) == 2
+            assert order["order"]["client"]["user"] is not None
+
+        return len(statements)
+
+    assert list_orders_queries(5) == list_orders_queries(10)
+    assert list_orders_queries(10) <= 5
+
+
+def test_list_order_cursor_pagination(client, administrator, db_session):
+    product = ProductFactory(session=db_session, stock=100)
+    products = [ProductOrder(id=product.id, quantity=1)]
+    for _ in range(6):
+        perform_create_order(
+            client, "client", OrderCreate(products=products), status.HTTP_201_CREATED
+        )
+
+    orders = []
+    cursor = None
+    for _ in range(3):
+        params = {"limit": 5} if cursor is None else {"limit": 5, "cursor": cursor}
+        response = administrator["agent"].get("/orders/", params=params)
+        assert response.status_code == status.HTTP_200_OK
+
+        orders += response.json()["data"]
+        cursor = response.json()["metadata"]["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(orders) == 6
+    assert len({order["order"]["id"] for order in orders}) == 6
+    dates = [order["order"]["date"] for order in orders]
+    assert dates == sorted(dates, reverse=True)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["2024-01-01T00:00:00", 5],
+        [20240101, str(uuid4())],
+        ["2024-01-01T00:00:00", None],
+        ["2024-01-01T00:00:00", [str(uuid4())]],
+    ],
+)
+def test_list_order_cursor_with_wrong_types(administrator, values):
+    response = administrator["agent"].get(
+        "/orders/", params={"cursor": encode_cursor(values)}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Cursor inválido"
+
+
+def test_create_order_reserves_stock(client, db_session):
+    product = ProductFactory(session=db_session, stock=5)
+
+    order_data = OrderCreate(
+        products=[
+            ProductOrder(id=product.id, quantity=2),
+            ProductOrder(id=product.id, quantity=1),
+        ]
+    )
+    response = perform_create_order(
+        client, "client", order_data, status.HTTP_201_CREATED
+    )
+    assert response.json()["products"][0]["quantity"] == 3
+    assert client["agent"].get(f"/products/{product.id}/").json()["data"]["stock"] == 2
+
+    order_data = OrderCreate(products=[ProductOrder(id=product.id, quantity=3)])
+    response = perform_create_order(
+        client, "client", order_data, status.HTTP_400_BAD_REQUEST
+    )
+    assert response.json()["detail"] == (
+        f"O produto {product.description} possui 2 unidades em estoque"
+    )
+
+    order_data = OrderCreate(products=[ProductOrder(id=product.id + 1000, quantity=1)])
+    perform_create_order(client, "client", order_data, status.HTTP_404_NOT_FOUND)
+
+
+class DeadlockDetected(Exception):
+    pgcode = "40P01"
+
+
+class RollbackSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def test_run_in_transaction_retries_deadlock(administrator, client):
+    session = RollbackSession()
+    attempts = []
+
+    async def operation():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise OperationalError("UPDATE product", {}, DeadlockDetected())
+        return "ok"
+
+    metrics.clear()
+    result = run_async(run_in_transaction(session, operation, name="create_order"))
+
+    assert result == "ok"
+    assert len(attempts) == 3
+    assert session.rollbacks == 2
+
+    response = administrator["agent"].get("/metrics/")
+    assert response.status_code == status.HTTP_200_OK
+    counters = response.json()["data"]["counters"]
+    assert counters["transaction_retries"]["operation=create_order,sqlstate=40P01"] == 2
+
+    response = client["agent"].get("/metrics/")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_run_in_transaction_gives_up_after_max_attempts():
+    async def operation():
+        raise OperationalError("UPDATE product", {}, DeadlockDetected())
+
+    with pytest.raises(OperationalError):
+        run_async(
+            run_in_transaction(
+                RollbackSession(), operation, name="create_order", max_attempts=2
+            )
+        )
+
+
+def test_create_orders_bulk_atomic(client, db_session):
+    product = ProductFactory(session=db_session, stock=5)
+    order = OrderBulkItem(products=[ProductOrder(id=product.id, quantity=2)])
+
+    response = client["agent"].post(
+        "/orders/bulk/",
+        json=jsonable_encoder(OrderBulkCreate(orders=[order, order, order])),
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == (
+        f"Pedido 2: O produto {product.description} possui 1 unidades em estoque"
+    )
+
+    response = client["agent"].post(
+        "/orders/bulk/", json=jsonable_encoder(OrderBulkCreate(orders=[order, order]))
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    created = response.json()["created"]
+    assert len(created) == 2
+    assert all(item["order"]["client"]["id"] == client["role"].id for item in created)
+    assert client["agent"].get(f"/products/{product.id}/").json()["data"]["stock"] == 1
+
+
+def test_create_orders_bulk_partial_on_behalf(client, administrator, db_session):
+    product = ProductFactory(session=db_session, stock=3)
+    client_id = client["role"].id
+
+    bulk = OrderBulkCreate(
+        atomic=False,
+        orders=[
+            OrderBulkItem(
+                client_id=client_id, products=[ProductOrder(id=product.id, quantity=2)]
+            ),
+            OrderBulkItem(
+                client_id=client_id, products=[ProductOrder(id=product.id, quantity=2)]
+            ),
+            OrderBulkItem(
+                client_id=client_id,
+                products=[ProductOrder(id=product.id + 1000, quantity=1)],
+            ),
+        ],
+    )
+    response = administrator["agent"].post("/orders/bulk/", json=jsonable_encoder(bulk))
+    assert response.status_code == status.HTTP_201_CREATED
+
+    data = response.json()
+    assert len(data["created"]) == 1
+    assert data["created"][0]["order"]["client"]["id"] == client_id
+    assert [(error["index"], error["status_code"]) for error in data["errors"]] == [
+        (1, status.HTTP_400_BAD_REQUEST),
+        (2, status.HTTP_404_NOT_FOUND),
+    ]
+
+    response = administrator["agent"].get("/orders/", params={"client_id": client_id})
+    assert response.json()["metadata"]["count"] == 1
+
+
+def test_create_orders_bulk_for_other_client_forbidden(client, administrator):
+    bulk = OrderBulkCreate(
+        orders=[
+            OrderBulkItem(
+                client_id=client["role"].id + 1,
+                products=[ProductOrder(id=1, quantity=1)],
+            )
+        ]
+    )
+    response = client["agent"].post("/orders/bulk/", json=jsonable_encoder(bulk))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_create_order_with_deleted_client_keeps_stock(client, db_session):
+    product = ProductFactory(session=db_session, stock=5)
+    products = [ProductOrder(id=product.id, quantity=1)]
+
+    # Principal em cache, como em outro processo que não viu a exclusão do cliente
+    response = client["agent"].get(f"/clients/{client['role'].id}/")
+    assert response.status_code == status.HTTP_200_OK
+    run_async(db_session.execute(delete(Client).where(Client.id == client["role"].id)))
+    run_async(db_session.commit())
+
+    response = client["agent"].post(
+        "/orders/", json=jsonable_encoder(OrderCreate(products=products))
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == "Cliente não encontrado"
+
+    bulk = OrderBulkCreate(orders=[OrderBulkItem(products=products)])
+    response = client["agent"].post("/orders/bulk/", json=jsonable_encoder(bulk))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == "Pedido 0: Cliente não encontrado"
+
+    stock = run_async(
+        db_session.scalar(select(Product.stock).where(Product.id == product.id))
+    )
+    assert stock == 5
+    assert run_async(db_session.scalar(select(func.count()).select_from(Order))) == 0
+
+
+def test_list_order_date_filters_include_whole_day(client, administrator, db_session):
+    product = ProductFactory(session=db_session, stock=10)
+    order_data = OrderCreate(products=[ProductOrder(id=product.id, quantity=1)])
+
+    dates = [
+        datetime(2025, 5, 25, 23, 59, 59),
+        datetime(2025, 5, 26, 0, 0),
+        datetime(2025, 5, 26, 23, 59, 59, 999999),
+        datetime(2025, 5, 27, 0, 0),
+    ]
+    for order_date in dates:
+        response = perform_create_order(
+            client, "client", order_data, status.HTTP_201_CREATED
+        )
+        run_async(
+            db_session.execute(
+                update(Order)
+                .where(Order.id == UUID(response.json()["order"]["id"]))
+                .values(date=order_date)
+            )
+        )
+
+    def count(**params) -> int:
+        response = administrator["agent"].get("/orders/", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()["metadata"]["count"]
+
+    assert count(date__gte="2025-05-26", date__lte="2025-05-26") == 2
+    assert count(date__lte="2025-05-26") == 3
+    assert count(date__gte="2025-05-26") == 3
+
+
+def test_list_order_date_filters_accept_extreme_dates(
+    client, administrator, db_session
+):
+    product = ProductFactory(session=db_session, stock=10)
+    order_data = OrderCreate(products=[ProductOrder(id=product.id, quantity=1)])
+    perform_create_order(client, "client", order_data, status.HTTP_201_CREATED)
+
+    params = {"date__gte": date.min.isoformat(), "date__lte": date.max.isoformat()}
+    response = administrator["agent"].get("/orders/", params=params)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["metadata"]["count"] == 1
+
+
+def order_filter(**values) -> OrderFilter:
+    fields = ("date__lte", "date__gte", "category_id", "status", "client_id")
+    return OrderFilter(**{field: values.get(field) for field in fields})
+
+
+@pytest.mark.parametrize(
+    "filters,index",
+    [
+        (
+            {"date__gte": date(2025, 5, 1), "date__lte": date(2025, 5, 31)},
+            "ix_order_date",
+        ),
+        ({"client_id": 1, "date__gte": date(2025, 5, 1)}, "ix_order_client_id_date"),
+        (
+            {"status": OrderStatus.RECEIVED, "date__lte": date(2025, 5, 31)},
+            "ix_order_status_date",
+        ),
+    ],
+)
+def test_list_order_date_filters_use_indexes(db_session, filters, index):
+    stmt = OrderService.FILTER_PLAN.apply(select(Order), order_filter(**filters))
+    plan = explain_query_plan(db_session, stmt)
+
+    assert f"SEARCH order USING INDEX {index} (" in plan
+    assert "SCAN order" not in plan
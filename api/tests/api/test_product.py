@@ -8,6 +8,17 @@ from services.category import CategoryService
 from schemas.product import ProductCreate, ProductRead, ProductUpdate
 from fastapi.encoders import jsonable_encoder
 from fastapi import status
+from tests.factories.category import CategoryFactory
+from tests.factories.product import ProductFactory
+from tests.utils.count_queries import count_queries
+from tests.utils.run_async import run_async
+from core.metrics import metrics
+from database.compile_cache import instrument_compile_cache
+from models.product import Product
+from orm.utils.count_collection import count_cache, count_collection
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.expression import ColumnClause
 
 fake = Faker("pt_BR")
 
@@ -135,7 +146,7 @@ def test_create_product_only_with_required_fields(request, user_type, expected_s
 def test_create_product_complete_with_administrator(administrator, db_session):
     category_service = CategoryService(db_session)
     category_submit = CategoryCreate(name="category", description="description")
-    category_obj = category_service.create_category(category=category_submit)
+    category_obj = run_async(category_service.create_category(category=category_submit))
 
     product = ProductCreate(
         description="product",
@@ -182,3 +193,145 @@ def test_delete_product(request, user_type, product, expected_status):
     user_fixture = request.getfixturevalue(user_type)
 
     perform_delete_product(user_fixture["agent"], expected_status, product.id)
+
+
+def test_list_product_count_respects_filters(client, db_session):
+    for stock in (5, 600, 700):
+        ProductFactory(session=db_session, stock=stock)
+
+    response = client["agent"].get("/products/", params={"stock__gte": 500})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["metadata"]["count"] == 2
+
+    response = client["agent"].get("/products/", params={"count": "estimated"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["metadata"]["count"] == 3
+
+    response = client["agent"].get("/products/", params={"count": "none"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["metadata"]["count"] is None
+    assert len(response.json()["data"]) == 3
+
+
+def test_list_product_count_is_invalidated_on_writes(client, administrator, product):
+    response = client["agent"].get("/products/")
+    assert response.json()["metadata"]["count"] == 1
+
+    perform_delete_product(
+        administrator["agent"], status.HTTP_204_NO_CONTENT, product.id
+    )
+
+    response = client["agent"].get("/products/")
+    assert response.json()["metadata"]["count"] == 0
+
+
+def test_count_without_cache_key_is_not_cached(db_session):
+    class UncachedColumn(ColumnClause):
+        inherit_cache = False
+
+    ProductFactory(session=db_session, stock=1)
+    stmt = select(Product).where(UncachedColumn("stock") > 0)
+
+    assert run_async(count_collection(db_session, stmt)) == 1
+    assert len(count_cache) == 0
+
+
+def test_product_stock_cannot_be_negative(product, db_session):
+    # A reserva de estoque depende da restrição `stock_gte` criada a partir do modelo
+    with pytest.raises(IntegrityError):
+        run_async(
+            db_session.execute(
+                update(Product).where(Product.id == product.id).values(stock=-1)
+            )
+        )
+    run_async(db_session.rollback())
+
+
+def test_list_product_cursor_pagination(client, db_session):
+    for _ in range(7):
+        ProductFactory(session=db_session)
+
+    response = client["agent"].get("/products/", params={"limit": 5})
+    assert response.status_code == status.HTTP_200_OK
+    first_page = response.json()
+    assert len(first_page["data"]) == 5
+    assert first_page["metadata"]["next_cursor"] is not None
+
+    response = client["agent"].get(
+        "/products/",
+        params={"limit": 5, "cursor": first_page["metadata"]["next_cursor"]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    second_page = response.json()
+    assert len(second_page["data"]) == 2
+    assert second_page["metadata"]["next_cursor"] is None
+    assert second_page["metadata"]["count"] == 7
+
+    ids = [product["id"] for product in first_page["data"] + second_page["data"]]
+    assert len(set(ids)) == 7
+
+
+def test_list_product_invalid_cursor(client):
+    response = client["agent"].get("/products/", params={"cursor": "invalido"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_product_filter_description(client, db_session):
+    ProductFactory(session=db_session, description="Camisa Azul 100% algodão")
+    ProductFactory(session=db_session, description="Camisa azul 100 fios")
+    ProductFactory(session=db_session, description="Calça jeans")
+
+    response = client["agent"].get("/products/", params={"description": "camisa"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["metadata"]["count"] == 2
+
+    response = client["agent"].get("/products/", params={"description": "100%"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()["data"]
+    assert [product["description"] for product in data] == ["Camisa Azul 100% algodão"]
+
+    # Todas as palavras, em qualquer ordem (e não o texto inteiro como substring)
+    response = client["agent"].get("/products/", params={"description": "azul camisa"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["metadata"]["count"] == 2
+
+    response = client["agent"].get("/products/", params={"description": "azul jeans"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["metadata"]["count"] == 0
+
+
+def test_list_product_filter_category_id_is_exact(client, db_session, engine):
+    categories = [CategoryFactory(session=db_session) for _ in range(12)]
+    for category in categories:
+        ProductFactory(session=db_session, category=category)
+
+    category_id = categories[0].id
+    with count_queries(engine) as statements:
+        response = client["agent"].get(
+            "/products/", params={"category_id": category_id}
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["metadata"]["count"] == 1
+    assert response.json()["data"][0]["category"]["id"] == category_id
+    assert not any("CAST" in statement for statement in statements)
+
+
+def test_list_product_reuses_compiled_statements(client, db_session, engine):
+    instrument_compile_cache(getattr(engine, "sync_engine", engine))
+    ProductFactory(session=db_session, description="Camisa azul", value=Decimal(80))
+    ProductFactory(session=db_session, description="Calça jeans", value=Decimal(120))
+
+    params = {"description": "camisa", "value__lte": 100, "limit": 5}
+    response = client["agent"].get("/products/", params=params)
+    assert response.json()["metadata"]["count"] == 1
+
+    # Mesmos filtros ativos com outros valores: nenhuma instrução é compilada novamente
+    metrics.clear()
+    params = {"description": "calça", "value__lte": 150, "limit": 10}
+    response = client["agent"].get("/products/", params=params)
+    assert response.json()["metadata"]["count"] == 1
+
+    compile_cache = metrics.snapshot()["counters"]["sql_compile_cache"]
+    assert compile_cache.get("result=miss", 0) == 0
+    assert compile_cache["result=hit"] >= 2
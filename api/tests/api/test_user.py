@@ -1,7 +1,15 @@
+import pytest
+from fastapi import HTTPException, Request
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from admin.user import UserAdmin
+from database.config import Base
 from schemas.user import UserCreate, UserRead
 from fastapi.encoders import jsonable_encoder
 from main import app
+from tests.utils.count_queries import count_queries
+from tests.utils.run_async import run_async
 
 agent = TestClient(app)
 
@@ -23,3 +31,47 @@ def test_create_user():
     assert user_read.name == user_schema.name
     assert user_read.email == user_schema.email
     assert not hasattr(user_read, "password")
+
+
+def test_create_user_in_a_single_query(engine):
+    user_schema = UserCreate(name="test", password="123", email="email@domain.com")
+
+    with count_queries(engine) as statements:
+        response = agent.post("/auth/register/", json=jsonable_encoder(user_schema))
+
+    assert response.status_code == 201
+    assert len(statements) == 1
+
+
+@pytest.mark.parametrize(
+    "name,email,detail",
+    [
+        ("user", "other@domain.com", "Já existe um usuário com esse nome"),
+        ("other", "user@example.cm", "Já existe um usuário com esse e-mail"),
+    ],
+)
+def test_create_user_with_existing_data(user, name, email, detail):
+    user_schema = UserCreate(name=name, password="123", email=email)
+
+    response = agent.post("/auth/register/", json=jsonable_encoder(user_schema))
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+
+
+def test_admin_create_user_with_existing_name(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'admin.db'}")
+    Base.metadata.create_all(bind=engine)
+    view = UserAdmin()
+    view.session_maker = sessionmaker(engine)
+    view.is_async = False
+    request = Request({"type": "http", "method": "POST", "headers": []})
+    data = {"name": "admin", "password": "123", "email": "admin@example.cm"}
+
+    run_async(view.insert_model(request, data))
+    with pytest.raises(HTTPException) as error:
+        run_async(view.insert_model(request, {**data, "email": "other@example.cm"}))
+
+    assert error.value.status_code == 400
+    assert error.value.detail == "Já existe um usuário com esse nome"
+    engine.dispose()
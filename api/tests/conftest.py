@@ -1,3 +1,10 @@
+import os
+
+# Custo mínimo do bcrypt: os testes não medem segurança, e cada fixture faz login
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# O banco dos testes é criado a partir dos modelos, sem migrações
+os.environ.setdefault("DATABASE_SCHEMA_MODE", "create")
+
 import pytest
 from tests.factories.product import ProductFactory
 from tests.factories.category import CategoryFactory
@@ -12,48 +19,110 @@ from services.administrator import AdministratorService
 from services.client import ClientService
 from services.user import UserService
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from dependencies.get_session_db import get_session_db
-from database.config import Base
-from sqlalchemy import create_engine
+from database.config import Base, DATABASE_ASYNC
+from database.sync_session import SyncSessionAdapter
+from sqlalchemy import create_engine, event
+from tests.utils.run_async import run_async
+from orm.utils.count_collection import count_cache
+from core.security.principal import principal_cache
+from core.security.revocation import revocation_store
+from core.security.admission import admission
+from database.replicas import read_your_writes
 from faker import Faker
 
 fake = Faker("pt_BR")
 
 
+def enable_sqlite_savepoints(engine) -> None:
+    """
+    O driver do SQLite controla as transações por conta própria e não emite `BEGIN`,
+    o que quebra os savepoints usados por `join_transaction_mode="create_savepoint"`.
+    """
+
+    @event.listens_for(engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
 @pytest.fixture(scope="session")
 def engine():
     connect_args = {"check_same_thread": False}
 
-    engine = create_engine("sqlite:///:memory:", connect_args=connect_args)
-    Base.metadata.create_all(bind=engine)
+    if not DATABASE_ASYNC:
+        engine = create_engine("sqlite:///:memory:", connect_args=connect_args)
+        enable_sqlite_savepoints(engine)
+        Base.metadata.create_all(bind=engine)
+        yield engine
+        engine.dispose()
+        return
+
+    engine = create_async_engine(
+        "sqlite+aiosqlite://", connect_args=connect_args, poolclass=StaticPool
+    )
+    enable_sqlite_savepoints(engine.sync_engine)
+
+    async def create_all():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    run_async(create_all())
     yield engine
-    engine.dispose()
+    run_async(engine.dispose())
 
 
 @pytest.fixture(autouse=True, scope="function")
 def db_session(engine):
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = sessionmaker(bind=connection)()
+    if not DATABASE_ASYNC:
+        connection = engine.connect()
+        transaction = connection.begin()
+        session = sessionmaker(
+            bind=connection,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )()
+
+        yield SyncSessionAdapter(session)
+
+        session.close()
+        transaction.rollback()
+        connection.close()
+        return
+
+    connection = run_async(engine.connect())
+    transaction = run_async(connection.begin())
+    session = AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
 
     yield session
 
-    session.close()
-    transaction.rollback()
-    connection.close()
+    run_async(session.close())
+    run_async(transaction.rollback())
+    run_async(connection.close())
 
 
 @pytest.fixture(autouse=True, scope="function")
 def agent(db_session):
 
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    async def override_get_db():
+        yield db_session
 
     app.dependency_overrides[get_session_db] = override_get_db
+    count_cache.clear()
+    principal_cache.clear()
+    revocation_store.clear()
+    admission.buckets.clear()
+    read_your_writes.clear()
 
     with TestClient(app) as test_client:
         yield test_client
@@ -67,11 +136,11 @@ def client(db_session):
     client_service = ClientService(db_session)
 
     user = UserCreate(name="client", password="123", email="client@example.cm")
-    new_user = user_service.create_user(user)
+    new_user = run_async(user_service.create_user(user))
 
     cpf = fake.cpf().replace(".", "").replace("-", "")
     client_submit = ClientCreate(user_id=new_user.id, cpf=cpf)
-    new_client = client_service.create_client(client_submit)
+    new_client = run_async(client_service.create_client(client_submit))
 
     access_token, refresh_token = login(new_client.user)
     agent = TestClient(app, headers={"Authorization": f"Bearer {access_token}"})
@@ -92,10 +161,12 @@ def administrator(db_session):
     administrator_service = AdministratorService(db_session)
 
     user = UserCreate(name="admin", password="123", email="admin@example.cm")
-    new_user = user_service.create_user(user)
+    new_user = run_async(user_service.create_user(user))
 
     administrator_submit = AdministratorCreate(user_id=new_user.id)
-    new_administrator = administrator_service.create_administrator(administrator_submit)
+    new_administrator = run_async(
+        administrator_service.create_administrator(administrator_submit)
+    )
 
     access_token, refresh_token = login(new_administrator.user)
     agent = TestClient(app, headers={"Authorization": f"Bearer {access_token}"})
@@ -116,7 +187,7 @@ def user(db_session):
 
     user = UserCreate(name="user", password="123", email="user@example.cm")
 
-    new_user = user_service.create_user(user)
+    new_user = run_async(user_service.create_user(user))
     access_token, refresh_token = login(new_user)
     agent = TestClient(app, headers={"Authorization": f"Bearer {access_token}"})
 
@@ -141,6 +212,6 @@ def product(db_session):
 def category(db_session):
     category_service = CategoryService(db_session)
     category_submit = CategoryCreate(name="category", description="description")
-    new_category = category_service.create_category(category=category_submit)
+    new_category = run_async(category_service.create_category(category=category_submit))
 
     return new_category
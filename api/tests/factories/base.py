@@ -0,0 +1,25 @@
+from factory.alchemy import (
+    SESSION_PERSISTENCE_COMMIT,
+    SESSION_PERSISTENCE_FLUSH,
+    SQLAlchemyModelFactory,
+)
+from tests.utils.run_async import run_async
+
+
+class AsyncSQLAlchemyModelFactory(SQLAlchemyModelFactory):
+    """Factory que persiste os objetos através da sessão assíncrona utilizada pela API"""
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def _save(cls, model_class, session, args, kwargs):
+        session_persistence = cls._meta.sqlalchemy_session_persistence
+
+        obj = model_class(*args, **kwargs)
+        session.add(obj)
+        if session_persistence == SESSION_PERSISTENCE_FLUSH:
+            run_async(session.flush())
+        elif session_persistence == SESSION_PERSISTENCE_COMMIT:
+            run_async(session.commit())
+        return obj
@@ -1,4 +1,4 @@
-from factory.alchemy import SQLAlchemyModelFactory
+from tests.factories.base import AsyncSQLAlchemyModelFactory
 import factory
 from faker import Faker
 from models.category import Category
@@ -6,7 +6,7 @@ from models.category import Category
 fake = Faker()
 
 
-class CategoryFactory(SQLAlchemyModelFactory):
+class CategoryFactory(AsyncSQLAlchemyModelFactory):
     class Meta:
         model = Category
         sqlalchemy_session = None
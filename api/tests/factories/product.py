@@ -1,5 +1,5 @@
 import factory
-from factory.alchemy import SQLAlchemyModelFactory
+from tests.factories.base import AsyncSQLAlchemyModelFactory
 from faker import Faker
 from decimal import Decimal
 from models.product import Product
@@ -7,7 +7,7 @@ from models.product import Product
 fake = Faker()
 
 
-class ProductFactory(SQLAlchemyModelFactory):
+class ProductFactory(AsyncSQLAlchemyModelFactory):
     class Meta:
         model = Product
         sqlalchemy_session = None
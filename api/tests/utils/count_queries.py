@@ -0,0 +1,23 @@
+from contextlib import contextmanager
+from typing import List
+from sqlalchemy import event
+
+TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+"""Savepoints abertos pela sessão dos testes, que não são consultas da aplicação"""
+
+
+@contextmanager
+def count_queries(engine):
+    """Registra as instruções SQL executadas pelo engine no bloco (sem savepoints)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if not statement.startswith(TRANSACTION_CONTROL):
+            statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,15 @@
+from tests.utils.run_async import run_async
+
+
+def explain_query_plan(session, stmt) -> str:
+    """Plano de execução (`EXPLAIN QUERY PLAN` do SQLite) da consulta, uma etapa por linha"""
+
+    def explain(sync_session):
+        connection = sync_session.connection()
+        compiled = stmt.compile(dialect=connection.dialect)
+        # O plano não depende dos valores, apenas da estrutura da consulta
+        params = (None,) * len(compiled.positiontup)
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        return "\n".join(row[-1] for row in rows)
+
+    return run_async(session.run_sync(explain))
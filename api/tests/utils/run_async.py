@@ -0,0 +1,11 @@
+import asyncio
+from typing import Any, Awaitable
+
+
+def run_async(awaitable: Awaitable[Any]) -> Any:
+    """Executa um objeto aguardável a partir do código síncrono dos testes"""
+
+    async def main():
+        return await awaitable
+
+    return asyncio.run(main())